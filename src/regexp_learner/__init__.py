@@ -13,20 +13,42 @@ __copyright__ = "Copyright (C) 2019, Nokia"
 __license__ = "BSD-3"
 __version__ = '1.0.2'  # Use single quotes for bumpversion (see setup.cfg)
 
-from .gold import (
-    GoldObservationTable,
-    gold,
-)
-from .lstar import (
-    automaton_match,
-    Learner,
-    LstarObservationTable,
-    Teacher,
-    make_automaton_from_observation_table,
-)
-from .strings import (
-    prefixes,
-    is_prefix_closed,
-    suffixes,
-    is_suffix_closed,
-)
+from .lazy import lazy_import
+
+# The public symbols are imported on first access, so that importing a
+# lightweight module (e.g., regexp_learner.strings) does not import numpy
+# and pybgl.
+lazy_import(__name__, {
+    "LearningResult": ".batch",
+    "learn_many": ".batch",
+    "ModelCache": ".cache",
+    "DFA": ".dfa",
+    "GoldObservationTable": ".gold",
+    "gold": ".gold",
+    "automaton_match": ".lstar",
+    "find_counterexamples": ".lstar",
+    "Learner": ".lstar",
+    "LstarObservationTable": ".lstar",
+    "PredicateTeacher": ".lstar",
+    "RegexpTeacher": ".lstar",
+    "Teacher": ".lstar",
+    "make_automaton_from_observation_table": ".lstar",
+    "make_dfa_from_observation_table": ".lstar",
+    "MemoryLimitError": ".limits",
+    "CompiledMatcher": ".matcher",
+    "export_matcher": ".matcher",
+    "load_matcher": ".matcher",
+    "minimize_automaton": ".minimize",
+    "automaton_to_regexp": ".regexp",
+    "compile_regexp": ".regexp",
+    "verify_regexp": ".regexp",
+    "rpni": ".rpni",
+    "read_samples": ".samples",
+    "automaton_from_dict": ".serialization",
+    "automaton_to_dict": ".serialization",
+    "distinct_suffixes": ".strings",
+    "prefixes": ".strings",
+    "is_prefix_closed": ".strings",
+    "suffixes": ".strings",
+    "is_suffix_closed": ".strings",
+})
@@ -0,0 +1,196 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+#
+# This file is part of the regexp-learner project
+# https://github.com/nokia/regexp-learner
+
+import time
+from concurrent.futures import (
+    ProcessPoolExecutor,
+    as_completed,
+)
+from .limits import time_limit
+
+
+class LearningResult:
+    """
+    The :py:class:`LearningResult` class stores the outcome of a job
+    processed by :py:func:`learn_many`.
+    """
+    def __init__(
+        self,
+        index: int,
+        automaton: object = None,
+        success: bool = False,
+        error: str = None,
+        timeout: bool = False,
+        duration: float = 0.0,
+        statistics: dict = None
+    ):
+        """
+        Constructor.
+
+        Args:
+            index (int): The index of the job in the list passed to
+                :py:func:`learn_many`.
+            automaton (Automaton): The inferred automaton, or ``None``
+                if the job failed.
+            success (bool): ``True`` iff the learner succeeded (see the
+                ``success`` flag returned by :py:func:`gold`).
+            error (str): The error message if the job failed,
+                ``None`` otherwise.
+            timeout (bool): ``True`` iff the job exceeded its time limit.
+            duration (float): The duration of the job, in seconds.
+            statistics (dict): Algorithm-specific statistics (e.g., the
+                number of queries handled by the :py:class:`Teacher`).
+        """
+        self.index = index
+        self.automaton = automaton
+        self.success = success
+        self.error = error
+        self.timeout = timeout
+        self.duration = duration
+        self.statistics = statistics if statistics is not None else dict()
+
+    def __repr__(self) -> str:
+        return (
+            f"LearningResult(index={self.index}, success={self.success}, "
+            f"error={self.error!r}, timeout={self.timeout})"
+        )
+
+
+def run_job(job: object) -> tuple:
+    """
+    Runs a learning job.
+
+    Args:
+        job (object): Either a :py:class:`Teacher` or a
+            :py:class:`PredicateTeacher` (the L* algorithm is run), a
+            ``(s_plus, s_minus)`` tuple or a ``dict`` of keyword arguments
+            of :py:func:`gold` (the Gold algorithm is run).
+
+    Returns:
+        A ``(automaton, success, statistics)`` tuple.
+    """
+    from .lstar import Learner, PredicateTeacher, Teacher
+    if isinstance(job, (Teacher, PredicateTeacher)):
+        learner = Learner(job, verbose=False)
+        h = learner.learn(track_memory=True)
+        return (
+            h,
+            True,
+            {
+                "membership_queries": job.num_membership_queries,
+                "equivalence_queries": job.num_conjectures,
+                "peak_memory_usage": learner.o.peak_memory_usage,
+            }
+        )
+    from .gold import gold
+    if isinstance(job, dict):
+        (g, success) = gold(**job)
+    else:
+        (s_plus, s_minus) = job
+        (g, success) = gold(s_plus, s_minus)
+    return (g, success, dict())
+
+
+def run_jobs(chunk: list, timeout: float = None) -> list:
+    """
+    Runs a chunk of learning jobs (in a worker process of
+    :py:func:`learn_many`). A job which fails or exceeds its time limit
+    does not prevent the next jobs of the chunk from running.
+
+    Args:
+        chunk (list): A list of ``(index, job)`` pairs
+            (see :py:func:`run_job`).
+        timeout (float): The maximal duration of each job, in seconds,
+            or ``None`` for no limit.
+
+    Returns:
+        The list of the corresponding :py:class:`LearningResult` instances.
+    """
+    results = list()
+    for (index, job) in chunk:
+        start = time.perf_counter()
+        try:
+            with time_limit(timeout):
+                (g, success, statistics) = run_job(job)
+            result = LearningResult(
+                index, g, success, statistics=statistics
+            )
+        except TimeoutError as e:
+            result = LearningResult(index, error=str(e), timeout=True)
+        except Exception as e:
+            result = LearningResult(index, error=f"{type(e).__name__}: {e}")
+        result.duration = time.perf_counter() - start
+        results.append(result)
+    return results
+
+
+def learn_many(
+    jobs: list,
+    n_jobs: int = None,
+    chunksize: int = 1,
+    timeout: float = None
+) -> iter:
+    """
+    Learns several languages in parallel, using a pool of processes.
+    The results are yielded as soon as their chunk is processed, hence
+    not necessarily in the order of ``jobs``.
+
+    Example:
+        >>> from pybgl import compile_dfa
+        >>> from regexp_learner import Teacher, learn_many
+        >>> jobs = [
+        ...     Teacher(compile_dfa("(ab)*", complete=True)),
+        ...     {"s_plus": {"a", "aa"}, "s_minus": {""}, "sigma": "a"},
+        ... ]
+        >>> for r in sorted(learn_many(jobs), key=lambda r: r.index):
+        ...     print(r.index, r.success, r.automaton.num_vertices())
+        0 True 3
+        1 True 2
+
+    Args:
+        jobs (list): The learning jobs. Each job is either a
+            :py:class:`Teacher` or a :py:class:`PredicateTeacher` (the L*
+            algorithm is run), a
+            ``(s_plus, s_minus)`` tuple or a ``dict`` of keyword
+            arguments of :py:func:`gold` (the Gold algorithm is run).
+        n_jobs (int): The number of worker processes (default: the number
+            of CPUs). Pass ``1`` to run the jobs in the current process.
+        chunksize (int): The number of jobs sent at once to a worker.
+            Increasing it reduces the inter-process communication overhead
+            when the jobs are small.
+        timeout (float): The maximal duration of each job, in seconds,
+            or ``None`` for no limit.
+
+    Returns:
+        An iterator over the :py:class:`LearningResult` instances (one
+        per job). A job which fails or exceeds ``timeout`` yields a
+        result whose ``error`` is set, and does not stop the batch.
+    """
+    chunksize = max(1, chunksize)
+    indexed_jobs = list(enumerate(jobs))
+    chunks = [
+        indexed_jobs[i:i + chunksize]
+        for i in range(0, len(indexed_jobs), chunksize)
+    ]
+    if n_jobs == 1:
+        for chunk in chunks:
+            yield from run_jobs(chunk, timeout)
+        return
+    with ProcessPoolExecutor(max_workers=n_jobs) as executor:
+        futures = {
+            executor.submit(run_jobs, chunk, timeout): chunk
+            for chunk in chunks
+        }
+        for future in as_completed(futures):
+            try:
+                results = future.result()
+            except Exception as e:
+                # The worker died (e.g., killed by the OOM killer).
+                results = [
+                    LearningResult(index, error=f"{type(e).__name__}: {e}")
+                    for (index, _) in futures[future]
+                ]
+            yield from results
@@ -0,0 +1,205 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+#
+# This file is part of the regexp-learner project
+# https://github.com/nokia/regexp-learner
+
+import gzip
+import hashlib
+import json
+import os
+import tempfile
+
+SUFFIX = ".json.gz"
+
+# Increase this number when the content of the entries or the way the keys
+# are computed changes, so that the previous entries are no longer used.
+FORMAT_VERSION = 1
+
+
+def make_key(**kwargs) -> str:
+    """
+    Computes a stable hash of the inputs of a learning job.
+
+    The values must be JSON-serializable, except the ``set`` and
+    ``frozenset`` values, which are sorted, and the callables, which are
+    identified by their qualified name. As this name does not identify
+    lambda functions, nested functions, and callable objects (e.g.,
+    :py:func:`functools.partial`), the inputs are not hashed if they
+    involve such a callable.
+
+    Example:
+        >>> from regexp_learner.cache import make_key
+        >>> make_key(s_plus={"a", "b"}) == make_key(s_plus={"b", "a"})
+        True
+        >>> make_key(func=lambda candidates: max(candidates)) is None
+        True
+
+    Args:
+        kwargs (dict): The inputs.
+
+    Returns:
+        The hexadecimal SHA-256 digest of the inputs (and of the
+        ``FORMAT_VERSION`` of the cache) if they can be hashed,
+        ``None`` otherwise.
+    """
+    h = hashlib.sha256()
+    h.update(f"version={FORMAT_VERSION}\n".encode("utf-8"))
+    for (name, value) in sorted(kwargs.items()):
+        h.update(name.encode("utf-8"))
+        if isinstance(value, (set, frozenset)):
+            # Stream the elements, to avoid building a large JSON string.
+            h.update(b"[")
+            for x in sorted(value):
+                h.update(json.dumps(x).encode("utf-8"))
+                h.update(b",")
+            h.update(b"]")
+        elif callable(value):
+            qualname = getattr(value, "__qualname__", None)
+            if qualname is None or "<" in qualname:
+                return None  # <lambda>, <locals>, or not a function
+            h.update(f"{value.__module__}.{qualname}".encode("utf-8"))
+        else:
+            h.update(json.dumps(value, sort_keys=True).encode("utf-8"))
+        h.update(b"\n")
+    return h.hexdigest()
+
+
+class ModelCache:
+    """
+    The :py:class:`ModelCache` class is a content-addressed on-disk cache
+    of learned automata (see the ``cache`` parameter of :py:func:`gold`
+    and :py:meth:`Learner.learn`). Each entry is a compressed JSON file
+    named after the hash of the inputs (see :py:func:`make_key`).
+    When the cache exceeds its maximal size, the least recently used
+    entries are removed.
+
+    The entries are written atomically, hence a cache can be shared by
+    several processes (e.g., the workers of :py:func:`learn_many`).
+
+    Example:
+        >>> import tempfile
+        >>> from regexp_learner import ModelCache, gold
+        >>> cache = ModelCache(tempfile.mkdtemp())
+        >>> (g, success) = gold({"a", "aa"}, {""}, sigma="a", cache=cache)
+        >>> len(cache)
+        1
+        >>> (g, success) = gold({"aa", "a"}, {""}, sigma="a", cache=cache)
+        >>> success, g.accepts("aaa")
+        (True, True)
+    """
+    def __init__(self, directory: str, max_size: int = 1 << 28):
+        """
+        Constructor.
+
+        Args:
+            directory (str): The directory storing the entries (created
+                if needed).
+            max_size (int): The maximal size of the cache, in bytes.
+        """
+        self.directory = directory
+        self.max_size = max_size
+        os.makedirs(directory, exist_ok=True)
+
+    def path(self, key: str) -> str:
+        """
+        Retrieves the path of the file storing an entry.
+
+        Args:
+            key (str): The key of the entry (see :py:func:`make_key`).
+
+        Returns:
+            The path of the corresponding file.
+        """
+        return os.path.join(self.directory, key + SUFFIX)
+
+    def entries(self) -> list:
+        """
+        Lists the entries of this :py:class:`ModelCache`.
+
+        Returns:
+            A list of ``(mtime, size, path)`` tuples, sorted from the least
+            to the most recently used entry.
+        """
+        ret = list()
+        with os.scandir(self.directory) as it:
+            for entry in it:
+                if not entry.name.endswith(SUFFIX):
+                    continue
+                try:
+                    st = entry.stat()
+                except FileNotFoundError:
+                    continue  # Removed by another process
+                ret.append((st.st_mtime, st.st_size, entry.path))
+        ret.sort()
+        return ret
+
+    def __len__(self) -> int:
+        return len(self.entries())
+
+    def get(self, key: str) -> dict:
+        """
+        Retrieves an entry.
+
+        Args:
+            key (str): The key of the entry (see :py:func:`make_key`).
+
+        Returns:
+            The stored ``dict`` if found, ``None`` otherwise.
+        """
+        path = self.path(key)
+        try:
+            with gzip.open(path, "rt", encoding="utf-8") as f:
+                ret = json.load(f)
+            os.utime(path)  # Mark the entry as recently used
+        except (FileNotFoundError, EOFError, OSError, ValueError):
+            return None
+        return ret
+
+    def put(self, key: str, value: dict):
+        """
+        Inserts an entry, and evicts the least recently used entries
+        if the cache exceeds its maximal size.
+
+        Args:
+            key (str): The key of the entry (see :py:func:`make_key`).
+            value (dict): A JSON-serializable ``dict``.
+        """
+        data = gzip.compress(
+            json.dumps(value, separators=(",", ":")).encode("utf-8")
+        )
+        (fd, tmp_path) = tempfile.mkstemp(dir=self.directory)
+        try:
+            with os.fdopen(fd, "wb") as f:
+                f.write(data)
+            os.replace(tmp_path, self.path(key))
+        except BaseException:
+            os.unlink(tmp_path)
+            raise
+        self.evict()
+
+    def evict(self):
+        """
+        Removes the least recently used entries until the size of this
+        :py:class:`ModelCache` does not exceed its maximal size.
+        """
+        entries = self.entries()
+        size = sum(size for (_, size, _) in entries)
+        for (_, entry_size, path) in entries:
+            if size <= self.max_size:
+                break
+            try:
+                os.unlink(path)
+            except FileNotFoundError:
+                pass
+            size -= entry_size
+
+    def clear(self):
+        """
+        Removes all the entries of this :py:class:`ModelCache`.
+        """
+        for (_, _, path) in self.entries():
+            try:
+                os.unlink(path)
+            except FileNotFoundError:
+                pass
@@ -0,0 +1,219 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+#
+# This file is part of the regexp-learner project
+# https://github.com/nokia/regexp-learner
+
+"""
+Command-line interface of the ``regexp-learner`` package.
+
+Examples:
+
+.. code-block:: bash
+
+    regexp-learner gold --positive s_plus.txt --negative s_minus.txt \\
+        --sigma ab --output gold.json
+    regexp-learner lstar --regexp target.txt --output lstar.json
+    regexp-learner lstar --automaton target.json --timeout 60 --jobs 4
+
+The heavy dependencies are imported only once the command line is parsed,
+to keep the startup time low.
+"""
+
+import argparse
+import json
+import sys
+import time
+
+EXIT_SUCCESS = 0
+EXIT_FAILURE = 1
+EXIT_TIMEOUT = 124
+
+
+def make_parser() -> argparse.ArgumentParser:
+    """
+    Builds the command-line parser.
+
+    Returns:
+        The ``argparse.ArgumentParser`` instance.
+    """
+    parser = argparse.ArgumentParser(
+        prog="regexp-learner",
+        description="Learns an automaton and exports it in JSON.",
+    )
+    subparsers = parser.add_subparsers(dest="algorithm", required=True)
+
+    def add_common_arguments(p):
+        p.add_argument(
+            "-o", "--output",
+            help="Path of the output JSON file (default: stdout).",
+        )
+        p.add_argument(
+            "-t", "--timeout", type=float,
+            help="Maximal duration of the learning step, in seconds.",
+        )
+        p.add_argument(
+            "-j", "--jobs", type=int, default=1,
+            help="Number of workers (gold: processes searching the blue "
+                 "states; lstar: threads checking the observation table).",
+        )
+
+    p = subparsers.add_parser(
+        "gold",
+        help="Runs the Gold algorithm on samples.",
+    )
+    p.add_argument(
+        "-p", "--positive", required=True,
+        help="Newline-delimited file of positive examples.",
+    )
+    p.add_argument(
+        "-n", "--negative", required=True,
+        help="Newline-delimited file of negative examples.",
+    )
+    p.add_argument(
+        "-s", "--sigma", default="abcdefghijklmnopqrstuvwxyz0123456789 ",
+        help="The alphabet.",
+    )
+    p.add_argument(
+        "--fill-holes", action="store_true",
+        help="Use the hole filling method.",
+    )
+    p.add_argument(
+        "--minimize", action="store_true",
+        help="Minimize the inferred automaton.",
+    )
+    add_common_arguments(p)
+
+    p = subparsers.add_parser(
+        "lstar",
+        help="Runs the L* algorithm against a target language.",
+    )
+    target = p.add_mutually_exclusive_group(required=True)
+    target.add_argument(
+        "-a", "--automaton",
+        help="JSON file describing the target automaton "
+             "(see regexp_learner.automaton_to_dict).",
+    )
+    target.add_argument(
+        "-r", "--regexp",
+        help="File containing the regular expression of the target "
+             "language (pybgl syntax).",
+    )
+    add_common_arguments(p)
+    return parser
+
+
+def run_gold(args: argparse.Namespace) -> dict:
+    """
+    Runs the Gold algorithm as specified on the command line.
+
+    Args:
+        args (argparse.Namespace): The parsed command line.
+
+    Returns:
+        The learning results.
+    """
+    from .gold import GoldObservationTable
+    from .minimize import minimize_automaton
+    from .samples import read_samples
+    # The steps of gold() are run here to collect the statistics.
+    obs_table = GoldObservationTable(
+        read_samples(args.positive),
+        read_samples(args.negative),
+        sigma=args.sigma,
+        fill_holes=args.fill_holes,
+        n_jobs=args.jobs,
+    )
+    num_promotions = 0
+    try:
+        while obs_table.try_and_promote_blue():
+            num_promotions += 1
+    finally:
+        obs_table.shutdown()
+    (g, success) = obs_table.to_automaton()
+    if success and args.minimize:
+        g = minimize_automaton(g)
+    return {
+        "success": success,
+        "automaton": g,
+        "statistics": {
+            "promotions": num_promotions,
+            "red_states": len(obs_table.red_states),
+            "blue_states": len(obs_table.blue_states),
+            "suffixes": len(obs_table.exp),
+        },
+    }
+
+
+def run_lstar(args: argparse.Namespace) -> dict:
+    """
+    Runs the L* algorithm as specified on the command line.
+
+    Args:
+        args (argparse.Namespace): The parsed command line.
+
+    Returns:
+        The learning results.
+    """
+    from .lstar import Learner, Teacher
+    if args.automaton:
+        from .serialization import automaton_from_dict
+        with open(args.automaton) as f:
+            g = automaton_from_dict(json.load(f))
+    else:
+        from pybgl import compile_dfa
+        with open(args.regexp) as f:
+            g = compile_dfa(f.read().strip(), complete=True)
+    teacher = Teacher(g)
+    learner = Learner(teacher, verbose=False, n_jobs=args.jobs)
+    h = learner.learn()
+    return {
+        "success": True,
+        "automaton": h,
+        "statistics": {
+            "membership_queries": teacher.num_membership_queries,
+            "equivalence_queries": teacher.num_conjectures,
+        },
+    }
+
+
+def main(argv: list = None) -> int:
+    """
+    Entry point of the ``regexp-learner`` command.
+
+    Args:
+        argv (list): The command-line arguments (default: ``sys.argv``).
+
+    Returns:
+        ``0`` if the learning succeeded, ``1`` if it failed,
+        ``124`` if it was interrupted by the time limit.
+    """
+    args = make_parser().parse_args(argv)
+    from .limits import time_limit
+    from .serialization import automaton_to_dict
+
+    run = run_gold if args.algorithm == "gold" else run_lstar
+    start = time.perf_counter()
+    try:
+        with time_limit(args.timeout):
+            result = run(args)
+    except TimeoutError as e:
+        print(f"regexp-learner: {e}", file=sys.stderr)
+        return EXIT_TIMEOUT
+    duration = time.perf_counter() - start
+
+    g = result["automaton"]
+    result["automaton"] = automaton_to_dict(g)
+    result["algorithm"] = args.algorithm
+    result["statistics"].update({
+        "time": duration,
+        "num_states": g.num_vertices(),
+        "num_transitions": g.num_edges(),
+    })
+    s = json.dumps(result, indent=2)
+    if args.output:
+        with open(args.output, "w") as f:
+            print(s, file=f)
+    else:
+        print(s)
+    return EXIT_SUCCESS if result["success"] else EXIT_FAILURE
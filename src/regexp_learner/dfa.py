@@ -0,0 +1,216 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+#
+# This file is part of the regexp-learner project
+# https://github.com/nokia/regexp-learner
+
+
+class DFA:
+    """
+    The :py:class:`DFA` class is a lightweight deterministic automaton,
+    whose states are ``0, ..., n - 1`` and whose transitions are stored
+    in one list per state, indexed by symbol. It is used internally by the
+    learners, as each transition is a couple of list lookups, while
+    :py:class:`pybgl.Automaton` is a general graph structure.
+
+    It provides the subset of the :py:class:`pybgl.Automaton` interface
+    used by the learners (:py:meth:`DFA.initial`, :py:meth:`DFA.delta`,
+    :py:meth:`DFA.is_final`, etc.), and can be converted from and to
+    :py:class:`pybgl.Automaton` (see :py:meth:`DFA.from_automaton` and
+    :py:meth:`DFA.to_automaton`), e.g., for visualization.
+
+    Example:
+        >>> from regexp_learner import DFA
+        >>> g = DFA("ab", [[1, 2], [2, 0], [2, 2]], [True, False, False])
+        >>> g.accepts("abab"), g.accepts("aba")
+        (True, False)
+        >>> g.delta(1, "b"), g.is_complete()
+        (0, True)
+    """
+    __slots__ = ("symbols", "symbol_index", "transitions", "finals", "q0")
+
+    def __init__(
+        self,
+        symbols: list,
+        transitions: list,
+        finals: list,
+        q0: int = 0
+    ):
+        """
+        Constructor.
+
+        Args:
+            symbols (list): The symbols of the alphabet.
+            transitions (list): A list which maps each state ``q`` with a
+                list, whose ``j``-th element is the target of the
+                transition from ``q`` labeled by ``symbols[j]``, or
+                ``None`` if this transition is undefined.
+            finals (list): A list of booleans which maps each state ``q``
+                with ``True`` iff ``q`` is final.
+            q0 (int): The initial state.
+        """
+        self.symbols = list(symbols)
+        self.symbol_index = {a: j for (j, a) in enumerate(self.symbols)}
+        self.transitions = transitions
+        self.finals = finals
+        self.q0 = q0
+
+    def num_vertices(self) -> int:
+        """
+        Retrieves the number of states of this :py:class:`DFA`.
+
+        Returns:
+            The number of states.
+        """
+        return len(self.finals)
+
+    def vertices(self) -> iter:
+        """
+        Retrieves the states of this :py:class:`DFA`.
+
+        Returns:
+            An iterable over the states.
+        """
+        return range(len(self.finals))
+
+    def alphabet(self) -> set:
+        """
+        Retrieves the alphabet of this :py:class:`DFA`.
+
+        Returns:
+            The set of symbols.
+        """
+        return set(self.symbols)
+
+    def initial(self) -> int:
+        """
+        Retrieves the initial state of this :py:class:`DFA`.
+
+        Returns:
+            The initial state.
+        """
+        return self.q0
+
+    def is_final(self, q: int) -> bool:
+        """
+        Tests whether a state is final.
+
+        Args:
+            q (int): A state of this :py:class:`DFA`.
+
+        Returns:
+            ``True`` if ``q`` is final, ``False`` otherwise.
+        """
+        return self.finals[q]
+
+    def delta(self, q: int, a: str) -> int:
+        """
+        Retrieves the target of a transition.
+
+        Args:
+            q (int): A state of this :py:class:`DFA`.
+            a (str): A symbol.
+
+        Returns:
+            The state reached from ``q`` by ``a``, or ``None`` if this
+            transition is undefined (like :py:data:`pybgl.BOTTOM`).
+        """
+        j = self.symbol_index.get(a)
+        return None if j is None else self.transitions[q][j]
+
+    def sigma(self, q: int) -> set:
+        """
+        Retrieves the symbols of the transitions leaving a state.
+
+        Args:
+            q (int): A state of this :py:class:`DFA`.
+
+        Returns:
+            The set of symbols ``a`` such that ``delta(q, a)`` is defined.
+        """
+        return {
+            a
+            for (a, r) in zip(self.symbols, self.transitions[q])
+            if r is not None
+        }
+
+    def is_complete(self) -> bool:
+        """
+        Tests whether every transition of this :py:class:`DFA` is defined.
+
+        Returns:
+            ``True`` if this :py:class:`DFA` is complete, ``False``
+            otherwise.
+        """
+        return all(None not in row for row in self.transitions)
+
+    def accepts(self, w: str) -> bool:
+        """
+        Tests whether this :py:class:`DFA` accepts a word.
+
+        Args:
+            w (str): A word.
+
+        Returns:
+            ``True`` if ``w`` is accepted, ``False`` otherwise.
+        """
+        transitions = self.transitions
+        symbol_index = self.symbol_index
+        q = self.q0
+        for a in w:
+            j = symbol_index.get(a)
+            if j is None:
+                return False
+            q = transitions[q][j]
+            if q is None:
+                return False
+        return self.finals[q]
+
+    @staticmethod
+    def from_automaton(g) -> "DFA":
+        """
+        Builds a :py:class:`DFA` from a deterministic automaton.
+        The initial state of the resulting :py:class:`DFA` is ``0``.
+
+        Args:
+            g (Automaton): A deterministic :py:class:`pybgl.Automaton`
+                instance.
+
+        Returns:
+            The corresponding :py:class:`DFA` instance.
+        """
+        states = sorted(g.vertices())
+        if states:
+            q0 = g.initial()
+            states.remove(q0)
+            states.insert(0, q0)
+        map_state_index = {q: i for (i, q) in enumerate(states)}
+        symbols = sorted(g.alphabet())
+        symbol_index = {a: j for (j, a) in enumerate(symbols)}
+        transitions = [[None] * len(symbols) for _ in states]
+        for e in g.edges():
+            transitions[map_state_index[g.source(e)]][
+                symbol_index[g.label(e)]
+            ] = map_state_index[g.target(e)]
+        finals = [bool(g.is_final(q)) for q in states]
+        return DFA(symbols, transitions, finals)
+
+    def to_automaton(self):
+        """
+        Converts this :py:class:`DFA` to a :py:class:`pybgl.Automaton`
+        (e.g., to display it). The states (including the initial state)
+        are preserved.
+
+        Returns:
+            The corresponding :py:class:`pybgl.Automaton` instance.
+        """
+        from pybgl import Automaton
+        g = Automaton(len(self.finals), q0=self.q0)
+        for (q, row) in enumerate(self.transitions):
+            for (a, r) in zip(self.symbols, row):
+                if r is not None:
+                    g.add_edge(q, r, a)
+        for (q, is_final) in enumerate(self.finals):
+            if is_final:
+                g.set_final(q)
+        return g
@@ -4,5 +4,9 @@
 # This file is part of the regexp-learner project
 # https://github.com/nokia/regexp-learner
 
-from .observation_table import GoldObservationTable
-from .gold import gold
+from ..lazy import lazy_import
+
+lazy_import(__name__, {
+    "GoldObservationTable": ".observation_table",
+    "gold": ".gold",
+})
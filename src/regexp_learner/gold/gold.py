@@ -8,6 +8,16 @@ from pybgl import (
     Automaton,
     html,
 )
+from ..cache import (
+    ModelCache,
+    make_key,
+)
+from ..limits import check_memory_limit
+from ..minimize import minimize_automaton
+from ..serialization import (
+    automaton_from_dict,
+    automaton_to_dict,
+)
 from .observation_table import GoldObservationTable
 
 
@@ -19,7 +29,11 @@ def gold(
     fill_holes: bool = False,
     blue_state_choice_func: callable = min,
     red_state_choice_func: callable = min,
+    n_jobs: int = 1,
+    minimize: bool = False,
     verbose: bool = False,
+    cache: ModelCache = None,
+    max_memory: int = None,
 ) -> tuple[Automaton, bool]:
     """
     Runs the GOLD algorithm.
@@ -50,9 +64,35 @@ def gold(
             function, used to choose which red state to choose
             among the red_states which are compatible with a blue one.
 
+        n_jobs (int): The number of processes used to search the blue
+            states to promote. The result does not depend on this
+            parameter.
+
+        minimize (bool): Pass ``True`` to minimize the inferred automaton
+            (see :py:func:`minimize_automaton`). The states that cannot
+            reach a final state are removed.
+
         verbose (bool): Pass ``True`` to output in HTML
             the important steps of the algorithm.
 
+        cache (ModelCache): A :py:class:`ModelCache` instance, used to
+            reuse the result of a previous run with the same inputs
+            (except ``n_jobs`` and ``verbose``), or ``None``. The cache
+            is not used if a choice function cannot be identified by its
+            name (see :py:func:`make_key`).
+            The automata loaded from the cache are
+            :py:class:`pybgl.Automaton` instances (even the PTA).
+
+        max_memory (int): The maximal size of the observation table, in
+            bytes (see :py:meth:`GoldObservationTable.memory_usage`),
+            checked after each promotion. Pass ``None`` to disable the
+            limit.
+
+    Raises:
+        A :py:class:`MemoryLimitError` exception if the observation table
+        exceeds ``max_memory``. Its ``table`` attribute stores the
+        :py:class:`GoldObservationTable` in its current state.
+
     Returns:
         A tuple ``(g, success)`` where:
         ``g`` is the inferred  :py:class:`Automaton`;
@@ -60,6 +100,24 @@ def gold(
         If ``success`` equals ``False``, then ``g`` is the Prefix Tree
         Acceptor (PTA) accepting ``s_plus``.
     """
+    key = None
+    if cache is not None:
+        s_plus = set(s_plus)
+        s_minus = set(s_minus)
+        key = make_key(
+            algorithm="gold",
+            s_plus=s_plus,
+            s_minus=s_minus,
+            sigma=sigma,
+            red_states=set(red_states),
+            fill_holes=fill_holes,
+            blue_state_choice_func=blue_state_choice_func,
+            red_state_choice_func=red_state_choice_func,
+            minimize=minimize,
+        )
+        entry = cache.get(key) if key is not None else None
+        if entry is not None:
+            return (automaton_from_dict(entry["automaton"]), entry["success"])
     obs_table = GoldObservationTable(
         s_plus,
         s_minus,
@@ -68,10 +126,26 @@ def gold(
         fill_holes=fill_holes,
         blue_state_choice_func=blue_state_choice_func,
         red_state_choice_func=red_state_choice_func,
+        n_jobs=n_jobs,
     )
-    if verbose:
-        html(obs_table.to_html())
-    while obs_table.try_and_promote_blue():
+    try:
         if verbose:
             html(obs_table.to_html())
-    return obs_table.to_automaton()
+        if max_memory is not None:
+            check_memory_limit(obs_table, max_memory)
+        while obs_table.try_and_promote_blue():
+            if verbose:
+                html(obs_table.to_html())
+            if max_memory is not None:
+                check_memory_limit(obs_table, max_memory)
+    finally:
+        obs_table.shutdown()
+    (g, success) = obs_table.to_automaton()
+    if success and minimize:
+        g = minimize_automaton(g)
+    if key is not None:
+        cache.put(
+            key,
+            {"automaton": automaton_to_dict(g), "success": success}
+        )
+    return (g, success)
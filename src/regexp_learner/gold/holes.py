@@ -0,0 +1,187 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+#
+# This file is part of the regexp-learner project
+# https://github.com/nokia/regexp-learner
+
+import numpy as np
+from itertools import chain
+from .parallel import (
+    BLOCK_SIZE,
+    DENSE_ONE,
+    DENSE_STAR,
+    DENSE_ZERO,
+)
+
+
+def make_row_matrix(rows: list, row_length: int) -> np.ndarray:
+    """
+    Builds the dense matrix of some (sparse) rows of a
+    :py:class:`GoldObservationTable`.
+
+    Args:
+        rows (list): The (sparse) rows.
+        row_length (int): The number of columns.
+
+    Returns:
+        The ``len(rows) x row_length`` ``numpy.ndarray`` (``int8``) whose
+        holes are set to ``DENSE_STAR``.
+    """
+    matrix = np.full((len(rows), row_length), DENSE_STAR, dtype=np.int8)
+    lengths = np.fromiter(map(len, rows), dtype=np.int64, count=len(rows))
+    n = int(lengths.sum())
+    i = np.repeat(np.arange(len(rows)), lengths)
+    j = np.fromiter(chain.from_iterable(rows), dtype=np.int64, count=n)
+    v = np.fromiter(
+        chain.from_iterable(row.values() for row in rows),
+        dtype=np.int8,
+        count=n
+    )
+    matrix[i, j] = v
+    return matrix
+
+
+def find_conflicts(matrix1: np.ndarray, matrix2: np.ndarray) -> np.ndarray:
+    """
+    Compares each row of a dense matrix with each row of another one.
+    The rows are processed by blocks of at most ``BLOCK_SIZE`` cells.
+
+    Args:
+        matrix1 (np.ndarray): A ``n1 x m`` dense matrix
+            (see :py:func:`make_row_matrix`).
+        matrix2 (np.ndarray): A ``n2 x m`` dense matrix.
+
+    Returns:
+        The ``n1 x n2`` boolean matrix whose cell ``(i1, i2)`` is ``True``
+        iff ``matrix1[i1]`` and ``matrix2[i2]`` are obviously different.
+    """
+    ones2 = (matrix2 == DENSE_ONE).T.astype(np.float32)
+    zeros2 = (matrix2 == DENSE_ZERO).T.astype(np.float32)
+    ret = np.empty((matrix1.shape[0], matrix2.shape[0]), dtype=np.bool_)
+    step = max(1, BLOCK_SIZE // max(1, matrix1.shape[1]))
+    for start in range(0, matrix1.shape[0], step):
+        block = matrix1[start:start + step]
+        ret[start:start + step] = (
+            (block == DENSE_ONE).astype(np.float32) @ zeros2
+            + (block == DENSE_ZERO).astype(np.float32) @ ones2
+        ) > 0
+    return ret
+
+
+class RedStateChooser:
+    """
+    The :py:class:`RedStateChooser` class applies the
+    ``red_state_choice_func`` of a :py:class:`GoldObservationTable` to the
+    red states selected by a boolean mask.
+    """
+    def __init__(self, red_states: list, red_state_choice_func: callable):
+        """
+        Constructor.
+
+        Args:
+            red_states (list): The red states, in the order of the rows.
+            red_state_choice_func (callable): A ``Iterable[str] -> str``
+                function. If it is :py:func:`min`, the choice is done
+                without building the list of candidates.
+        """
+        self.red_states = red_states
+        self.red_state_choice_func = red_state_choice_func
+        self.map_red_state_index = {r: i for (i, r) in enumerate(red_states)}
+        self.order = (
+            np.argsort(np.array(red_states, dtype=str), kind="stable")
+            if red_state_choice_func is min
+            else None
+        )
+
+    def choose(self, candidates: np.ndarray) -> int:
+        """
+        Chooses a red state among some candidates.
+
+        Args:
+            candidates (np.ndarray): A boolean mask over the red states.
+
+        Returns:
+            The index of the chosen red state if any, ``None`` otherwise.
+        """
+        if self.order is not None:
+            indices = np.flatnonzero(candidates[self.order])
+            return int(self.order[indices[0]]) if indices.size else None
+        indices = np.flatnonzero(candidates)
+        if not indices.size:
+            return None
+        red_state = self.red_state_choice_func(
+            [self.red_states[i] for i in indices]
+        )
+        return self.map_red_state_index[red_state]
+
+
+def fill_holes(
+    red_rows: list,
+    blue_rows: list,
+    row_length: int,
+    chooser: RedStateChooser
+) -> tuple:
+    """
+    Fills the holes of the red and blue rows of a
+    :py:class:`GoldObservationTable` (see
+    :py:meth:`GoldObservationTable.try_and_fill_holes`):
+
+    1. each blue row is merged in a compatible red row (the blue rows are
+       processed in order, and a red row is compatible if it is not
+       obviously different from the blue row, given the previous merges);
+    2. the remaining holes of the red rows are set to ``ONE``;
+    3. each blue row becomes a copy of a compatible red row.
+
+    The conflicts between the initial rows are computed at once
+    (see :py:func:`find_conflicts`). As merging a blue row in a red row
+    only fills holes, the compatible red rows of a blue row are a subset of
+    the initially compatible ones, and only the red rows modified by the
+    previous merges must be checked again.
+
+    Args:
+        red_rows (list): The (sparse) red rows.
+        blue_rows (list): The (sparse) blue rows.
+        row_length (int): The number of columns.
+        chooser (RedStateChooser): Chooses the red state compatible with
+            each blue state.
+
+    Returns:
+        A ``(red_matrix, blue_matrix)`` pair of dense matrices without
+        holes if it succeeds, ``None`` otherwise.
+    """
+    red_matrix = make_row_matrix(red_rows, row_length)
+    blue_matrix = make_row_matrix(blue_rows, row_length)
+    conflicts = find_conflicts(blue_matrix, red_matrix)
+    modified = np.zeros(len(red_rows), dtype=np.bool_)
+    for (b, blue_row) in enumerate(blue_rows):
+        candidates = ~conflicts[b]
+        cols = np.fromiter(
+            blue_row.keys(),
+            dtype=np.int64,
+            count=len(blue_row)
+        )
+        vals = blue_matrix[b, cols]
+        rechecked = np.flatnonzero(candidates & modified)
+        if rechecked.size and cols.size:
+            cells = red_matrix[np.ix_(rechecked, cols)]
+            candidates[rechecked[((cells + vals) == 1).any(axis=1)]] = False
+        r = chooser.choose(candidates)
+        if r is None:  # This should never happen
+            return None
+        holes = red_matrix[r, cols] == DENSE_STAR
+        if holes.any():
+            red_matrix[r, cols[holes]] = vals[holes]
+            modified[r] = True
+    red_matrix[red_matrix == DENSE_STAR] = DENSE_ONE
+
+    # The red rows are complete: a compatible red row has the same values
+    # as the blue row in the filled cells, hence the filled blue row is a
+    # copy of this red row.
+    conflicts = find_conflicts(blue_matrix, red_matrix)
+    chosen = np.empty(len(blue_rows), dtype=np.int64)
+    for b in range(len(blue_rows)):
+        r = chooser.choose(~conflicts[b])
+        if r is None:
+            return None
+        chosen[b] = r
+    return (red_matrix, red_matrix[chosen])
@@ -4,16 +4,21 @@
 # This file is part of the regexp-learner project
 # https://github.com/nokia/regexp-learner
 
+import sys
 from collections import defaultdict
+from copy import copy
+from itertools import chain
 from pybgl import (
+    BOTTOM,
     Automaton,
-    make_assoc_property_map,
-    make_automaton,
     Trie,
 )
+from ..dfa import DFA
+from ..prefix_tree import PrefixTree
 from ..strings import (
+    distinct_suffixes,
     is_prefix_closed,
-    suffixes,
+    sizeof_strings,
 )
 
 
@@ -35,6 +40,7 @@ class GoldObservationTable:
         fill_holes: bool = False,
         blue_state_choice_func: callable = min,
         red_state_choice_func: callable = min,
+        n_jobs: int = 1,
     ):
         """
         Constructor.
@@ -65,49 +71,69 @@ class GoldObservationTable:
                 function, used to choose which red state to choose
                 among the red_states which are compatible with a blue one.
 
-            show_tables_as_html (bool): Pass ``True`` to output in HTML
-                the important steps of the algorithm.
+            n_jobs (int): The number of processes used to search the blue
+                states to promote. If greater than ``1``, the rows are
+                copied in shared memory and processed by a pool of
+                processes (see :py:class:`ParallelBlueStateEvaluator`),
+                which must be released using
+                :py:meth:`GoldObservationTable.shutdown`.
         """
         GoldObservationTable.check_input_consistency(
-            s_plus, s_minus, sigma, red_states
+            (), (), sigma, red_states
         )
         self.blue_state_choice_func = blue_state_choice_func
         self.red_state_choice_func = red_state_choice_func
         self.fill_holes = fill_holes
-        self.s_plus = set(s_plus)
-        self.s_minus = set(s_minus)
+        self.n_jobs = n_jobs
+        self.blue_state_evaluator = None
         self.sigma = sigma
-        self.exp = sorted(
-            list(  # Build suffix closed set EXP
-                set(
-                    suffix
-                    for string in s_plus
-                    for suffix in suffixes(string)
-                ) | set(
-                    suffix
-                    for string in s_minus
-                    for suffix in suffixes(string)
-                )
+        # Each iterable is consumed once, hence s_plus and s_minus may be
+        # generators (e.g., see read_samples). The labeled prefix tree
+        # used to fill the rows is built on the fly: the node reached by
+        # a sample is labeled by ONE or ZERO.
+        self.s_plus = set()
+        self.s_minus = set()
+        # The total size of the strings of s_plus and s_minus, in bytes
+        # (see memory_usage), updated each time a sample is inserted.
+        self.samples_size = 0
+        self.sample_tree = PrefixTree()
+        # The reversed samples are stored in another prefix tree, whose
+        # nodes correspond to the distinct suffixes (see distinct_suffixes).
+        self.suffix_tree = PrefixTree()
+        self.exp = distinct_suffixes(
+            (
+                string
+                for (strings, value) in [
+                    (s_plus, GoldObservationTable.ONE),
+                    (s_minus, GoldObservationTable.ZERO),
+                ]
+                for string in strings
+                if self.insert_sample(string, value)
             ),
-            key=lambda a: (len(a), a)
+            self.suffix_tree
         )
         self.row_length = len(self.exp)
+        # The node reached by self.exp[j] in the EXP tree is labeled by j.
+        self.exp_tree = PrefixTree()
+        for (j, suffix) in enumerate(self.exp):
+            self.exp_tree.insert(suffix, j)
+        # Rows are sparse: {column index: ONE or ZERO}, STAR cells are
+        # not stored.
         self.red_states = {
-            prefix: [
-                self.get_value_from_sample(prefix + suffix)
-                for suffix in self.exp
-            ]
+            prefix: self.make_row(prefix)
             for prefix in red_states
         }
         self.blue_states = {
-            prefix + a: [
-                self.get_value_from_sample(prefix + a + suffix)
-                for suffix in self.exp
-            ]
+            prefix + a: self.make_row(prefix + a)
             for prefix in red_states
             for a in sigma
             if prefix + a not in red_states
         }
+        # Dense rows without holes (see try_and_fill_holes).
+        self.red_matrix = None
+        self.blue_matrix = None
+        self.peak_memory_usage = 0
+        # The maximal total returned by memory_usage so far
 
     @staticmethod
     def check_input_consistency(
@@ -159,6 +185,175 @@ class GoldObservationTable:
                 "S+ and S- must not overlap"
             )
 
+    def insert_sample(self, string: str, value: int) -> bool:
+        """
+        Inserts an example in :py:attr:`self.s_plus` or
+        :py:attr:`self.s_minus` and in the sample tree. The rows of this
+        :py:class:`GoldObservationTable` are not updated (see
+        :py:meth:`GoldObservationTable.add_samples`).
+
+        Args:
+            string (str): The inserted example.
+            value (int): :py:attr:`ONE` for a positive example,
+                :py:attr:`ZERO` for a negative example.
+
+        Raises:
+            A ``RuntimeError`` exception if ``string`` is not consistent
+            with the alphabet or with the examples already inserted.
+
+        Returns:
+            ``True`` if ``string`` has been inserted, ``False`` if it was
+            already inserted.
+        """
+        if value == GoldObservationTable.ONE:
+            (samples, other_samples) = (self.s_plus, self.s_minus)
+        else:
+            (samples, other_samples) = (self.s_minus, self.s_plus)
+        if string in samples:
+            return False
+        if string in other_samples:
+            raise RuntimeError(
+                "S+ and S- must not overlap"
+            )
+        if any(char not in self.sigma for char in string):
+            raise RuntimeError(
+                "Some characters are in the samples, "
+                "but not in the alphabet"
+            )
+        samples.add(string)
+        self.samples_size += sys.getsizeof(string)
+        self.sample_tree.insert(string, value)
+        return True
+
+    def add_samples(self, s_plus: iter = (), s_minus: iter = ()):
+        """
+        Adds positive and negative examples to this
+        :py:class:`GoldObservationTable`. Only the new suffixes are appended
+        to :py:attr:`self.exp` (hence, contrary to the initial columns, they
+        are not sorted), and only the cells related to the new examples are
+        updated. The red and blue states are kept, so that the promotion
+        phase can be resumed using
+        :py:meth:`GoldObservationTable.try_and_promote_blue`.
+
+        Example:
+            >>> from regexp_learner import GoldObservationTable
+            >>> o = GoldObservationTable({"ab"}, {"a"}, sigma="ab")
+            >>> while o.try_and_promote_blue():
+            ...     pass
+            >>> o.add_samples({"abab"}, {"aba"})
+            >>> while o.try_and_promote_blue():
+            ...     pass
+            >>> (g, success) = o.to_automaton()
+
+        Args:
+            s_plus (iter): An iterable of strings that are
+                present in the language to infer.
+
+            s_minus (iter): An iterable of strings that are
+                not present in the language to infer.
+
+        Raises:
+            A ``RuntimeError`` exception if the input data is not consistent
+            with the alphabet or with the examples already in this table.
+        """
+        ONE = GoldObservationTable.ONE
+        ZERO = GoldObservationTable.ZERO
+        s_plus = set(s_plus) - self.s_plus
+        s_minus = set(s_minus) - self.s_minus
+        GoldObservationTable.check_input_consistency(
+            s_plus, s_minus, self.sigma, {""}
+        )
+        if (
+            any(string in self.s_minus for string in s_plus) or
+            any(string in self.s_plus for string in s_minus)
+        ):
+            raise RuntimeError(
+                "S+ and S- must not overlap"
+            )
+
+        # Append the new suffixes to EXP.
+        for suffix in distinct_suffixes(s_plus | s_minus, self.suffix_tree):
+            self.exp_tree.insert(suffix, len(self.exp))
+            self.exp.append(suffix)
+
+        # Update the cells (string[:i], string[i:]) that are in the table.
+        # Only the prefixes not longer than the longest row are considered.
+        max_length = max(
+            map(len, chain(self.red_states, self.blue_states)),
+            default=0
+        )
+        for (strings, samples, value) in [
+            (s_plus, self.s_plus, ONE),
+            (s_minus, self.s_minus, ZERO),
+        ]:
+            for string in strings:
+                samples.add(string)
+                self.samples_size += sys.getsizeof(string)
+                self.sample_tree.insert(string, value)
+                for i in range(min(len(string), max_length) + 1):
+                    prefix = string[:i]
+                    row = self.red_states.get(prefix)
+                    if row is None:
+                        row = self.blue_states.get(prefix)
+                    if row is not None:
+                        v = self.exp_tree.find(string[i:])
+                        row[self.exp_tree.labels[v]] = value
+        self.row_length = len(self.exp)
+        if self.blue_state_evaluator is not None:
+            self.blue_state_evaluator.reset()
+
+    def shutdown(self):
+        """
+        Releases the processes and the shared memory used to search the
+        blue states to promote (see the ``n_jobs`` parameter of the
+        constructor).
+        """
+        if self.blue_state_evaluator is not None:
+            self.blue_state_evaluator.shutdown()
+            self.blue_state_evaluator = None
+
+    def memory_usage(self) -> dict:
+        """
+        Estimates the memory used by this :py:class:`GoldObservationTable`
+        and updates :py:attr:`self.peak_memory_usage`.
+
+        Returns:
+            A ``dict`` which maps:
+
+            - ``"rows"`` with the size of the (sparse) rows of the red and
+              blue states, and of their filled copies (see
+              :py:meth:`GoldObservationTable.try_and_fill_holes`);
+            - ``"keys"`` with the size of the red and blue states, of the
+              suffixes (:py:attr:`self.exp`) and of the structures indexing
+              them;
+            - ``"samples"`` with the size of the examples and of the
+              prefix trees built from them;
+            - ``"total"`` with the sum of the above sizes.
+
+            The sizes are in bytes.
+        """
+        ret = {
+            "rows": sum(map(sys.getsizeof, self.red_states.values()))
+            + sum(map(sys.getsizeof, self.blue_states.values()))
+            + sum(
+                matrix.nbytes
+                for matrix in (self.red_matrix, self.blue_matrix)
+                if matrix is not None
+            ),
+            "keys": sizeof_strings(self.red_states)
+            + sizeof_strings(self.blue_states)
+            + sizeof_strings(self.exp)
+            + self.exp_tree.memory_usage(),
+            "samples": sys.getsizeof(self.s_plus)
+            + sys.getsizeof(self.s_minus)
+            + self.samples_size
+            + self.sample_tree.memory_usage()
+            + self.suffix_tree.memory_usage(),
+        }
+        ret["total"] = sum(ret.values())
+        self.peak_memory_usage = max(self.peak_memory_usage, ret["total"])
+        return ret
+
     def get_value_from_sample(self, w: str) -> int:
         """
         Returns the value used to fill this :py:class:`GoldObservationTable`
@@ -178,28 +373,75 @@ class GoldObservationTable:
             GoldObservationTable.STAR
         )
 
+    def make_row(self, prefix: str) -> dict:
+        """
+        Builds the (sparse) row related to a given prefix.
+
+        Args:
+            prefix (str): A prefix (red or blue state).
+
+        Returns:
+            A ``dict`` which maps each column index ``j`` such that
+            ``prefix + self.exp[j]`` belongs to :py:attr:`self.s_plus`
+            (resp. :py:attr:`self.s_minus`) with :py:attr:`ONE`
+            (resp. :py:attr:`ZERO`). :py:attr:`STAR` cells are omitted.
+        """
+        row = dict()
+        u0 = self.sample_tree.find(prefix)
+        if u0 is None:
+            return row
+        # Walk simultaneously the subtree of the sample tree rooted in u0
+        # and the EXP tree. Each labeled descendant of u0 reached by a
+        # suffix w corresponds to the cell (prefix, w).
+        stack = [(u0, 0)]
+        while stack:
+            (u, v) = stack.pop()
+            value = self.sample_tree.labels[u]
+            if value is not None:
+                row[self.exp_tree.labels[v]] = value
+            children = self.exp_tree.children[v]
+            for (a, u_child) in self.sample_tree.children[u].items():
+                stack.append((u_child, children[a]))
+        return row
+
     @staticmethod
-    def are_obviously_different(row1: list, row2: list) -> bool:
+    def get_row_value(row: dict, j: int) -> int:
+        """
+        Retrieves the value stored in a cell of a (sparse) row.
+
+        Args:
+            row (dict): A row of this :py:class:`GoldObservationTable`.
+            j (int): A column index.
+
+        Returns:
+            The value stored in ``row`` at index ``j``, that is
+            :py:attr:`ONE`, :py:attr:`ZERO` or :py:attr:`STAR`.
+        """
+        return row.get(j, GoldObservationTable.STAR)
+
+    @staticmethod
+    def are_obviously_different(row1: dict, row2: dict) -> bool:
         """
         Checks whether two rows are obviously different.
 
         Args:
-            row1 (list): A row of this :py:class:`GoldObservationTable`.
-            row2 (list): A row of this :py:class:`GoldObservationTable`.
+            row1 (dict): A (sparse) row of this
+                :py:class:`GoldObservationTable`.
+            row2 (dict): A (sparse) row of this
+                :py:class:`GoldObservationTable`.
 
         Returns:
             ``True`` iff one of these two row contains at least one ``ONE``
             and the other row contains at least one ZERO at a given index.
         """
+        if len(row2) < len(row1):
+            (row1, row2) = (row2, row1)
+        # Only the columns filled in both rows may contradict. As STAR
+        # cells are not stored, two filled values differ iff one is ONE
+        # and the other is ZERO.
         return any(
-            (
-                v1 == GoldObservationTable.ONE and
-                v2 == GoldObservationTable.ZERO
-            ) or (
-                v1 == GoldObservationTable.ZERO and
-                v2 == GoldObservationTable.ONE
-            )
-            for (v1, v2) in zip(row1, row2)
+            v1 != row2.get(j, v1)
+            for (j, v1) in row1.items()
         )
 
     def choose_obviously_different_blue_state(self) -> int:
@@ -210,17 +452,30 @@ class GoldObservationTable:
         Returns:
             A state (if found), ``None`` otherwise.
         """
-        blue_candidates = [
-            blue_state
-            for (blue_state, blue_state_val) in self.blue_states.items()
-            if all(
-                GoldObservationTable.are_obviously_different(
-                    blue_state_val,
-                    red_state_val
+        if self.n_jobs > 1:
+            if self.blue_state_evaluator is None:
+                # Imported here, as numpy is only needed if n_jobs > 1.
+                from .parallel import ParallelBlueStateEvaluator
+                self.blue_state_evaluator = ParallelBlueStateEvaluator(
+                    self.n_jobs
                 )
-                for red_state_val in self.red_states.values()
+            blue_candidates = self.blue_state_evaluator.find_candidates(
+                self.red_states,
+                self.blue_states,
+                self.row_length
             )
-        ]
+        else:
+            blue_candidates = [
+                blue_state
+                for (blue_state, blue_state_val) in self.blue_states.items()
+                if all(
+                    GoldObservationTable.are_obviously_different(
+                        blue_state_val,
+                        red_state_val
+                    )
+                    for red_state_val in self.red_states.values()
+                )
+            ]
         if not blue_candidates:
             return None
         else:
@@ -243,79 +498,118 @@ class GoldObservationTable:
         )
         for a in self.sigma:
             if blue_to_promote + a not in self.red_states:
-                self.blue_states[blue_to_promote + a] = [
-                    self.get_value_from_sample(
-                        blue_to_promote + a + suffix
-                    )
-                    for suffix in self.exp
-                ]
+                self.blue_states[blue_to_promote + a] = self.make_row(
+                    blue_to_promote + a
+                )
         return True
 
-    def choose_compatible_red_state(self, row):
+    def make_red_state_index(self) -> dict:
+        """
+        Builds an inverted index of the red states of this
+        :py:class:`GoldObservationTable`. It allows to find the red states
+        that are obviously different from a given row without comparing
+        this row with every red row.
+
+        The sets of red states are encoded as bitsets (``int``), whose
+        ``i``-th bit corresponds to the ``i``-th red state of
+        :py:attr:`self.red_states`.
+
+        Returns:
+            A ``dict`` which maps each ``(j, value)`` pair with the
+            bitset of the red states having ``value`` (:py:attr:`ONE` or
+            :py:attr:`ZERO`) in column ``j``.
+        """
+        red_state_index = defaultdict(int)
+        for (i, red_state_val) in enumerate(self.red_states.values()):
+            bit = 1 << i
+            for (j, v) in red_state_val.items():
+                red_state_index[(j, v)] |= bit
+        return red_state_index
+
+    def choose_compatible_red_state(
+        self,
+        row: dict,
+        red_state_index: dict = None,
+        red_states: list = None
+    ) -> str:
         """
         Finds a red state that is compatible according to a row.
 
         Args:
-            row (list): A vector of values in ``{ONE, ZERO, STAR}``,
-                corresponding to a blue state.
+            row (dict): A (sparse) row corresponding to a blue state.
+            red_state_index (dict): The index returned by
+                :py:meth:`GoldObservationTable.make_red_state_index`,
+                if available. It must be up-to-date with
+                :py:attr:`self.red_states`. Then, the row is compared
+                with the red rows having a value in its columns, and the
+                candidates are the bits left in the complementary bitset.
+            red_states (list): The list of the red states, in the order
+                of :py:attr:`self.red_states`, or ``None``. It avoids
+                rebuilding this list when the index is used many times.
 
         Returns:
             A red state that is compatible (not obviously different)
         """
-        candidates = [
-            red_state
-            for (red_state, red_state_val) in self.red_states.items()
-            if not GoldObservationTable.are_obviously_different(
-                row, red_state_val
-            )
-        ]
+        if red_state_index is None:
+            candidates = [
+                red_state
+                for (red_state, red_state_val) in self.red_states.items()
+                if not GoldObservationTable.are_obviously_different(
+                    row, red_state_val
+                )
+            ]
+        else:
+            if red_states is None:
+                red_states = list(self.red_states)
+            ONE = GoldObservationTable.ONE
+            ZERO = GoldObservationTable.ZERO
+            conflicting = 0
+            for (j, v) in row.items():
+                conflicting |= red_state_index.get(
+                    (j, ONE if v == ZERO else ZERO),
+                    0
+                )
+            bits = ((1 << len(red_states)) - 1) & ~conflicting
+            candidates = list()
+            while bits:
+                bit = bits & -bits
+                candidates.append(red_states[bit.bit_length() - 1])
+                bits ^= bit
         if not candidates:
             return None
         return self.red_state_choice_func(candidates)
 
-    def try_and_fill_holes(self):
+    def try_and_fill_holes(self) -> bool:
         """
         Tries to fill all the holes (:py:attr:`STAR`) that are in the
-        observation table after the promoting phase.
+        observation table after the promoting phase (see
+        :py:func:`fill_holes`). The sparse rows are left unchanged (so
+        that :py:meth:`GoldObservationTable.add_samples` can still be
+        used): the filled rows are stored in the dense matrices
+        :py:attr:`self.red_matrix` and :py:attr:`self.blue_matrix`, whose
+        rows follow the order of :py:attr:`self.red_states` and
+        :py:attr:`self.blue_states`.
 
         Returns:
              ``True`` if it succeeds, ``False`` otherwise.
         """
-        STAR = GoldObservationTable.STAR
-        ZERO = GoldObservationTable.ZERO
-        ONE = GoldObservationTable.ONE
-
         if not self.fill_holes:
             return True
 
-        for (blue_state, blue_state_val) in self.blue_states.items():
-            red_state = self.choose_compatible_red_state(blue_state_val)
-            if red_state is None:  # This should never happen
-                return False
-            red_state_val = self.red_states[red_state]
-            self.red_states[red_state] = [
-                red_state_val[i] if red_state_val[i] != STAR
-                else blue_state_val[i]
-                for i in range(self.row_length)
-            ]
-
-        self.red_states = {
-            red_state: [
-                ONE if red_state_val[i] != ZERO
-                else ZERO
-                for i in range(self.row_length)
-            ] for red_state, red_state_val in self.red_states.items()
-        }
-
-        for (blue_state, blue_state_val) in self.blue_states.items():
-            red_state = self.choose_compatible_red_state(blue_state_val)
-            if red_state is None:
-                return False
-            self.blue_states[blue_state] = [
-                blue_state_val[i] if blue_state_val[i] != self.STAR
-                else self.red_states[red_state][i]
-                for i in range(self.row_length)
-            ]
+        # Imported here, as numpy is only needed if fill_holes is True.
+        from .holes import RedStateChooser, fill_holes
+        ret = fill_holes(
+            list(self.red_states.values()),
+            list(self.blue_states.values()),
+            self.row_length,
+            RedStateChooser(
+                list(self.red_states.keys()),
+                self.red_state_choice_func
+            )
+        )
+        if ret is None:
+            return False
+        (self.red_matrix, self.blue_matrix) = ret
         return True
 
     def to_automaton(self) -> tuple[Automaton, bool]:
@@ -330,61 +624,100 @@ class GoldObservationTable:
             If ``False``, ``g`` is the Prefix Tree Acceptor (PTA) accepting
             ``s_plus``.
         """
-        if self.fill_holes:
-            if not self.try_and_fill_holes():
-                return False, self.make_pta()
+        if self.fill_holes and not self.try_and_fill_holes():
+            return (self.make_pta(), False)
+        red_states = self.red_states
+        blue_states = self.blue_states
         epsilon_idx = self.exp.index("")
         states = sorted(
-            list(self.red_states.keys()),
+            list(red_states.keys()),
             key=lambda s: (len(s), s)
         )
 
+        map_state_index = {q: i for (i, q) in enumerate(states)}
+
         transitions = []
         if self.fill_holes:
+            # Once the holes are filled, the rows are complete, hence
+            # a successor is the first red state having the same row.
+            map_red_state_index = {r: i for (i, r) in enumerate(red_states)}
+            map_blue_state_index = {
+                b: i for (i, b) in enumerate(blue_states)
+            }
+            map_row_red_state = dict()
+            for (r, i) in map_red_state_index.items():
+                map_row_red_state.setdefault(self.red_matrix[i].tobytes(), r)
             for q in states:
                 for a in self.sigma:
-                    qa_val = self.red_states.get(
-                        q + a,
-                        self.blue_states.get(q + a, None)
+                    i = map_red_state_index.get(q + a)
+                    qa_val = (
+                        self.red_matrix[i] if i is not None
+                        else self.blue_matrix[map_blue_state_index[q + a]]
                     )
-                    for (r, r_val) in self.red_states.items():
-                        if qa_val == r_val:
-                            transitions += [(q, r, a)]
-                            break
+                    r = map_row_red_state.get(qa_val.tobytes())
+                    if r is not None:
+                        transitions.append((q, r, a))
         else:
+            red_state_index = self.make_red_state_index()
+            red_state_list = list(red_states)
             for q in states:
                 for a in self.sigma:
-                    if q + a in states:
-                        transitions += [(q, q + a, a)]
+                    if q + a in red_states:
+                        transitions.append((q, q + a, a))
                     else:
-                        qa_val = self.blue_states.get(q + a, None)
-                        r = self.choose_compatible_red_state(qa_val)
-                        transitions += [(q, r, a)]
-
-        transitions = [
-            (states.index(q), states.index(r), a)
-            for (q, r, a) in transitions
-        ]
-        final_states = defaultdict(
-            bool,
-            {
-                states.index(state): (
-                    self.red_states[state][epsilon_idx] == self.ONE
-                )
+                        qa_val = blue_states.get(q + a, None)
+                        r = self.choose_compatible_red_state(
+                            qa_val,
+                            red_state_index,
+                            red_state_list
+                        )
+                        transitions.append((q, r, a))
+
+        symbols = sorted(self.sigma)
+        symbol_index = {a: j for (j, a) in enumerate(symbols)}
+        dfa_transitions = [[None] * len(symbols) for _ in states]
+        for (q, r, a) in transitions:
+            dfa_transitions[map_state_index[q]][symbol_index[a]] = (
+                map_state_index[r]
+            )
+        if self.fill_holes:
+            finals = [
+                self.red_matrix[map_red_state_index[state], epsilon_idx]
+                == self.ONE
                 for state in states
-            }
-        )
-        g = make_automaton(
-            transitions,
-            states.index(""),
-            make_assoc_property_map(final_states)
-        )
+            ]
+        else:
+            finals = [
+                red_states[state].get(epsilon_idx) == self.ONE
+                for state in states
+            ]
+        # The samples are checked on the DFA, which is cheaper to traverse.
+        h = DFA(symbols, dfa_transitions, finals, map_state_index[""])
+        if not self.is_consistent_with_samples(h):
+            return (self.make_pta(), False)
 
-        if not self.fill_holes:
-            if not self.is_consistent_with_samples(g):
-                return (self.make_pta(), False)
+        return (h.to_automaton(), True)
+
+    def copy(self):
+        """
+        Copies this :py:class:`GoldObservationTable` instance. The rows are
+        copied, while the samples, :py:attr:`self.exp` and the prefix trees
+        are shared with the original table.
 
-        return (g, True)
+        Returns:
+            The copied :py:class:`GoldObservationTable` instance.
+        """
+        obs_table = copy(self)
+        obs_table.blue_state_evaluator = None
+        obs_table.red_states = {
+            red_state: dict(red_state_val)
+            for (red_state, red_state_val) in self.red_states.items()
+        }
+        obs_table.blue_states = {
+            blue_state: dict(blue_state_val)
+            for (blue_state, blue_state_val) in self.blue_states.items()
+        }
+        return obs_table
 
     def make_pta(self) -> Trie:
         """
@@ -404,15 +737,9 @@ class GoldObservationTable:
         Checks if a given automaton complies with the positive and negative
         examples.
 
-        _Remarks:_
-
-        - Using the :py:class:`pybgl.Automaton` implementation, this method
-          always returns ``True``.
-        - If the automaton class supports rejecting states,
-          :py:meth:`GoldObservationTable.is_consistent_with_samples` should be
-          overloaded and check whether ``g`` is consistent
-          with :py:attr:`self.s_plus` (positive examples) and
-          with :py:attr:`self.s_minus` (negative examples).
+        The examples are not processed one by one: the sample tree is
+        traversed along with ``g``, so that the transitions related to a
+        prefix shared by several examples are only triggered once.
 
         Args:
             g (Automaton): An automaton instance.
@@ -421,6 +748,19 @@ class GoldObservationTable:
             ``True`` if ``g`` accepts the positive examples and rejects
             the negative examples, ``False`` otherwise.
         """
+        ONE = GoldObservationTable.ONE
+        children = self.sample_tree.children
+        labels = self.sample_tree.labels
+        stack = [(0, g.initial())]
+        while stack:
+            (u, q) = stack.pop()
+            value = labels[u]
+            if value is not None:
+                accepted = q is not BOTTOM and g.is_final(q)
+                if accepted != (value == ONE):
+                    return False
+            for (a, v) in children[u].items():
+                stack.append((v, BOTTOM if q is BOTTOM else g.delta(q, a)))
         return True
 
     def to_html(self) -> str:
@@ -450,16 +790,18 @@ class GoldObservationTable:
                 "<tr><th>{prefix}</th>{values}</tr>".format(
                     prefix=str_to_red_html(red_state),
                     values="".join(
-                        "<td>%s</td>" % self.red_states[red_state][i]
-                        for i in range(self.row_length)
+                        "<td>%s</td>" % self.get_row_value(
+                            self.red_states[red_state], i
+                        ) for i in range(self.row_length)
                     )
                 ) for red_state in self.red_states
             ) + "".join(
                 "<tr><th>{prefix}</th>{values}</tr>".format(
                     prefix=str_to_blue_html(blue_state),
                     values=''.join(
-                        "<td>%s</td>" % self.blue_states[blue_state][i]
-                        for i in range(self.row_length)
+                        "<td>%s</td>" % self.get_row_value(
+                            self.blue_states[blue_state], i
+                        ) for i in range(self.row_length)
                     )
                 ) for blue_state in self.blue_states
             )
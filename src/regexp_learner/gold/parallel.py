@@ -0,0 +1,309 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+#
+# This file is part of the regexp-learner project
+# https://github.com/nokia/regexp-learner
+
+import numpy as np
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing.shared_memory import SharedMemory
+
+# Encoding of the cells in the dense row matrices. As ONE = 1 and ZERO = 0,
+# two cells are obviously different iff their sum equals 1.
+DENSE_ZERO = 0
+DENSE_ONE = 1
+DENSE_STAR = 2
+
+# Maximal number of cells processed at once by a worker.
+BLOCK_SIZE = 1 << 22
+
+
+class SharedRowMatrix:
+    """
+    The :py:class:`SharedRowMatrix` class stores dense rows of a
+    :py:class:`GoldObservationTable` in a shared memory segment, so that
+    worker processes can read them without pickling them.
+    """
+    def __init__(self, num_rows: int, num_cols: int):
+        """
+        Constructor.
+
+        Args:
+            num_rows (int): The capacity (number of rows) of the matrix.
+            num_cols (int): The number of columns of the matrix.
+        """
+        self.shape = (num_rows, num_cols)
+        self.shm = SharedMemory(create=True, size=max(1, num_rows * num_cols))
+        self.array = np.ndarray(self.shape, dtype=np.int8, buffer=self.shm.buf)
+        self.array.fill(DENSE_STAR)
+
+    @property
+    def name(self) -> str:
+        """
+        Retrieves the name of the underlying shared memory segment.
+
+        Returns:
+            The name of the shared memory segment.
+        """
+        return self.shm.name
+
+    def set_row(self, i: int, row: dict):
+        """
+        Writes a (sparse) row in this :py:class:`SharedRowMatrix`.
+
+        Args:
+            i (int): The row index.
+            row (dict): A (sparse) row of a :py:class:`GoldObservationTable`,
+                or ``None`` to clear the row.
+        """
+        self.array[i].fill(DENSE_STAR)
+        if row:
+            self.array[i, list(row.keys())] = list(row.values())
+
+    def close(self):
+        """
+        Releases the shared memory segment.
+        """
+        del self.array
+        self.shm.close()
+        self.shm.unlink()
+
+
+# Shared memory segments attached by the current worker process.
+attached_segments = dict()
+
+
+def attach_row_matrix(name: str, shape: tuple) -> np.ndarray:
+    """
+    Attaches (in a worker process) a :py:class:`SharedRowMatrix`.
+
+    Args:
+        name (str): The name of the shared memory segment.
+        shape (tuple): The shape of the matrix.
+
+    Returns:
+        The corresponding ``numpy.ndarray`` instance.
+    """
+    shm = attached_segments.get(name)
+    if shm is None:
+        shm = SharedMemory(name=name)
+        attached_segments[name] = shm
+    return np.ndarray(shape, dtype=np.int8, buffer=shm.buf)
+
+
+def detach_row_matrices(names: set):
+    """
+    Detaches (in a worker process) the shared memory segments that
+    are not used anymore.
+
+    Args:
+        names (set): The names of the segments in use.
+    """
+    for name in list(attached_segments):
+        if name not in names:
+            attached_segments.pop(name).close()
+
+
+def find_obviously_different_blue_rows(
+    red_name: str,
+    red_shape: tuple,
+    num_red_rows: int,
+    blue_name: str,
+    blue_shape: tuple,
+    start: int,
+    stop: int
+) -> list:
+    """
+    Finds the blue rows obviously different from all the red rows
+    (run by a worker process).
+
+    Args:
+        red_name (str): The name of the red :py:class:`SharedRowMatrix`.
+        red_shape (tuple): The shape of the red :py:class:`SharedRowMatrix`.
+        num_red_rows (int): The number of red rows in use.
+        blue_name (str): The name of the blue :py:class:`SharedRowMatrix`.
+        blue_shape (tuple): The shape of the blue :py:class:`SharedRowMatrix`.
+        start (int): The index of the first blue row to process.
+        stop (int): The index following the last blue row to process.
+
+    Returns:
+        The (sorted) list of the indexes of the matching blue rows.
+    """
+    detach_row_matrices({red_name, blue_name})
+    red = attach_row_matrix(red_name, red_shape)[:num_red_rows]
+    blue = attach_row_matrix(blue_name, blue_shape)
+    (num_rows, num_cols) = red.shape
+    step = max(1, BLOCK_SIZE // max(1, num_rows * num_cols))
+    found = list()
+    for i in range(start, stop, step):
+        block = blue[i:min(i + step, stop)]
+        different = (
+            (block[:, None, :] + red[None, :, :]) == 1
+        ).any(axis=2).all(axis=1)
+        found.extend(int(j) + i for j in np.flatnonzero(different))
+    return found
+
+
+class ParallelBlueStateEvaluator:
+    """
+    The :py:class:`ParallelBlueStateEvaluator` class searches the blue
+    states that are obviously different from all the red states of a
+    :py:class:`GoldObservationTable` using a pool of processes.
+
+    The rows are stored in :py:class:`SharedRowMatrix` instances which
+    are updated incrementally: only the rows of the states added since
+    the previous call are written.
+    """
+    def __init__(self, n_jobs: int):
+        """
+        Constructor.
+
+        Args:
+            n_jobs (int): The number of worker processes.
+        """
+        self.n_jobs = n_jobs
+        self.executor = None
+        self.red = None
+        self.blue = None
+        self.map_red_slot = dict()
+        self.map_blue_slot = dict()
+        self.blue_slots = list()
+        self.free_blue_slots = list()
+
+    def reset(self):
+        """
+        Releases the row matrices. They are rebuilt from scratch at the
+        next call of
+        :py:meth:`ParallelBlueStateEvaluator.find_candidates`. This must
+        be called whenever the existing rows are modified.
+        """
+        for m in (self.red, self.blue):
+            if m is not None:
+                m.close()
+        self.red = None
+        self.blue = None
+        self.map_red_slot.clear()
+        self.map_blue_slot.clear()
+        self.blue_slots.clear()
+        self.free_blue_slots.clear()
+
+    def shutdown(self):
+        """
+        Releases the resources (shared memory and worker processes)
+        of this :py:class:`ParallelBlueStateEvaluator`.
+        """
+        self.reset()
+        if self.executor is not None:
+            self.executor.shutdown()
+            self.executor = None
+
+    @staticmethod
+    def grow(m: SharedRowMatrix, num_rows: int, num_cols: int):
+        """
+        Reallocates a :py:class:`SharedRowMatrix` if it is too small.
+
+        Args:
+            m (SharedRowMatrix): The matrix (possibly ``None``).
+            num_rows (int): The required number of rows.
+            num_cols (int): The required number of columns.
+
+        Returns:
+            ``m`` if it is large enough, a larger copy otherwise.
+        """
+        if m is not None and m.shape[0] >= num_rows:
+            return m
+        ret = SharedRowMatrix(max(16, 2 * num_rows), num_cols)
+        if m is not None:
+            ret.array[:m.shape[0]] = m.array
+            m.close()
+        return ret
+
+    def update(self, red_states: dict, blue_states: dict, row_length: int):
+        """
+        Synchronizes the row matrices with the rows of a
+        :py:class:`GoldObservationTable`.
+
+        Args:
+            red_states (dict): The red rows.
+            blue_states (dict): The blue rows.
+            row_length (int): The number of columns.
+        """
+        if self.red is not None and self.red.shape[1] != row_length:
+            self.reset()
+
+        # The red states are never removed.
+        new_red_states = [q for q in red_states if q not in self.map_red_slot]
+        self.red = ParallelBlueStateEvaluator.grow(
+            self.red, len(red_states), row_length
+        )
+        for q in new_red_states:
+            i = len(self.map_red_slot)
+            self.map_red_slot[q] = i
+            self.red.set_row(i, red_states[q])
+
+        # The promoted blue states release their slot.
+        for q in [q for q in self.map_blue_slot if q not in blue_states]:
+            i = self.map_blue_slot.pop(q)
+            self.blue_slots[i] = None
+            self.blue.set_row(i, None)
+            self.free_blue_slots.append(i)
+        new_blue_states = [
+            q for q in blue_states
+            if q not in self.map_blue_slot
+        ]
+        self.blue = ParallelBlueStateEvaluator.grow(
+            self.blue,
+            len(self.blue_slots) + len(new_blue_states),
+            row_length
+        )
+        for q in new_blue_states:
+            if self.free_blue_slots:
+                i = self.free_blue_slots.pop()
+                self.blue_slots[i] = q
+            else:
+                i = len(self.blue_slots)
+                self.blue_slots.append(q)
+            self.map_blue_slot[q] = i
+            self.blue.set_row(i, blue_states[q])
+
+    def find_candidates(
+        self,
+        red_states: dict,
+        blue_states: dict,
+        row_length: int
+    ) -> list:
+        """
+        Finds the blue states obviously different from all the red states.
+
+        Args:
+            red_states (dict): The red rows.
+            blue_states (dict): The blue rows.
+            row_length (int): The number of columns.
+
+        Returns:
+            The list of matching blue states, in the order of
+            ``blue_states`` (hence, the result does not depend on the
+            number of processes).
+        """
+        if self.executor is None:
+            self.executor = ProcessPoolExecutor(self.n_jobs)
+        self.update(red_states, blue_states, row_length)
+        n = len(self.blue_slots)
+        if not n:
+            return list()
+        shard_size = -(-n // self.n_jobs)
+        futures = [
+            self.executor.submit(
+                find_obviously_different_blue_rows,
+                self.red.name, self.red.shape, len(self.map_red_slot),
+                self.blue.name, self.blue.shape,
+                start, min(start + shard_size, n)
+            )
+            for start in range(0, n, shard_size)
+        ]
+        found = {
+            self.blue_slots[i]
+            for future in futures
+            for i in future.result()
+        }
+        return [q for q in blue_states if q in found]
@@ -0,0 +1,64 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+#
+# This file is part of the regexp-learner project
+# https://github.com/nokia/regexp-learner
+
+import sys
+from importlib import import_module
+from types import ModuleType
+
+
+class LazyModule(ModuleType):
+    """
+    The :py:class:`LazyModule` class is the type of the packages whose
+    public symbols are imported on first access (see
+    :py:func:`lazy_import`).
+    """
+    def __getattr__(self, name: str) -> object:
+        module_name = self.__dict__["_lazy_imports"].get(name)
+        if module_name is None:
+            raise AttributeError(
+                f"module {self.__name__!r} has no attribute {name!r}"
+            )
+        value = getattr(import_module(module_name, self.__name__), name)
+        self.__dict__[name] = value
+        return value
+
+    def __setattr__(self, name: str, value: object):
+        # Importing a submodule binds it to its package. This binding is
+        # skipped when a public symbol has the same name (e.g., the gold
+        # function and the gold subpackage), so that the symbol wins.
+        if (
+            isinstance(value, ModuleType)
+            and name in self.__dict__["_lazy_imports"]
+        ):
+            return
+        super().__setattr__(name, value)
+
+    def __dir__(self) -> list:
+        return sorted(set(self.__dict__) | set(self.__all__))
+
+
+def lazy_import(name: str, imports: dict):
+    """
+    Makes the public symbols of a package imported on first access,
+    so that importing the package (or one of its lightweight modules)
+    does not import the heavy dependencies (numpy, pybgl).
+
+    Example:
+        >>> import regexp_learner
+        >>> from regexp_learner.strings import prefixes
+        >>> regexp_learner.prefixes is prefixes
+        True
+
+    Args:
+        name (str): The name of the package, i.e., ``__name__`` in its
+            ``__init__.py`` file.
+        imports (dict): A ``{str: str}`` dictionary mapping each public
+            symbol with the (relative) name of the module defining it.
+    """
+    module = sys.modules[name]
+    module.__dict__["_lazy_imports"] = imports
+    module.__dict__["__all__"] = list(imports)
+    module.__class__ = LazyModule
@@ -0,0 +1,99 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+#
+# This file is part of the regexp-learner project
+# https://github.com/nokia/regexp-learner
+
+import signal
+from contextlib import contextmanager
+
+
+@contextmanager
+def time_limit(seconds: float = None):
+    """
+    Context manager bounding the execution time of a block of code.
+    It relies on ``SIGALRM``, hence it must be used from the main thread,
+    and it has no effect on platforms not supporting this signal.
+
+    Example:
+        >>> from regexp_learner.limits import time_limit
+        >>> with time_limit(10):
+        ...     pass
+
+    Args:
+        seconds (float): The maximal duration, in seconds.
+            Pass ``None`` to disable the limit.
+
+    Raises:
+        A ``TimeoutError`` exception if the block of code lasts
+        more than ``seconds``.
+    """
+    if seconds is None or not hasattr(signal, "SIGALRM"):
+        yield
+        return
+
+    def on_alarm(signum, frame):
+        raise TimeoutError(f"Time limit exceeded ({seconds}s)")
+
+    previous_handler = signal.signal(signal.SIGALRM, on_alarm)
+    signal.setitimer(signal.ITIMER_REAL, seconds)
+    try:
+        yield
+    finally:
+        signal.setitimer(signal.ITIMER_REAL, 0)
+        signal.signal(signal.SIGALRM, previous_handler)
+
+
+class MemoryLimitError(MemoryError):
+    """
+    Exception raised when an observation table exceeds the memory limit
+    passed to a learner (see the ``max_memory`` parameter of
+    :py:func:`gold` and :py:meth:`Learner.learn`). The partial state
+    is kept, e.g., to inspect the table or to resume with more memory.
+    """
+    def __init__(self, usage: dict, max_memory: int, table: object = None):
+        """
+        Constructor.
+
+        Args:
+            usage (dict): The memory usage of the table (see
+                :py:meth:`LstarObservationTable.memory_usage` and
+                :py:meth:`GoldObservationTable.memory_usage`).
+            max_memory (int): The memory limit, in bytes.
+            table (object): The observation table, in its current state.
+        """
+        self.usage = usage
+        self.max_memory = max_memory
+        self.table = table
+        details = ", ".join(
+            f"{k}={v}" for (k, v) in usage.items() if k != "total"
+        )
+        super().__init__(
+            f"Memory limit exceeded ({usage['total']} > {max_memory} bytes; "
+            f"{details})"
+        )
+
+
+def check_memory_limit(table: object, max_memory: int = None) -> dict:
+    """
+    Measures the memory used by an observation table, and checks it
+    against a limit.
+
+    Args:
+        table (object): An object providing a ``memory_usage()`` method,
+            e.g., an :py:class:`LstarObservationTable` or a
+            :py:class:`GoldObservationTable` instance.
+        max_memory (int): The maximal size of ``table``, in bytes.
+            Pass ``None`` to disable the limit.
+
+    Raises:
+        A :py:class:`MemoryLimitError` exception if the memory used by
+        ``table`` exceeds ``max_memory``.
+
+    Returns:
+        The memory usage of ``table``.
+    """
+    usage = table.memory_usage()
+    if max_memory is not None and usage["total"] > max_memory:
+        raise MemoryLimitError(usage, max_memory, table)
+    return usage
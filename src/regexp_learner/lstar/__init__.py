@@ -4,10 +4,16 @@
 # This file is part of the regexp-learner project
 # https://github.com/nokia/regexp-learner
 
-from .automaton_match import automaton_match
-from .learner import (
-    Learner,
-    make_automaton_from_observation_table,
-)
-from .observation_table import LstarObservationTable
-from .teacher import Teacher
+from ..lazy import lazy_import
+
+lazy_import(__name__, {
+    "automaton_match": ".automaton_match",
+    "find_counterexamples": ".automaton_match",
+    "Learner": ".learner",
+    "make_automaton_from_observation_table": ".learner",
+    "make_dfa_from_observation_table": ".learner",
+    "LstarObservationTable": ".observation_table",
+    "PredicateTeacher": ".teacher",
+    "RegexpTeacher": ".teacher",
+    "Teacher": ".teacher",
+})
@@ -4,11 +4,13 @@
 # This file is part of the regexp-learner project
 # https://github.com/nokia/regexp-learner
 
+import numpy as np
 from collections import deque
 from pybgl import (
     Automaton,
     html,
 )
+from ..dfa import DFA
 
 
 def automaton_match(
@@ -21,9 +23,14 @@ def automaton_match(
     the same language. One can minimize an Automaton using
     ``pybgl.hopcroft_minimize.hopcroft_minimize``.
 
+    Both :py:class:`pybgl.Automaton` and :py:class:`DFA` instances are
+    supported, and the latter are faster to traverse.
+
     Args:
-        g1 (Automaton): A minimal deterministic ``Automaton`` instance.
-        g2 (Automaton): A minimal deterministic ``Automaton`` instance.
+        g1 (Automaton): A minimal deterministic ``Automaton`` or
+            :py:class:`DFA` instance.
+        g2 (Automaton): A minimal deterministic ``Automaton`` or
+            :py:class:`DFA` instance.
         verbose (bool): Pass ``True`` to print useful HTML information.
 
     Returns:
@@ -76,3 +83,182 @@ def automaton_match(
             log(f"{contradiction=}")
             return contradiction
     return None
+
+
+def make_dense_automaton(g: Automaton, symbols: list) -> tuple:
+    """
+    Builds the dense transition matrix of a deterministic automaton.
+    An extra state (the last one) plays the role of the sink state.
+
+    Args:
+        g (Automaton): A deterministic ``Automaton`` or
+            :py:class:`DFA` instance.
+        symbols (list): The symbols, corresponding to the columns of the
+            transition matrix. They may not all belong to the alphabet
+            of ``g``.
+
+    Returns:
+        A ``(delta, finals, q0)`` tuple, where ``delta`` is the
+        ``(n + 1) x len(symbols)`` transition matrix, ``finals`` is the
+        boolean vector of the final states, and ``q0`` is the initial state.
+    """
+    if isinstance(g, DFA):
+        n = g.num_vertices()
+        sink = n
+        num_symbols = len(g.symbols)
+        try:
+            # Fast path (complete DFA): the conversion is done by numpy.
+            transitions = np.array(g.transitions, dtype=np.int64)
+        except TypeError:
+            transitions = np.array(
+                [
+                    [sink if r is None else r for r in row]
+                    for row in g.transitions
+                ],
+                dtype=np.int64
+            )
+        transitions = transitions.reshape(n, num_symbols)
+        delta = np.full((n + 1, len(symbols)), sink, dtype=np.int64)
+        for (i, a) in enumerate(symbols):
+            j = g.symbol_index.get(a)
+            if j is not None:
+                delta[:n, i] = transitions[:, j]
+        finals = np.zeros(n + 1, dtype=np.bool_)
+        finals[:n] = g.finals
+        q0 = g.initial() if n else sink
+        return (delta, finals, q0)
+
+    states = sorted(g.vertices())
+    map_state_index = {q: i for (i, q) in enumerate(states)}
+    sink = len(states)
+    symbol_index = {a: j for (j, a) in enumerate(symbols)}
+    delta = np.full((sink + 1, len(symbols)), sink, dtype=np.int64)
+    for e in g.edges():
+        j = symbol_index.get(g.label(e))
+        if j is not None:
+            delta[map_state_index[g.source(e)], j] = (
+                map_state_index[g.target(e)]
+            )
+    finals = np.zeros(sink + 1, dtype=np.bool_)
+    for (i, q) in enumerate(states):
+        finals[i] = g.is_final(q)
+    q0 = map_state_index[g.initial()] if states else sink
+    return (delta, finals, q0)
+
+
+def find_dense_counterexamples(
+    dense1: tuple,
+    dense2: tuple,
+    symbols: list,
+    k: int = 1
+) -> list:
+    """
+    Searches the shortest words accepted by exactly one of two dense
+    automata (see :py:func:`make_dense_automaton`). The product automaton
+    is traversed in breadth-first order, one layer at a time, using numpy
+    array operations. The visited pairs of states are stored in a bitmap
+    of ``(n1 + 1) * (n2 + 1)`` bits (allocated lazily by the system), and
+    the witnesses are rebuilt from the parent arrays of each layer.
+
+    Args:
+        dense1 (tuple): The ``(delta, finals, q0)`` tuple of the first
+            automaton.
+        dense2 (tuple): The ``(delta, finals, q0)`` tuple of the second
+            automaton.
+        symbols (list): The symbols corresponding to the columns of the
+            transition matrices.
+        k (int): The maximal number of counterexamples.
+
+    Returns:
+        The list of (at most ``k``) counterexamples, sorted by increasing
+        length, and leading to distinct pairs of states. The
+        counterexamples of a given length are sorted by pair of states.
+    """
+    (delta1, finals1, q01) = dense1
+    (delta2, finals2, q02) = dense2
+    n2 = delta2.shape[0]
+    num_symbols = len(symbols)
+    sink_pair = (delta1.shape[0] - 1) * n2 + (n2 - 1)
+    visited = np.zeros((delta1.shape[0] * n2 + 7) >> 3, dtype=np.uint8)
+
+    frontier1 = np.array([q01], dtype=np.int64)
+    frontier2 = np.array([q02], dtype=np.int64)
+    first_id = q01 * n2 + q02
+    visited[first_id >> 3] |= np.uint8(1 << (first_id & 7))
+    layers = list()
+    # layers[d] = (parents, labels) of the pairs discovered at depth d + 1
+    ret = list()
+    while frontier1.size:
+        found = np.flatnonzero(finals1[frontier1] != finals2[frontier2])
+        for i in found[:k - len(ret)]:
+            # Rebuild the witness.
+            word = list()
+            for (parents, labels) in reversed(layers):
+                word.append(symbols[labels[i]])
+                i = parents[i]
+            ret.append("".join(reversed(word)))
+        if len(ret) == k:
+            break
+
+        # Expand the frontier.
+        targets1 = delta1[frontier1].ravel()
+        targets2 = delta2[frontier2].ravel()
+        ids = targets1 * n2 + targets2
+        # Drop the visited pairs first (cheap), then the duplicates.
+        first = np.flatnonzero(
+            (((visited[ids >> 3] >> (ids & 7).astype(np.uint8)) & 1) == 0)
+            & (ids != sink_pair)
+        )
+        (ids, index) = np.unique(ids[first], return_index=True)
+        first = first[index]
+        # Mark the new pairs as visited. As ids is sorted, the bits
+        # belonging to the same byte are contiguous.
+        if ids.size:
+            offsets = ids >> 3
+            starts = np.flatnonzero(
+                np.concatenate(([True], offsets[1:] != offsets[:-1]))
+            )
+            visited[offsets[starts]] |= np.bitwise_or.reduceat(
+                (1 << (ids & 7)).astype(np.uint8), starts
+            )
+        layers.append((first // num_symbols, first % num_symbols))
+        frontier1 = ids // n2
+        frontier2 = ids % n2
+    return ret
+
+
+def find_counterexamples(g1: Automaton, g2: Automaton, k: int = 1) -> list:
+    """
+    Searches the shortest words accepted by exactly one of two
+    deterministic automata, by traversing their product in breadth-first
+    order (see :py:func:`find_dense_counterexamples`). Contrary to
+    :py:func:`automaton_match`, the automata do not need to be minimal nor
+    complete (a missing transition leads to an implicit sink state).
+
+    Example:
+        >>> from pybgl import compile_dfa
+        >>> from regexp_learner import find_counterexamples
+        >>> g1 = compile_dfa("(ab)*", complete=True)
+        >>> g2 = compile_dfa("ab", complete=True)
+        >>> find_counterexamples(g1, g2, k=2)
+        ['', 'abab']
+
+    Args:
+        g1 (Automaton): A deterministic ``Automaton`` or
+            :py:class:`DFA` instance.
+        g2 (Automaton): A deterministic ``Automaton`` or
+            :py:class:`DFA` instance.
+        k (int): The maximal number of counterexamples.
+
+    Returns:
+        The list of (at most ``k``) counterexamples, sorted by increasing
+        length, and leading to distinct pairs of states. It is empty iff
+        ``g1`` and ``g2`` recognize the same language.
+    """
+    symbols = sorted(g1.alphabet() | g2.alphabet())
+    return find_dense_counterexamples(
+        make_dense_automaton(g1, symbols),
+        make_dense_automaton(g2, symbols),
+        symbols,
+        k
+    )
@@ -5,24 +5,168 @@
 # https://github.com/nokia/regexp-learner
 
 import numpy as np
+from collections import deque
 from pybgl import (
     Automaton,
     html,
-    make_automaton,
     graph_to_html,
-    make_func_property_map
+)
+from ..cache import (
+    ModelCache,
+    make_key,
+)
+from ..dfa import DFA
+from ..limits import check_memory_limit
+from ..minimize import minimize_automaton
+from ..serialization import (
+    automaton_from_dict,
+    automaton_to_dict,
 )
 from .observation_table import LstarObservationTable
 from .teacher import Teacher
 
 
-def make_automaton_from_observation_table(
+def find_representatives(o: LstarObservationTable) -> list:
+    """
+    Retrieves the prefixes of ``S`` corresponding to the states of the
+    hypothesis built by :py:func:`make_dfa_from_observation_table`.
+
+    Args:
+        o (LstarObservationTable): A closed and consistent
+            :py:class:`LstarObservationTable` instance.
+
+    Returns:
+        The list which maps each state ``q`` of the hypothesis with a
+        prefix of ``S`` whose row corresponds to ``q``. In particular,
+        ``""`` is mapped with the initial state ``0``.
+    """
+    if o.membership_query is not None:
+        return list(o.classes().keys())
+    rows = set()
+    representatives = list()
+    for s in sorted(o.s):
+        row = o.row(s)
+        if row not in rows:
+            rows.add(row)
+            representatives.append(s)
+    return representatives
+
+
+def make_characterization(g: Automaton, alphabet: list) -> tuple:
+    """
+    Computes the prefixes and the suffixes characterizing the states of
+    a deterministic automaton, i.e., the ``S`` and ``E`` sets of an
+    observation table from which it can be rebuilt (see
+    :py:meth:`Learner.seed`).
+
+    Example:
+        >>> from pybgl import compile_dfa
+        >>> from regexp_learner.lstar.learner import make_characterization
+        >>> make_characterization(compile_dfa("(ab)*", complete=True), "ab")
+        (['', 'a', 'b', 'ab'], ['', 'b'])
+
+    Args:
+        g (Automaton): A deterministic ``Automaton`` or
+            :py:class:`DFA` instance.
+        alphabet (list): The symbols that may be used in the prefixes and
+            in the suffixes.
+
+    Returns:
+        A ``(prefixes, suffixes)`` pair, where ``prefixes`` contains the
+        shortest word leading to each reachable state (it is prefix-closed)
+        and ``suffixes`` contains a word distinguishing each pair of
+        non-equivalent reachable states (it is suffix-closed). Both lists
+        are sorted by length, then lexicographically.
+    """
+    if not isinstance(g, DFA):
+        g = DFA.from_automaton(g)
+    symbols = sorted(set(alphabet) & g.alphabet())
+    symbol_indices = [g.symbol_index[a] for a in symbols]
+
+    # Access words (breadth-first search)
+    access = {g.initial(): ""}
+    queue = deque([g.initial()])
+    while queue:
+        q = queue.popleft()
+        for (a, j) in zip(symbols, symbol_indices):
+            r = g.transitions[q][j]
+            if r is not None and r not in access:
+                access[r] = access[q] + a
+                queue.append(r)
+
+    # The reachable states are renumbered in the order of the search, and
+    # the missing transitions lead to an additional rejecting sink state.
+    states = list(access)
+    index = {q: i for (i, q) in enumerate(states)}
+    sink = len(states)
+    successors = [
+        [
+            sink if g.transitions[q][j] is None
+            else index[g.transitions[q][j]]
+            for j in symbol_indices
+        ]
+        for q in states
+    ]
+    successors.append([sink] * len(symbols))
+
+    # Distinguishing suffixes (Moore's partition refinement). The block of
+    # a state is the bitset of the suffixes it accepts. If two states of a
+    # block have, for a symbol a, successors in different blocks, then
+    # a suffix e distinguishes these successors, hence a + e splits the
+    # block: a + e is added to the suffixes, which remain suffix-closed.
+    # A suffix is only added if its block has not been split by the
+    # suffixes previously added in the same round.
+    suffixes = [""]
+    signatures = [int(g.finals[q]) for q in states] + [0]
+    while True:
+        blocks = dict()
+        for (i, signature) in enumerate(signatures):
+            blocks.setdefault(signature, list()).append(i)
+        splitters = dict()
+        for j in range(len(symbols)):
+            targets = dict()
+            for (i, signature) in enumerate(signatures):
+                if signature in splitters:
+                    continue
+                target = signatures[successors[i][j]]
+                other = targets.setdefault(signature, target)
+                if other != target:
+                    diff = other ^ target
+                    k = (diff & -diff).bit_length() - 1
+                    splitters[signature] = (j, k)
+        if not splitters:
+            break
+        for (signature, (j, k)) in sorted(
+            splitters.items(),
+            key=lambda item: (len(suffixes[item[1][1]]), item[1])
+        ):
+            if len({signatures[i] for i in blocks[signature]}) > 1:
+                continue
+            bit = 1 << len(suffixes)
+            signatures = [
+                signature | (bit if signatures[r[j]] >> k & 1 else 0)
+                for (signature, r) in zip(signatures, successors)
+            ]
+            suffixes.append(symbols[j] + suffixes[k])
+
+    def shortlex(w):
+        return (len(w), w)
+
+    return (
+        sorted(access.values(), key=shortlex),
+        sorted(suffixes, key=shortlex)
+    )
+
+
+def make_dfa_from_observation_table(
     o: LstarObservationTable,
     verbose: bool = False
-) -> Automaton:
+) -> DFA:
     """
-    Builds an :py:class:`Automaton` instance from an
-    :py:class:`LstarObservationTable` instance.
+    Builds a :py:class:`DFA` instance from a closed and consistent
+    :py:class:`LstarObservationTable` instance. Its initial state
+    (corresponding to the empty prefix) is ``0``. If the table is lazy,
+    the missing cells needed to compare its rows are queried.
 
     Args:
         o (LstarObservationTable): A
@@ -31,56 +175,99 @@ def make_automaton_from_observation_table(
             HTML information.
 
     Returns:
-        The resulting `Automaton` instance.
+        The resulting :py:class:`DFA` instance.
     """
     def quiet(s):
         pass
     log = html if verbose else quiet
+    if o.membership_query is not None:
+        # Lazy table: the rows may be partially probed, hence they are
+        # compared cell by cell rather than hashed.
+        representatives = find_representatives(o)  # Hence, q0 = 0
+        map_prefix_state = {s: q for (q, s) in enumerate(representatives)}
+        symbols = sorted(o.a)
+        transitions = [
+            [
+                map_prefix_state[
+                    o.find_equivalent_prefix(s + a, representatives)
+                ]
+                for a in symbols
+            ]
+            for s in representatives
+        ]
+        finals = o.query_many([(s, "") for s in representatives])
+        log(f"States: {map_prefix_state}")
+        return DFA(symbols, transitions, finals)
+
     map_row_state = dict()
-    q0 = 0
-    final_states = set()
-    transitions = list()
+    representatives = list()
+    finals = list()
 
     # Build states
-    q = 0
     for s in sorted(o.s):  # Hence, q0 = 0
         row = o.row(s)
-        if row not in map_row_state.keys():
+        if row not in map_row_state:
+            q = len(representatives)
             map_row_state[row] = q
-            is_final = o.get(s, "")
-            if is_final:
-                final_states.add(q)
+            representatives.append(s)
+            is_final = bool(o.get(s, ""))
+            finals.append(is_final)
             log(
                 f"Adding state {q} for prefix {s} "
-                f"(row = {o.row(s)}, is_final = {is_final})"
+                f"(row = {row}, is_final = {is_final})"
             )
-            q += 1
 
     # Build transitions
-    for (row, q) in map_row_state.items():
-        # Find prefix leading to q
-        s = None
-        for s in o.s:
-            if o.row(s) == row:
-                break
-        assert s is not None
-
-        for a in o.a:
+    symbols = sorted(o.a)
+    transitions = list()
+    for (q, s) in enumerate(representatives):
+        targets = list()
+        for a in symbols:
             r = map_row_state[o.row(s + a)]
-            transitions.append((q, r, a))
+            targets.append(r)
             log(
                 f"Adding {a}-transition from {q} "
                 f"({o.row(s)}) to {r} ({o.row(s + a)})"
             )
+        transitions.append(targets)
+    return DFA(symbols, transitions, finals)
 
-    g = make_automaton(
-        transitions,
-        q0,
-        make_func_property_map(lambda q: q in final_states)
-    )
-    log(f"{final_states=}")
-    log("<pre>make_automaton_from_observation_table</pre> returns:")
-    log(graph_to_html(g))
+
+def make_automaton_from_observation_table(
+    o: LstarObservationTable,
+    verbose: bool = False,
+    minimize: bool = False
+) -> Automaton:
+    """
+    Builds an :py:class:`Automaton` instance from an
+    :py:class:`LstarObservationTable` instance.
+    See also :py:func:`make_dfa_from_observation_table`.
+
+    Args:
+        o (LstarObservationTable): A
+            :py:class:`LstarObservationTable` instance.
+        verbose (bool); Pass ``True`` to print useful
+            HTML information.
+        minimize (bool): Pass ``True`` to minimize the resulting
+            automaton (see :py:func:`minimize_automaton`). The resulting
+            automaton remains complete.
+
+    Returns:
+        The resulting `Automaton` instance.
+    """
+    def quiet(s):
+        pass
+    log = html if verbose else quiet
+    h = make_dfa_from_observation_table(o, verbose=verbose)
+    if minimize:
+        g = minimize_automaton(h, complete=True)
+    else:
+        g = h.to_automaton()
+    if verbose:
+        final_states = {q for q in h.vertices() if h.is_final(q)}
+        log(f"{final_states=}")
+        log("<pre>make_automaton_from_observation_table</pre> returns:")
+        log(graph_to_html(g))
     return g
 
 
@@ -92,26 +279,182 @@ class Learner:
         self,
         teacher: Teacher,
         epsilon: str = "",
-        verbose: bool = True
+        verbose: bool = True,
+        lazy: bool = False,
+        num_counterexamples: int = 1,
+        prior: object = None,
+        n_jobs: int = 1
     ):
         """
         Constructor.
 
         Args:
             teacher (Teacher): The teacher aka oracle (in the Angluin
-                framework).
+                framework), e.g., a :py:class:`Teacher`,
+                :py:class:`PredicateTeacher` or :py:class:`RegexpTeacher`
+                instance.
             epsilon (str): The empty word.
             verbose (bool); Pass ``True`` to print useful HTML
                 information.
+            lazy (bool): Pass ``True`` to query the cells of the
+                :py:class:`LstarObservationTable` only when they are
+                needed to check whether it is closed and consistent, or
+                to build the hypothesis. This reduces the number of
+                membership queries.
+            num_counterexamples (int): The maximal number of
+                counterexamples requested to the :py:class:`Teacher` for
+                each conjecture (see :py:meth:`Teacher.counterexamples`).
+                They are processed together, which reduces the number of
+                conjectures and of hypotheses built.
+            prior (object): A model of a previous version of the language
+                used to warm-start this :py:class:`Learner` (see
+                :py:meth:`Learner.seed`), e.g., the
+                :py:class:`LstarObservationTable` of a previous
+                :py:class:`Learner`, or an ``Automaton`` or
+                :py:class:`DFA` instance. Pass ``None`` to learn from
+                scratch.
+            n_jobs (int): The number of threads used to check whether a
+                large :py:class:`LstarObservationTable` is closed and
+                consistent (see its constructor). The result does not
+                depend on this parameter.
         """
         def quiet(s):
             pass
         self.teacher = teacher
         self.sigma = self.teacher.alphabet
-        self.o = LstarObservationTable(self.sigma)
+        self.o = LstarObservationTable(
+            self.sigma,
+            membership_query=(
+                self.teacher.membership_query if lazy else None
+            ),
+            n_jobs=n_jobs,
+            membership_queries=self.membership_queries if lazy else None
+        )
         self.epsilon = epsilon
+        self.num_counterexamples = num_counterexamples
+        self.prior = prior
         self.log = html if verbose else quiet
 
+    def membership_queries(self, words: list) -> list:
+        """
+        Submits several membership queries to the :py:class:`Teacher` of
+        this :py:class:`Learner`, at once if it provides a
+        ``membership_queries`` method (e.g.,
+        :py:meth:`PredicateTeacher.membership_queries`), one by one
+        otherwise.
+
+        Args:
+            words (list): The tested words.
+
+        Returns:
+            The list of the answers.
+        """
+        membership_queries = getattr(self.teacher, "membership_queries", None)
+        if membership_queries is not None:
+            return [bool(accepted) for accepted in membership_queries(words)]
+        return [bool(self.teacher.membership_query(w)) for w in words]
+
+    def seed(self, prior: object):
+        """
+        Fills the :py:class:`LstarObservationTable` of this
+        :py:class:`Learner` using a model of a previous version of the
+        language, without querying the :py:class:`Teacher`.
+
+        The prefixes and the suffixes of the model are inserted in ``S``
+        and ``E``, and the corresponding cells are filled with the
+        answers of the model. These cells are tentative (see
+        :py:meth:`LstarObservationTable.set`): they are only validated
+        when they are involved in a counterexample (see
+        :py:meth:`Learner.revalidate`). Hence, if the language has
+        slightly changed, only the states impacted by the change are
+        re-explored. The cells added afterwards are queried as usual.
+
+        Args:
+            prior (object): An :py:class:`LstarObservationTable`, or an
+                ``Automaton`` or :py:class:`DFA` instance (see
+                :py:func:`make_characterization`).
+        """
+        if isinstance(prior, LstarObservationTable):
+            prefixes = sorted(prior.s)
+            suffixes = list(prior.suffixes)
+            answer = prior.get
+        else:
+            if not isinstance(prior, DFA):
+                prior = DFA.from_automaton(prior)
+            (prefixes, suffixes) = make_characterization(prior, self.sigma)
+            answer = (lambda s, e: prior.accepts(s + e))
+
+        # The symbols that are no longer in the alphabet are dropped (this
+        # preserves the prefix-closure of S and the suffix-closure of E).
+        sigma = set(self.sigma)
+        prefixes = [s for s in prefixes if set(s) <= sigma]
+        suffixes = [e for e in suffixes if set(e) <= sigma]
+        self.o.s |= set(prefixes)
+        for e in suffixes:
+            self.o.add_suffix(e)
+        for s in set(prefixes) | {s + a for s in prefixes for a in self.sigma}:
+            for e in suffixes:
+                accepted = answer(s, e)
+                if accepted is not None:
+                    self.o.set(s, e, bool(accepted), tentative=True)
+
+    def revalidate(self, h: DFA, ts: list) -> bool:
+        """
+        Validates the tentative cells (see :py:meth:`Learner.seed`) which
+        led the hypothesis to misclassify some counterexamples, i.e., the
+        cells of the rows traversed by the runs of the counterexamples in
+        the hypothesis, and of the rows of their prefixes (if any).
+
+        Args:
+            h (DFA): The hypothesis, built by
+                :py:func:`make_dfa_from_observation_table`.
+            ts (list): The counterexamples returned by the
+                :py:class:`Teacher` for ``h``.
+
+        Returns:
+            ``True`` if at least one validated cell was wrong (then, the
+            counterexamples may be explained by the table itself),
+            ``False`` otherwise.
+        """
+        if not self.o.guesses:
+            return False
+        # The representatives must be computed before validating any cell,
+        # as validating may change the rows of the table (and thus its
+        # classes), while the states of h remain those of the initial table.
+        representatives = find_representatives(self.o)
+        rows = list()
+        for t in ts:
+            rows += [t[:i] for i in range(len(t) + 1)]
+            q = h.initial()
+            rows.append(representatives[q])
+            for a in t:
+                rows.append(representatives[q] + a)
+                q = h.delta(q, a)
+                if q is None:
+                    break
+                rows.append(representatives[q])
+        return self.validate(rows)
+
+    def validate(self, prefixes: list) -> bool:
+        """
+        Validates the tentative cells (see :py:meth:`Learner.seed`) of
+        some rows of the :py:class:`LstarObservationTable`.
+
+        Args:
+            prefixes (list): The prefixes of the rows.
+
+        Returns:
+            ``True`` if at least one validated cell was wrong,
+            ``False`` otherwise.
+        """
+        if not self.o.guesses:
+            return False
+        changed = False
+        for s in prefixes:
+            if self.o.validate(s, self.membership_queries):
+                changed = True
+        return changed
+
     def initialize(self, verbose: bool = True):
         """
         Initializes the :py:class:`LstarObservationTable` of this
@@ -121,11 +464,13 @@ class Learner:
             verbose (bool): Pass ``True`` to print useful HTML
             information.
         """
+        if self.prior is not None:
+            self.seed(self.prior)
         self.o.s.add(self.epsilon)
         self.o.set(
             self.epsilon,
             self.epsilon,
-            self.teacher.membership_query(self.epsilon)
+            self.membership_queries([self.epsilon])[0]
         )
         self.extend()
         if verbose:
@@ -137,7 +482,17 @@ class Learner:
         Extends the :py:class:`LstarObservationTable` of this
         :py:class:`Learner`. This method is triggered when the
         :py:class:`Teacher` returns a counter example.
+        If the :py:class:`LstarObservationTable` is lazy, only the rows
+        are added, and the cells are queried on demand. Otherwise, the
+        missing cells which cannot be guessed are queried at once (see
+        :py:meth:`Learner.membership_queries`).
         """
+        if self.o.membership_query is not None:
+            for s in list(self.o.s):
+                for a in self.o.a:
+                    self.o.add_prefix(s + a)
+            return
+        missing = list()
         for s in (
             {s for s in self.o.s} |
             {s + a for s in self.o.s for a in self.o.a}
@@ -145,95 +500,195 @@ class Learner:
             for e in self.o.e:
                 if self.o.get(s, e) is not None:
                     continue
-                self.o.set(s, e, self.teacher.membership_query(s + e))
+                guess = self.o.guess(s + e)
+                if guess is not None:
+                    self.o.set(s, e, guess, tentative=True)
+                else:
+                    missing.append((s, e))
+        if missing:
+            answers = self.membership_queries([s + e for (s, e) in missing])
+            for ((s, e), accepted) in zip(missing, answers):
+                self.o.set(s, e, accepted)
 
-    def learn(self, verbose: bool = False) -> Automaton:
+    def learn(
+        self,
+        verbose: bool = False,
+        cache: ModelCache = None,
+        max_memory: int = None,
+        track_memory: bool = False
+    ) -> Automaton:
         """
         Trains the :py:class:`Learner` to infer the :py:class:`Automaton`
         of the :py:class:`Teacher`.
 
         Args:
             verbose (bool): Pass ``True`` to print useful HTML information.
+            cache (ModelCache): A :py:class:`ModelCache` instance, used to
+                reuse the automaton previously learned from the same
+                :py:class:`Teacher` language (see
+                :py:meth:`Teacher.fingerprint`), or ``None``. In case of
+                cache hit, the :py:class:`Teacher` is not queried.
+            max_memory (int): The maximal size of the
+                :py:class:`LstarObservationTable`, in bytes (see
+                :py:meth:`LstarObservationTable.memory_usage`), checked
+                each time it grows. Pass ``None`` to disable the limit.
+            track_memory (bool): Pass ``True`` to measure the
+                :py:class:`LstarObservationTable` each time it grows,
+                even if ``max_memory`` is ``None``. The table is only
+                measured if one of these parameters is set, and then,
+                the peak usage is stored in ``self.o.peak_memory_usage``.
+
+        Raises:
+            A :py:class:`MemoryLimitError` exception if the
+            :py:class:`LstarObservationTable` exceeds ``max_memory``. Its
+            ``table`` attribute stores the table in its current state
+            (it is also available in ``self.o``).
 
         Returns:
             The inferred :py:class:`Automaton` instance.
         """
+        fingerprint = (
+            self.teacher.fingerprint() if cache is not None else None
+        )
+        if fingerprint is not None:
+            key = make_key(
+                algorithm="lstar",
+                teacher=fingerprint,
+                epsilon=self.epsilon,
+            )
+            entry = cache.get(key)
+            if entry is not None:
+                return automaton_from_dict(entry["automaton"])
+            h = self.learn(
+                verbose=verbose,
+                max_memory=max_memory,
+                track_memory=track_memory
+            )
+            cache.put(key, {"automaton": automaton_to_dict(h)})
+            return h
+        measure = max_memory is not None or track_memory
         self.initialize(verbose=verbose)
-        i = 0
-        while True:
-            if verbose:
-                self.log("<b>Iteration {i + 1}</b>")
-            is_consistent = self.o.is_consistent()
-            is_closed = self.o.is_closed()
+        if measure:
+            check_memory_limit(self.o, max_memory)
+        try:
             i = 0
-            while not (is_consistent and is_closed):
-                if not is_consistent:
-                    (s1, s2, a, e) = self.o.find_mismatch_consistency()
+            while True:
+                if verbose:
+                    self.log("<b>Iteration {i + 1}</b>")
+                is_consistent = self.o.is_consistent()
+                is_closed = self.o.is_closed()
+                i = 0
+                while not (is_consistent and is_closed):
+                    if not is_consistent:
+                        (s1, s2, a, e) = self.o.find_mismatch_consistency()
+                        if self.validate([s1, s2, s1 + a, s2 + a]):
+                            # The defect was due to a wrong guess.
+                            if verbose:
+                                self.log("Some tentative cells were wrong")
+                        else:
+                            if verbose:
+                                self.log(self.o.to_html())
+                                self.log(
+                                    "The observation table is not consistent: "
+                                    f"({s1=}, {s2=}, {a=}, {e=}), "
+                                    f"adding {a+e=} to E"
+                                )
+                            self.o.add_suffix(a + e)
+                    else:
+                        # The new column must be filled before checking
+                        # closedness again, hence one defect is fixed at once.
+                        (s1, a) = self.o.find_mismatch_closeness()
+                        if self.validate([s1 + a]):
+                            # The defect was due to a wrong guess.
+                            if verbose:
+                                self.log("Some tentative cells were wrong")
+                        else:
+                            if verbose:
+                                self.log(self.o.to_html())
+                                self.log(
+                                    "The observation table is not closed: "
+                                    f"{s1=} + {a=}, adding {s1 + a} to S"
+                                )
+                            self.o.s.add(s1 + a)
+                            self.o.add_prefix(s1 + a)
+                    self.extend()
+                    if measure:
+                        check_memory_limit(self.o, max_memory)
+                    is_consistent = self.o.is_consistent()
+                    is_closed = self.o.is_closed()
+                    i += 1
+                    # if i > 10:
+                    #     raise Exception(
+                    #         "Implementation error? (infinite loop)"
+                    #     )
+                if verbose:
+                    self.log("The observation table is closed and consistent")
+                    self.log(
+                        """
+                        <table>
+                            <tr>
+                                <th>Teacher</th>
+                                <th>Observation table</th>
+                            </tr>
+                            <tr>
+                                <td>%s</td>
+                                <td>%s</td>
+                            </tr>
+                        </table>
+                        """ % (
+                            (
+                                graph_to_html(self.teacher.g)
+                                if isinstance(self.teacher, Teacher)
+                                else type(self.teacher).__name__
+                            ),
+                            self.o.to_html()
+                        )
+                    )
+                    assert self.o.is_consistent()
+                    assert self.o.is_closed()
+
+                h = make_dfa_from_observation_table(self.o)
+                if verbose:
+                    html(graph_to_html(h.to_automaton()))
+                    final_states = {q for q in h.vertices() if h.is_final(q)}
+                    html(f"{final_states=}")
+                if self.num_counterexamples > 1:
+                    ts = self.teacher.counterexamples(
+                        h,
+                        self.num_counterexamples
+                    )
+                else:
+                    t = self.teacher.conjecture(h)
+                    ts = [] if t is None else [t]
+                if ts and self.revalidate(h, ts):
+                    # Some guessed cells were wrong: the table must be fixed
+                    # before processing the counterexamples.
                     if verbose:
+                        self.log(f"The teacher disagreed: {ts=}")
+                        self.log("Some tentative cells were wrong")
                         self.log(self.o.to_html())
-                        self.log(
-                            "The observation table is not consistent: "
-                            f"({s1=}, {s2=}, {a=}, {e=}), adding {a+e=} to E"
-                        )
-                    self.o.add_suffix(a + e)
-                if not is_closed:
-                    (s1, a) = self.o.find_mismatch_closeness()
+                elif ts:
+                    prefixes = {
+                        t[:i]
+                        for t in ts
+                        for i in np.arange(1, len(t) + 1)
+                    }
+                    self.o.s |= prefixes
+                    for s in prefixes:
+                        self.o.add_prefix(s)
+                    self.extend()
+                    if measure:
+                        check_memory_limit(self.o, max_memory)
                     if verbose:
+                        self.log(f"The teacher disagreed: {ts=}")
+                        self.log(f"Prefixes added to S: {prefixes}")
+                        self.log("S is now equal to {self.o.s}")
                         self.log(self.o.to_html())
-                        self.log(
-                            "The observation table is not closed: "
-                            f"{s1=} + {a=}, adding {s1 + a} to S"
-                        )
-                    self.o.s.add(s1 + a)
-                    self.o.add_prefix(s1 + a)
-                self.extend()
-                is_consistent = self.o.is_consistent()
-                is_closed = self.o.is_closed()
+                else:
+                    if verbose:
+                        self.log("The teacher agreed :-)")
+                    break
                 i += 1
-                # if i > 10:
-                #     raise Exception("Implementation error? (infinite loop)")
-            if verbose:
-                self.log("The observation table is closed and consistent")
-                self.log(
-                    """
-                    <table>
-                        <tr>
-                            <th>Teacher</th>
-                            <th>Observation table</th>
-                        </tr>
-                        <tr>
-                            <td>%s</td>
-                            <td>%s</td>
-                        </tr>
-                    </table>
-                    """ % (
-                        graph_to_html(self.teacher.g),
-                        self.o.to_html()
-                    )
-                )
-                assert self.o.is_consistent()
-                assert self.o.is_closed()
-
-            h = make_automaton_from_observation_table(self.o, verbose=False)
-            if verbose:
-                html(graph_to_html(h))
-                final_states = {q for q in h.vertices() if h.is_final(q)}
-                html(f"{final_states=}")
-            t = self.teacher.conjecture(h)
-            if t is not None:
-                prefixes = {t[:i] for i in np.arange(1, len(t) + 1)}
-                self.o.s |= prefixes
-                for s in prefixes:
-                    self.o.add_prefix(s)
-                self.extend()
-                if verbose:
-                    self.log(f"The teacher disagreed: {t=}")
-                    self.log(f"Prefixes added to S: {prefixes}")
-                    self.log("S is now equal to {self.o.s}")
-                    self.log(self.o.to_html())
-            else:
-                if verbose and t is not None:
-                    self.log("The teacher agreed :-)")
-                break
-            i += 1
+        finally:
+            self.o.shutdown()
         return make_automaton_from_observation_table(self.o)
@@ -2,7 +2,10 @@
 # -*- coding: utf-8 -*-
 
 import numpy as np
+import sys
+from concurrent.futures import ThreadPoolExecutor
 from operator import itemgetter
+from ..strings import sizeof_strings
 
 
 class LstarObservationTable:
@@ -10,18 +13,56 @@ class LstarObservationTable:
     :py:class:`LstarObservationTable` implements the L* observation table
     used by the :py:class:`Learner` in the Angluin algorithm.
     """
-    def __init__(self, a: list = "abcdefghijklmnopqrstuvwxyz"):
+    # Below this number of cells, the checks are not worth parallelizing.
+    PARALLEL_MIN_CELLS = 1 << 16
+
+    def __init__(
+        self,
+        a: list = "abcdefghijklmnopqrstuvwxyz",
+        membership_query: callable = None,
+        n_jobs: int = 1,
+        membership_queries: callable = None
+    ):
         """
         Constructor.
 
         Args:
             a (list): The alphabet.
+            membership_query (callable): A ``str -> bool`` function
+                (typically, :py:meth:`Teacher.membership_query`). If set,
+                the table is lazy: the cells needed to compare two rows
+                are queried on demand (see
+                :py:meth:`LstarObservationTable.query`), and two rows are
+                told apart as soon as a probed column differs.
+                Pass ``None`` if the table is filled by the caller.
+            n_jobs (int): The number of threads used to check whether a
+                (non-lazy) table is closed and consistent, once it has at
+                least :py:attr:`PARALLEL_MIN_CELLS` cells. The rows are
+                processed by blocks, using numpy operations that release
+                the GIL. The result does not depend on this parameter.
+                The thread pool is reused by the successive checks, and
+                must be released using
+                :py:meth:`LstarObservationTable.shutdown`.
+            membership_queries (callable): A ``list -> list`` function
+                answering several membership queries at once (typically,
+                :py:meth:`PredicateTeacher.membership_queries`), used by
+                a lazy table to fill several cells at once (see
+                :py:meth:`LstarObservationTable.query_many`). Pass
+                ``None`` to call ``membership_query`` on each word.
         """
         self.a = a
+        self.membership_query = membership_query
+        self.membership_queries = membership_queries
+        self.n_jobs = n_jobs
         self.map_prefix = dict()
         # {str : int} maps prefixes with row indexes
         self.map_suffix = dict()
         # {str : int} maps suffixes with column indexes
+        self.suffixes = list()
+        # [str] maps column indexes with suffixes
+        self.answers = dict()
+        # {str: bool} caches the membership queries of a lazy table
+        # and of the validated cells
         self.s = set()
         # {str} keeps track of prefixes
         self.t = np.zeros((1, 1), dtype=np.bool_)
@@ -29,6 +70,16 @@ class LstarObservationTable:
         self.probed = np.zeros((1, 1), dtype=np.bool_)
         # {0,1}^(|map_prefixes|x|map_suffixes|) indicated parts of T
         # that have been probed
+        self.tentative = np.zeros((1, 1), dtype=np.bool_)
+        # {0,1}^(|map_prefixes|x|map_suffixes|) indicated parts of T
+        # that have been guessed (see Learner.seed) rather than queried
+        self.guesses = dict()
+        # {str: [(str, str)]} maps each guessed word with its tentative cells
+        self.peak_memory_usage = 0
+        # The maximal total returned by memory_usage so far
+        self.executor = None
+        # The thread pool of the parallel checks (see is_parallel), created
+        # on demand and released by shutdown()
 
     @property
     def e(self) -> set:
@@ -75,6 +126,11 @@ class LstarObservationTable:
             self.probed.shape[0],
             values=0, axis=0
         )
+        self.tentative = np.insert(
+            self.tentative,
+            self.tentative.shape[0],
+            values=0, axis=0
+        )
 
     def add_col(self):
         """
@@ -90,6 +146,11 @@ class LstarObservationTable:
             self.probed.shape[1],
             values=0, axis=1
         )
+        self.tentative = np.insert(
+            self.tentative,
+            self.tentative.shape[1],
+            values=0, axis=1
+        )
 
     def add_prefix(self, s: str) -> tuple[int, bool]:
         """
@@ -129,13 +190,21 @@ class LstarObservationTable:
               :py:class:`LstarObservationTable`, ``False`` otherwise.
         """
         j = LstarObservationTable.get_or_create_index(self.map_suffix, e)
+        if j == len(self.suffixes):
+            self.suffixes.append(e)
         (m, n) = self.t.shape
         added = (j >= n)
         if added:
             self.add_col()
         return (j, added)
 
-    def set(self, s: str, e: str, accepted: bool = True):
+    def set(
+        self,
+        s: str,
+        e: str,
+        accepted: bool = True,
+        tentative: bool = False
+    ):
         """
         Fills this :py:class:`LstarObservationTable` according to a given
         prefix, a given suffix, and a boolean indicating whether their
@@ -146,11 +215,95 @@ class LstarObservationTable:
             e (str): The suffix.
             accepted (bool): Pass ``True`` if ``s + e`` belongs to the
                 :py:class:`Teacher`'s language, ``False`` otherwise.
+            tentative (bool): Pass ``True`` if ``accepted`` is guessed
+                (e.g., from a previously learned model) rather than
+                answered by the :py:class:`Teacher`
+                (see :py:meth:`LstarObservationTable.validate`).
         """
         (i, _) = self.add_prefix(s)
         (j, _) = self.add_suffix(e)
         self.t[i, j] = accepted
         self.probed[i, j] = True
+        self.tentative[i, j] = tentative
+        if tentative:
+            self.guesses.setdefault(s + e, list()).append((s, e))
+        elif self.guesses:
+            # The other cells of the same word must agree with the answer,
+            # otherwise the table could never become consistent.
+            for (s2, e2) in self.guesses.pop(s + e, ()):
+                (i2, j2) = (self.map_prefix[s2], self.map_suffix[e2])
+                self.t[i2, j2] = accepted
+                self.tentative[i2, j2] = False
+
+    def guess(self, w: str) -> bool:
+        """
+        Retrieves the tentative observation related to a word
+        (see :py:meth:`LstarObservationTable.set`).
+
+        Args:
+            w (str): A word.
+
+        Returns:
+            The observation guessed for ``w`` if any, ``None`` otherwise.
+        """
+        cells = self.guesses.get(w)
+        if not cells:
+            return None
+        (s, e) = cells[0]
+        return bool(self.t[self.map_prefix[s], self.map_suffix[e]])
+
+    def is_tentative(self, s: str, e: str) -> bool:
+        """
+        Checks whether a cell of this :py:class:`LstarObservationTable`
+        is tentative (see :py:meth:`LstarObservationTable.set`).
+
+        Args:
+            s (str): The prefix.
+            e (str): The suffix.
+
+        Returns:
+            ``True`` if the cell has been guessed and not validated yet,
+            ``False`` otherwise.
+        """
+        i = self.get_row(s)
+        j = self.get_col(e)
+        if i is None or j is None:
+            return False
+        return bool(self.tentative[i, j])
+
+    def validate(self, s: str, membership_queries: callable) -> list:
+        """
+        Queries the tentative cells of a row, and replaces the guessed
+        observations by the answers (in every cell of the queried words).
+        The words not queried yet are submitted at once.
+
+        Args:
+            s (str): A prefix.
+            membership_queries (callable): A ``list -> list`` function
+                answering several membership queries (typically,
+                :py:meth:`Learner.membership_queries`).
+
+        Returns:
+            The list of suffixes whose observation has changed.
+        """
+        ret = list()
+        i = self.get_row(s)
+        if i is None:
+            return ret
+        cols = np.flatnonzero(self.tentative[i, :len(self.suffixes)])
+        words = [s + self.suffixes[j] for j in cols]
+        unknown = [w for w in words if w not in self.answers]
+        if unknown:
+            self.answers.update(
+                zip(unknown, map(bool, membership_queries(unknown)))
+            )
+        for (j, w) in zip(cols, words):
+            e = self.suffixes[j]
+            accepted = self.answers[w]
+            if accepted != self.t[i, j]:
+                ret.append(e)
+            self.set(s, e, accepted)
+        return ret
 
     def get_row(self, s: str) -> int:
         """
@@ -205,6 +358,169 @@ class LstarObservationTable:
         ret = self.t[i, j]
         return bool(ret)
 
+    def query(self, s: str, e: str) -> bool:
+        """
+        Probes this :py:class:`LstarObservationTable` for a given prefix
+        and a given suffix, and fills the cell using the membership query
+        function (see the constructor) if it has not been probed yet.
+        Each word is queried at most once, and a word whose observation
+        is tentative is not queried (see
+        :py:meth:`LstarObservationTable.validate`).
+
+        Args:
+            s (str): The prefix.
+            e (str): The suffix.
+
+        Returns:
+            The observation related to ``s + e``.
+        """
+        return self.query_many([(s, e)])[0]
+
+    def query_many(self, cells: list) -> list:
+        """
+        Probes several cells (see :py:meth:`LstarObservationTable.query`).
+        The words of the cells that must be queried are submitted at once
+        if the table has a ``membership_queries`` function (see the
+        constructor).
+
+        Args:
+            cells (list): A list of ``(s, e)`` pairs.
+
+        Returns:
+            The list of the corresponding observations.
+        """
+        ret = [self.get(s, e) for (s, e) in cells]
+        missing = list()
+        for (k, (s, e)) in enumerate(cells):
+            if ret[k] is not None:
+                continue
+            # Several cells may correspond to the same word.
+            w = s + e
+            guess = self.guess(w)
+            if guess is not None:
+                self.set(s, e, guess, tentative=True)
+                ret[k] = guess
+            else:
+                missing.append(k)
+        unknown = list(dict.fromkeys(
+            cells[k][0] + cells[k][1]
+            for k in missing
+            if cells[k][0] + cells[k][1] not in self.answers
+        ))
+        if unknown:
+            answers = (
+                self.membership_queries(unknown)
+                if self.membership_queries is not None
+                else map(self.membership_query, unknown)
+            )
+            self.answers.update(zip(unknown, map(bool, answers)))
+        for k in missing:
+            (s, e) = cells[k]
+            ret[k] = self.answers[s + e]
+            self.set(s, e, ret[k])
+        return ret
+
+    def find_distinguishing_suffix(self, s1: str, s2: str) -> str:
+        """
+        Searches a suffix telling apart the rows of two prefixes. The
+        probed cells are checked first, then the missing cells are queried
+        (see :py:meth:`LstarObservationTable.query`) until a difference
+        is found.
+
+        Args:
+            s1 (str): A prefix.
+            s2 (str): A prefix.
+
+        Returns:
+            A suffix ``e`` such that ``s1 + e`` and ``s2 + e`` are not both
+            accepted or both rejected if any, ``None`` otherwise (i.e.,
+            ``s1`` and ``s2`` have the same row).
+        """
+        (i1, _) = self.add_prefix(s1)
+        (i2, _) = self.add_prefix(s2)
+        n = len(self.suffixes)
+        probed = self.probed[i1, :n] & self.probed[i2, :n]
+        different = np.flatnonzero(
+            probed & (self.t[i1, :n] != self.t[i2, :n])
+        )
+        if different.size:
+            return self.suffixes[different[0]]
+        for j in np.flatnonzero(~probed):
+            e = self.suffixes[j]
+            (v1, v2) = self.query_many([(s1, e), (s2, e)])
+            if v1 != v2:
+                return e
+        return None
+
+    def find_equivalent_prefix(self, s: str, candidates: list) -> str:
+        """
+        Searches a prefix having the same row as a given prefix
+        (see :py:meth:`LstarObservationTable.find_distinguishing_suffix`).
+
+        Args:
+            s (str): A prefix.
+            candidates (list): The candidate prefixes.
+
+        Returns:
+            The first prefix of ``candidates`` having the same row as ``s``
+            if any, ``None`` otherwise.
+        """
+        for candidate in candidates:
+            if self.find_distinguishing_suffix(s, candidate) is None:
+                return candidate
+        return None
+
+    def classes(self) -> dict:
+        """
+        Groups the prefixes of ``S`` having the same row
+        (see :py:meth:`LstarObservationTable.find_distinguishing_suffix`).
+
+        Returns:
+            A ``{str: list}`` dictionary which maps the shortest prefix of
+            each class (in the lexicographic order, hence ``""`` comes
+            first) with the other prefixes of the class.
+        """
+        ret = dict()
+        for s in sorted(self.s, key=lambda s: (len(s), s)):
+            representative = self.find_equivalent_prefix(s, ret.keys())
+            if representative is None:
+                ret[s] = list()
+            else:
+                ret[representative].append(s)
+        return ret
+
+    def memory_usage(self) -> dict:
+        """
+        Estimates the memory used by this :py:class:`LstarObservationTable`
+        and updates :py:attr:`self.peak_memory_usage`.
+
+        Returns:
+            A ``dict`` which maps:
+
+            - ``"matrices"`` with the size of the boolean matrices;
+            - ``"keys"`` with the size of the prefixes, of the suffixes
+              and of the structures indexing them;
+            - ``"answers"`` with the size of the cached (or guessed)
+              membership queries;
+            - ``"total"`` with the sum of the above sizes.
+
+            The sizes are in bytes.
+        """
+        ret = {
+            "matrices": self.t.nbytes + self.probed.nbytes
+            + self.tentative.nbytes,
+            "keys": sizeof_strings(self.map_prefix)
+            + sizeof_strings(self.map_suffix)
+            + sys.getsizeof(self.suffixes)
+            + sys.getsizeof(self.s),
+            "answers": sizeof_strings(self.answers)
+            + sizeof_strings(self.guesses)
+            + sum(map(sys.getsizeof, self.guesses.values())),
+        }
+        ret["total"] = sum(ret.values())
+        self.peak_memory_usage = max(self.peak_memory_usage, ret["total"])
+        return ret
+
     def to_html(self) -> str:
         """
         Exports this :py:class:`LstarObservationTable` to HTML.
@@ -212,8 +528,12 @@ class LstarObservationTable:
         Returns:
             The corresponding HTML string.
         """
-        def bool_to_html(b) -> str:
-            return "?" if b is None else str(b)
+        def bool_to_html(b, tentative=False) -> str:
+            return (
+                "?" if b is None
+                else "<i>%s</i>" % b if tentative
+                else str(b)
+            )
 
         def str_to_html(s) -> str:
             return repr(s) if s else "&#x3b5;"
@@ -247,7 +567,10 @@ class LstarObservationTable:
             "rows": "".join([
                 "<tr><th>%(prefix)s</th>%(cells)s</tr>" % {
                     "cells": "".join([
-                        "<td>%s</td>" % bool_to_html(self.get(s, e))
+                        "<td>%s</td>" % bool_to_html(
+                            self.get(s, e),
+                            self.is_tentative(s, e)
+                        )
                         for e in sorted_suffixes
                     ]),
                     "prefix": prefix_to_html(self, s),
@@ -269,6 +592,195 @@ class LstarObservationTable:
         # tobytes() is used to get something hashable
         return self.t[i, :].tobytes() if i is not None else None
 
+    def is_parallel(self) -> bool:
+        """
+        Checks whether the closedness and consistency checks of this
+        :py:class:`LstarObservationTable` are run by blocks in a thread
+        pool (see the ``n_jobs`` parameter of the constructor).
+
+        Returns:
+            ``True`` if the checks are parallelized, ``False`` otherwise.
+        """
+        return (
+            self.n_jobs > 1
+            and self.membership_query is None
+            and self.t.size >= self.PARALLEL_MIN_CELLS
+        )
+
+    def shutdown(self):
+        """
+        Releases the thread pool used to check whether this
+        :py:class:`LstarObservationTable` is closed and consistent (see
+        the ``n_jobs`` parameter of the constructor). It is created again
+        if needed.
+        """
+        if self.executor is not None:
+            self.executor.shutdown()
+            self.executor = None
+
+    def map_blocks(self, func: callable, n: int) -> list:
+        """
+        Splits ``range(n)`` in blocks and processes them in the thread pool
+        of this :py:class:`LstarObservationTable`, which is created on
+        the first call and reused until
+        :py:meth:`LstarObservationTable.shutdown` is called.
+
+        Args:
+            func (callable): A ``np.ndarray -> object`` function, called
+                on each block of indices.
+            n (int): The number of indices.
+
+        Returns:
+            The list of the results of ``func``, in the order of the blocks.
+        """
+        if self.executor is None:
+            self.executor = ThreadPoolExecutor(self.n_jobs)
+        blocks = np.array_split(np.arange(n), 4 * self.n_jobs)
+        return list(self.executor.map(func, blocks))
+
+    def find_row_ids(self, prefixes: list) -> np.ndarray:
+        """
+        Numbers the distinct rows of some prefixes. The rows are packed in
+        64-bit words and hashed by blocks, then the rows having the same
+        hash are compared to detect the collisions.
+
+        Args:
+            prefixes (list): The prefixes.
+
+        Returns:
+            An array which maps each prefix with an identifier of its row,
+            such that two prefixes have the same identifier iff they have
+            the same row (``-1`` if the prefix is not in this
+            :py:class:`LstarObservationTable`), or ``None`` in case of
+            hash collision.
+        """
+        rows = np.array(
+            [self.map_prefix.get(s, -1) for s in prefixes],
+            dtype=np.int64
+        )
+        valid = np.flatnonzero(rows >= 0)
+        n = self.t.shape[1]
+        num_words = max(1, (n + 63) // 64)
+
+        def pack(block: np.ndarray) -> tuple:
+            packed = np.zeros((len(block), 8 * num_words), dtype=np.uint8)
+            packed[:, :(n + 7) // 8] = np.packbits(
+                self.t[rows[valid[block]]], axis=1
+            )
+            words = packed.view(np.uint64)
+            h = words[:, 0].copy()
+            for k in range(1, num_words):
+                h *= np.uint64(0x100000001B3)
+                h ^= words[:, k]
+            return (words, h)
+
+        results = self.map_blocks(pack, len(valid))
+        words = np.concatenate([w for (w, _) in results])
+        hashes = np.concatenate([h for (_, h) in results])
+        (_, first, inverse) = np.unique(
+            hashes,
+            return_index=True,
+            return_inverse=True
+        )
+        inverse = inverse.ravel()
+
+        def is_collision_free(block: np.ndarray) -> bool:
+            return bool(
+                (words[block] == words[first[inverse[block]]]).all()
+            )
+
+        if not all(self.map_blocks(is_collision_free, len(valid))):
+            return None
+        ret = np.full(len(prefixes), -1, dtype=np.int64)
+        ret[valid] = inverse
+        return ret
+
+    def find_mismatch_closeness_parallel(self) -> tuple:
+        """
+        Parallel version of
+        :py:meth:`LstarObservationTable.find_mismatch_closeness`
+        (see :py:meth:`LstarObservationTable.is_parallel`). It returns the
+        same pair.
+
+        Returns:
+            A ``(s, a)`` pair (if found), ``None`` otherwise.
+        """
+        prefixes = list(self.s)
+        symbols = list(self.a)
+        m = len(prefixes)
+        if not m or not symbols:
+            return self.find_mismatch_closeness_serial()
+        ids = self.find_row_ids(
+            prefixes + [s + a for s in prefixes for a in symbols]
+        )
+        if ids is None:
+            return self.find_mismatch_closeness_serial()
+        s_ids = np.unique(ids[:m])
+        sa_ids = ids[m:]
+
+        def find_first(block: np.ndarray) -> int:
+            x = sa_ids[block]
+            i = np.minimum(np.searchsorted(s_ids, x), len(s_ids) - 1)
+            mismatches = np.flatnonzero(s_ids[i] != x)
+            return block[mismatches[0]] if mismatches.size else None
+
+        firsts = self.map_blocks(find_first, len(sa_ids))
+        for k in firsts:
+            if k is not None:
+                return (prefixes[k // len(symbols)], symbols[k % len(symbols)])
+        return None
+
+    def find_mismatch_consistency_parallel(self) -> tuple:
+        """
+        Parallel version of
+        :py:meth:`LstarObservationTable.find_mismatch_consistency`
+        (see :py:meth:`LstarObservationTable.is_parallel`). It returns the
+        same tuple.
+
+        The prefixes of ``S`` are grouped by row. The first pair of the
+        serial scan involves the first prefix of a class, and the first
+        prefix of this class whose successors have different rows.
+
+        Returns:
+            A ``(s1, s2, a, e)`` tuple (if found), ``None`` otherwise.
+        """
+        prefixes = list(self.s)
+        symbols = list(self.a)
+        m = len(prefixes)
+        if not m or not symbols:
+            return self.find_mismatch_consistency_serial()
+        ids = self.find_row_ids(
+            prefixes + [s + a for s in prefixes for a in symbols]
+        )
+        if ids is None:
+            return self.find_mismatch_consistency_serial()
+        successors = ids[m:].reshape(m, len(symbols))
+        (_, first, inverse) = np.unique(
+            ids[:m],
+            return_index=True,
+            return_inverse=True
+        )
+        # leaders[i] is the first prefix having the same row as prefixes[i]
+        leaders = first[inverse.ravel()]
+
+        def find_different(block: np.ndarray) -> np.ndarray:
+            return block[
+                (successors[block] != successors[leaders[block]]).any(axis=1)
+            ]
+
+        different = np.concatenate(self.map_blocks(find_different, m))
+        if not different.size:
+            return None
+        i1 = leaders[different].min()
+        i2 = different[leaders[different] == i1].min()
+        (s1, s2) = (prefixes[i1], prefixes[i2])
+        j = np.flatnonzero(successors[i1] != successors[i2])[0]
+        a = symbols[j]
+        for e in self.e:
+            if self.get(s1 + a, e) != self.get(s2 + a, e):
+                return (s1, s2, a, e)
+        return None
+
     # (s1, a) = self.o.find_mismatch_closeness()
     def find_mismatch_closeness(self) -> tuple:
         """
@@ -282,7 +794,31 @@ class LstarObservationTable:
             - ``a`` is a symbol of the alphabet of this
               :py:class:`LstarObservationTable` (i.e., ``self.a``)
         """
+        if self.membership_query is not None:
+            representatives = list(self.classes().keys())
+            for s in sorted(self.s, key=lambda s: (len(s), s)):
+                for a in self.a:
+                    if s + a in self.s:
+                        continue
+                    if self.find_equivalent_prefix(
+                        s + a, representatives
+                    ) is None:
+                        return (s, a)
+            return None
         assert self.probed.all(), self.probed
+        if self.is_parallel():
+            return self.find_mismatch_closeness_parallel()
+        return self.find_mismatch_closeness_serial()
+
+    def find_mismatch_closeness_serial(self) -> tuple:
+        """
+        Serial version of
+        :py:meth:`LstarObservationTable.find_mismatch_closeness`, for
+        non-lazy tables.
+
+        Returns:
+            A ``(s, a)`` pair (if found), ``None`` otherwise.
+        """
         rows = {self.row(s) for s in self.s}
         for s in self.s:
             for a in self.a:
@@ -326,7 +862,28 @@ class LstarObservationTable:
               (i.e., ``self.a``)
             - ``e`` is a contradicting suffix w.r.t. ``s1`` and ``s2``.
         """
+        if self.membership_query is not None:
+            for (s1, others) in self.classes().items():
+                for s2 in others:
+                    for a in self.a:
+                        e = self.find_distinguishing_suffix(s1 + a, s2 + a)
+                        if e is not None:
+                            return (s1, s2, a, e)
+            return None
         assert self.probed.all(), self.probed
+        if self.is_parallel():
+            return self.find_mismatch_consistency_parallel()
+        return self.find_mismatch_consistency_serial()
+
+    def find_mismatch_consistency_serial(self) -> tuple:
+        """
+        Serial version of
+        :py:meth:`LstarObservationTable.find_mismatch_consistency`, for
+        non-lazy tables.
+
+        Returns:
+            A ``(s1, s2, a, e)`` tuple (if found), ``None`` otherwise.
+        """
         for (i1, s1) in enumerate(self.s):
             for (i2, s2) in enumerate(self.s):
                 if i2 <= i1:
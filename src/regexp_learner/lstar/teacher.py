@@ -1,8 +1,20 @@
 #!/usr/bin/env python3
 # -*- coding: utf-8 -*-
 
+import random
+import re
 from pybgl import Automaton
-from .automaton_match import automaton_match
+from ..dfa import DFA
+from ..regexp import (
+    compile_regexp,
+    make_test_words,
+)
+from ..serialization import automaton_to_dict
+from .automaton_match import (
+    find_counterexamples,
+    find_dense_counterexamples,
+    make_dense_automaton,
+)
 
 
 class Teacher:
@@ -22,6 +34,14 @@ class Teacher:
         assert g.is_finite()
         # assert is_minimal(g)  # Not implemented
         self.g = g
+        self.dfa = DFA.from_automaton(g)
+        # The DFA used to answer the queries (cheaper to traverse than g)
+        self.dense = make_dense_automaton(self.dfa, self.dfa.symbols)
+        # The transition matrix used to answer the conjectures
+        self.num_membership_queries = 0
+        # Number of membership queries handled so far
+        self.num_conjectures = 0
+        # Number of conjectures (equivalence queries) handled so far
 
     @property
     def alphabet(self) -> set:
@@ -43,13 +63,54 @@ class Teacher:
 
         Args:
             h (Automaton): The tested :py:class:`pybgl.Automaton`
-                (typically, submitted by the :py:class:`Learner`).
+                or :py:class:`DFA` (typically, submitted by the
+                :py:class:`Learner`).
 
         Returns:
-            ``True`` if ``h`` matches the ``Automaton`` of this
-            :py:class:`Teacher` instance, ``False`` otherwise.
+            ``None`` if ``h`` matches the ``Automaton`` of this
+            :py:class:`Teacher` instance, otherwise a shortest
+            counterexample (see :py:meth:`Teacher.counterexamples`).
+        """
+        ret = self.counterexamples(h, 1)
+        return ret[0] if ret else None
+
+    def counterexamples(self, h: Automaton, k: int = 1) -> list:
+        """
+        Handles a conjecture query, and returns several counterexamples
+        found in a single traversal (see :py:func:`find_counterexamples`).
+        It counts as one conjecture.
+
+        Args:
+            h (Automaton): The tested :py:class:`pybgl.Automaton`
+                or :py:class:`DFA` (typically, submitted by the
+                :py:class:`Learner`).
+            k (int): The maximal number of counterexamples.
+
+        Returns:
+            The list of (at most ``k``) shortest counterexamples, which is
+            empty iff ``h`` matches the ``Automaton`` of this
+            :py:class:`Teacher` instance.
         """
-        return automaton_match(self.g, h)
+        self.num_conjectures += 1
+        symbols = self.dfa.symbols
+        if not h.alphabet() <= set(symbols):
+            return find_counterexamples(self.dfa, h, k)
+        return find_dense_counterexamples(
+            self.dense,
+            make_dense_automaton(h, symbols),
+            symbols,
+            k
+        )
+
+    def fingerprint(self) -> dict:
+        """
+        Describes the language of this :py:class:`Teacher` (see the
+        ``cache`` parameter of :py:meth:`Learner.learn`).
+
+        Returns:
+            A JSON-serializable object identifying the language.
+        """
+        return automaton_to_dict(self.g)
 
     def membership_query(self, w: str) -> bool:
         """
@@ -66,4 +127,256 @@ class Teacher:
             ``True`` if ``w`` is matched by the ``Automaton`` of this
             :py:class:`Teacher` instance, ``False`` otherwise.
         """
-        return self.g.accepts(w)
+        self.num_membership_queries += 1
+        return self.dfa.accepts(w)
+
+
+class PredicateTeacher:
+    """
+    The :py:class:`PredicateTeacher` class is a teacher (see
+    :py:class:`Teacher`) whose language is defined by an arbitrary
+    ``str -> bool`` function, e.g., a legacy validation function.
+
+    As the language is not given by an automaton, the conjectures are
+    checked on a finite set of test words: the access words of the
+    hypothesis followed by all the short suffixes (see
+    :py:func:`make_test_words`), and words drawn at random. Hence, a
+    conjecture may be accepted while the languages differ on longer words.
+
+    Example:
+        >>> from regexp_learner import Learner, PredicateTeacher
+        >>> teacher = PredicateTeacher(
+        ...     lambda w: w.count("a") % 2 == 0, alphabet="ab"
+        ... )
+        >>> h = Learner(teacher, verbose=False).learn()
+        >>> h.num_vertices(), h.accepts("abba"), h.accepts("ab")
+        (2, True, False)
+    """
+    def __init__(
+        self,
+        predicate: callable,
+        alphabet: str,
+        max_words: int = 10000,
+        num_samples: int = 1000,
+        max_length: int = 20,
+        seed: int = 0
+    ):
+        """
+        Constructor.
+
+        Args:
+            predicate (callable): A ``str -> bool`` function, returning
+                ``True`` iff a word belongs to the language to infer.
+            alphabet (str): The symbols of the alphabet.
+            max_words (int): The maximal number of exhaustively
+                enumerated test words for each conjecture.
+            num_samples (int): The number of random test words for each
+                conjecture.
+            max_length (int): The maximal length of the random test words.
+            seed (int): The seed of the random test words.
+        """
+        self.predicate = predicate
+        self.symbols = sorted(set(alphabet))
+        self.max_words = max_words
+        self.num_samples = num_samples
+        self.max_length = max_length
+        self.seed = seed
+        self.rng = random.Random(seed)
+        self.answers = dict()
+        # {str: bool} caches the answers of the predicate
+        self.num_membership_queries = 0
+        # Number of membership queries handled so far
+        self.num_conjectures = 0
+        # Number of conjectures (equivalence queries) handled so far
+
+    @property
+    def alphabet(self) -> set:
+        """
+        Accessor the alphabet of this :py:class:`PredicateTeacher`.
+
+        Returns:
+            The set of symbols.
+        """
+        return set(self.symbols)
+
+    def evaluate(self, w: str) -> bool:
+        """
+        Evaluates the predicate on a word, once per word.
+
+        Args:
+            w (str): A word.
+
+        Returns:
+            ``True`` if ``w`` belongs to the language, ``False`` otherwise.
+        """
+        ret = self.answers.get(w)
+        if ret is None:
+            ret = bool(self.predicate(w))
+            self.answers[w] = ret
+        return ret
+
+    def membership_query(self, w: str) -> bool:
+        """
+        Handles a membership query.
+
+        Args:
+            w (str): The tested word.
+
+        Returns:
+            ``True`` if ``w`` belongs to the language, ``False`` otherwise.
+        """
+        self.num_membership_queries += 1
+        return self.evaluate(w)
+
+    def evaluate_many(self, words: list) -> list:
+        """
+        Evaluates the predicate on several words, once per word. The
+        predicate is applied to the distinct words not evaluated yet by
+        a single ``map`` (hence, without the per-word overhead of
+        :py:meth:`PredicateTeacher.evaluate`).
+
+        Args:
+            words (list): The words.
+
+        Returns:
+            The list of the results (see
+            :py:meth:`PredicateTeacher.evaluate`).
+        """
+        answers = self.answers
+        unknown = [w for w in dict.fromkeys(words) if w not in answers]
+        answers.update(zip(unknown, map(bool, map(self.predicate, unknown))))
+        return [answers[w] for w in words]
+
+    def membership_queries(self, words: iter) -> list:
+        """
+        Handles several membership queries at once (see
+        :py:meth:`PredicateTeacher.evaluate_many`). The
+        :py:class:`Learner` submits the cells it fills by batches
+        through this method. Each word counts as one membership query.
+
+        Args:
+            words (iter): The tested words.
+
+        Returns:
+            The list of the answers (see
+            :py:meth:`PredicateTeacher.membership_query`).
+        """
+        words = list(words)
+        self.num_membership_queries += len(words)
+        return self.evaluate_many(words)
+
+    def test_words(self, h: Automaton) -> iter:
+        """
+        Enumerates the test words used to check a conjecture.
+
+        Args:
+            h (Automaton): The tested hypothesis.
+
+        Returns:
+            An iterator over the test words.
+        """
+        yield from make_test_words(h, self.max_words)
+        for _ in range(self.num_samples):
+            n = self.rng.randint(0, self.max_length)
+            yield "".join(self.rng.choices(self.symbols, k=n))
+
+    def counterexamples(self, h: Automaton, k: int = 1) -> list:
+        """
+        Handles a conjecture query, and returns several counterexamples.
+        It counts as one conjecture.
+
+        Args:
+            h (Automaton): The tested :py:class:`pybgl.Automaton`
+                or :py:class:`DFA`.
+            k (int): The maximal number of counterexamples.
+
+        Returns:
+            The list of (at most ``k``) shortest counterexamples found
+            among the test words, which is empty if ``h`` agrees with the
+            predicate on all of them.
+        """
+        self.num_conjectures += 1
+        words = list(self.test_words(h))
+        found = {
+            w
+            for (w, accepted) in zip(words, self.evaluate_many(words))
+            if accepted != h.accepts(w)
+        }
+        return sorted(found, key=lambda w: (len(w), w))[:k]
+
+    def conjecture(self, h: Automaton) -> str:
+        """
+        Handles a conjecture query.
+
+        Args:
+            h (Automaton): The tested :py:class:`pybgl.Automaton`
+                or :py:class:`DFA`.
+
+        Returns:
+            ``None`` if ``h`` agrees with the predicate on the test
+            words, otherwise a shortest counterexample.
+        """
+        ret = self.counterexamples(h, 1)
+        return ret[0] if ret else None
+
+    def fingerprint(self) -> dict:
+        """
+        Describes the language of this :py:class:`PredicateTeacher` (see
+        the ``cache`` parameter of :py:meth:`Learner.learn`).
+
+        Returns:
+            ``None``, as an arbitrary predicate cannot be identified.
+        """
+        return None
+
+
+class RegexpTeacher(PredicateTeacher):
+    """
+    The :py:class:`RegexpTeacher` class is a :py:class:`PredicateTeacher`
+    whose language is defined by a Python regular expression, with the
+    full-match semantics.
+
+    Example:
+        >>> from regexp_learner import Learner, RegexpTeacher
+        >>> teacher = RegexpTeacher(r"(ab|c)*", alphabet="abc")
+        >>> h = Learner(teacher, verbose=False).learn()
+        >>> h.accepts("abcab"), h.accepts("abb")
+        (True, False)
+    """
+    def __init__(self, pattern: str, alphabet: str, **kwargs):
+        """
+        Constructor.
+
+        Args:
+            pattern (str): The regular expression (or the corresponding
+                ``re.Pattern`` instance).
+            alphabet (str): The symbols of the alphabet.
+            kwargs: The other parameters of
+                :py:class:`PredicateTeacher`.
+        """
+        self.regexp = (
+            pattern if isinstance(pattern, re.Pattern)
+            else compile_regexp(pattern)
+        )
+        super().__init__(self.regexp.fullmatch, alphabet, **kwargs)
+
+    def fingerprint(self) -> dict:
+        """
+        Describes the language of this :py:class:`RegexpTeacher` (see
+        the ``cache`` parameter of :py:meth:`Learner.learn`). As the
+        conjectures are checked on test words, the learned automaton also
+        depends on the parameters generating them.
+
+        Returns:
+            A JSON-serializable object identifying the language and the
+            equivalence check.
+        """
+        return {
+            "pattern": self.regexp.pattern,
+            "flags": self.regexp.flags,
+            "alphabet": self.symbols,
+            "max_words": self.max_words,
+            "num_samples": self.num_samples,
+            "max_length": self.max_length,
+            "seed": self.seed,
+        }
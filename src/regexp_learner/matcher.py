@@ -0,0 +1,306 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+#
+# This file is part of the regexp-learner project
+# https://github.com/nokia/regexp-learner
+
+import mmap
+import numpy as np
+import struct
+
+# Binary format (little endian):
+# - MAGIC (8 bytes);
+# - HEADER: num_states, num_symbols, initial, size of the symbol table;
+# - the symbol table: for each symbol, its size (uint32) followed by the
+#   symbol, UTF-8 encoded (hence, a symbol may contain "\0"), padded
+#   with "\0" to a multiple of 4 bytes;
+# - the transition table: num_states x num_symbols int32 (-1 if undefined);
+# - the final state bitmap: ceil(num_states / 8) bytes (little bit order).
+MAGIC = b"RLDFA\x00\x02\x00"
+HEADER = struct.Struct("<IIiI")
+SYMBOL_SIZE = struct.Struct("<I")
+
+
+class CompiledMatcher:
+    """
+    The :py:class:`CompiledMatcher` class is a compact, read-only
+    representation of a deterministic automaton (typically, returned by
+    :py:func:`gold` or :py:meth:`Learner.learn`), which does not depend on
+    :py:mod:`pybgl`. It can be saved in a binary file and memory-mapped
+    (see :py:func:`export_matcher` and :py:func:`load_matcher`).
+
+    Example:
+        >>> from pybgl import make_automaton, make_func_property_map
+        >>> from regexp_learner import CompiledMatcher
+        >>> g = make_automaton(
+        ...     [(0, 1, "a"), (1, 0, "b")], 0,
+        ...     make_func_property_map(lambda q: q == 0)
+        ... )
+        >>> m = CompiledMatcher.from_automaton(g)
+        >>> m.match("abab"), m.match("aba")
+        (True, False)
+        >>> m.match_many(["", "ab", "ba", "abc"]).tolist()
+        [True, True, False, False]
+    """
+    def __init__(
+        self,
+        symbols: list,
+        delta: np.ndarray,
+        finals: np.ndarray,
+        initial: int,
+        buffer: object = None
+    ):
+        """
+        Constructor.
+
+        Args:
+            symbols (list): The symbols of the alphabet. The ``j``-th
+                symbol corresponds to the ``j``-th column of ``delta``.
+            delta (np.ndarray): The ``num_states x num_symbols`` transition
+                table, where ``-1`` stands for an undefined transition.
+            finals (np.ndarray): The final state bitmap, as returned by
+                ``numpy.packbits(..., bitorder="little")``.
+            initial (int): The initial state, or ``-1`` if the automaton
+                has no state.
+            buffer (object): The buffer (if any) backing ``delta`` and
+                ``finals``, kept alive along with this matcher.
+        """
+        self.symbols = list(symbols)
+        self.symbol_index = {a: j for (j, a) in enumerate(self.symbols)}
+        self.delta = delta
+        self.finals = finals
+        self.initial = initial
+        self.buffer = buffer
+
+    @property
+    def num_states(self) -> int:
+        """
+        Retrieves the number of states of this :py:class:`CompiledMatcher`.
+
+        Returns:
+            The number of states.
+        """
+        return self.delta.shape[0]
+
+    def is_final(self, q: int) -> bool:
+        """
+        Tests whether a state is final.
+
+        Args:
+            q (int): A state.
+
+        Returns:
+            ``True`` if ``q`` is final, ``False`` otherwise.
+        """
+        return bool((self.finals.item(q >> 3) >> (q & 7)) & 1)
+
+    @staticmethod
+    def from_automaton(g) -> "CompiledMatcher":
+        """
+        Builds a :py:class:`CompiledMatcher` from a deterministic automaton.
+
+        Args:
+            g (Automaton): A :py:class:`pybgl.Automaton` instance.
+
+        Returns:
+            The corresponding :py:class:`CompiledMatcher` instance.
+        """
+        states = sorted(g.vertices())
+        map_state_index = {q: i for (i, q) in enumerate(states)}
+        symbols = sorted(g.alphabet())
+        symbol_index = {a: j for (j, a) in enumerate(symbols)}
+        delta = np.full((len(states), len(symbols)), -1, dtype=np.int32)
+        for e in g.edges():
+            delta[
+                map_state_index[g.source(e)],
+                symbol_index[g.label(e)]
+            ] = map_state_index[g.target(e)]
+        finals = np.packbits(
+            np.fromiter(
+                (g.is_final(q) for q in states),
+                dtype=np.bool_, count=len(states)
+            ),
+            bitorder="little"
+        )
+        initial = map_state_index[g.initial()] if states else -1
+        return CompiledMatcher(symbols, delta, finals, initial)
+
+    def match(self, w: str) -> bool:
+        """
+        Tests whether this :py:class:`CompiledMatcher` accepts a word.
+
+        Args:
+            w (str): The word.
+
+        Returns:
+            ``True`` if ``w`` is accepted, ``False`` otherwise.
+        """
+        q = self.initial
+        if q < 0:
+            return False
+        symbol_index = self.symbol_index
+        item = self.delta.item
+        for a in w:
+            j = symbol_index.get(a)
+            if j is None:
+                return False
+            q = item(q, j)
+            if q < 0:
+                return False
+        return self.is_final(q)
+
+    def match_many(self, words: iter) -> np.ndarray:
+        """
+        Tests whether this :py:class:`CompiledMatcher` accepts some words.
+        If all the symbols are characters (and the alphabet is not empty),
+        the words are processed in lockstep using ``numpy`` operations.
+
+        Args:
+            words (iter): The words.
+
+        Returns:
+            A ``numpy`` array of booleans, whose ``i``-th value indicates
+            whether the ``i``-th word is accepted.
+        """
+        words = list(words)
+        n = len(words)
+        if (
+            self.initial < 0
+            or not self.symbols
+            or any(len(a) != 1 for a in self.symbols)
+        ):
+            return np.fromiter(map(self.match, words), dtype=np.bool_, count=n)
+
+        # Encode the words as column indexes (-1 for unknown symbols).
+        lengths = np.fromiter(map(len, words), dtype=np.int64, count=n)
+        codes = np.frombuffer(
+            "".join(words).encode("utf-32-le"),
+            dtype=np.uint32
+        )
+        symbol_codes = np.array([ord(a) for a in self.symbols], np.uint32)
+        order = np.argsort(symbol_codes)
+        sorted_codes = symbol_codes[order]
+        k = np.searchsorted(sorted_codes, codes)
+        k = np.minimum(k, len(sorted_codes) - 1)
+        cols = np.where(sorted_codes[k] == codes, order[k], -1)
+        offsets = np.cumsum(lengths) - lengths
+
+        q = np.full(n, self.initial, dtype=np.int64)
+        for i in range(int(lengths.max()) if n else 0):
+            active = np.flatnonzero((lengths > i) & (q >= 0))
+            if not active.size:
+                break
+            j = cols[offsets[active] + i]
+            q[active] = np.where(
+                j >= 0,
+                self.delta[q[active], np.maximum(j, 0)],
+                -1
+            )
+        qs = np.maximum(q, 0)
+        is_final = (self.finals[qs >> 3] >> (qs & 7)) & 1
+        return (q >= 0) & (is_final == 1)
+
+    def to_bytes(self) -> bytes:
+        """
+        Serializes this :py:class:`CompiledMatcher`.
+
+        Returns:
+            The corresponding ``bytes``.
+        """
+        symbols = b"".join(
+            SYMBOL_SIZE.pack(len(data)) + data
+            for data in (a.encode("utf-8") for a in self.symbols)
+        )
+        symbols += b"\0" * (-len(symbols) % 4)
+        return b"".join([
+            MAGIC,
+            HEADER.pack(
+                self.delta.shape[0],
+                self.delta.shape[1],
+                self.initial,
+                len(symbols)
+            ),
+            symbols,
+            np.ascontiguousarray(self.delta, dtype="<i4").tobytes(),
+            self.finals.tobytes(),
+        ])
+
+    @staticmethod
+    def from_buffer(buffer: object) -> "CompiledMatcher":
+        """
+        Deserializes a :py:class:`CompiledMatcher`. The transition table
+        and the final state bitmap are not copied.
+
+        Args:
+            buffer (object): A ``bytes``-like object (e.g., returned by
+                :py:meth:`CompiledMatcher.to_bytes`, or a memory map).
+
+        Returns:
+            The corresponding :py:class:`CompiledMatcher` instance.
+        """
+        if buffer[:len(MAGIC)] != MAGIC:
+            raise ValueError("Invalid compiled matcher")
+        offset = len(MAGIC)
+        (num_states, num_symbols, initial, symbols_size) = HEADER.unpack_from(
+            buffer, offset
+        )
+        offset += HEADER.size
+        symbols = list()
+        end = offset + symbols_size
+        for _ in range(num_symbols):
+            (size,) = SYMBOL_SIZE.unpack_from(buffer, offset)
+            offset += SYMBOL_SIZE.size
+            if offset + size > end:
+                raise ValueError("Invalid compiled matcher")
+            symbols.append(bytes(buffer[offset:offset + size]).decode("utf-8"))
+            offset += size
+        offset = end
+        delta = np.frombuffer(
+            buffer, dtype="<i4",
+            count=num_states * num_symbols, offset=offset
+        ).reshape((num_states, num_symbols))
+        offset += delta.nbytes
+        finals = np.frombuffer(
+            buffer, dtype=np.uint8,
+            count=(num_states + 7) // 8, offset=offset
+        )
+        return CompiledMatcher(symbols, delta, finals, initial, buffer)
+
+
+def export_matcher(g, filename: str) -> CompiledMatcher:
+    """
+    Compiles an automaton and saves it in a binary file, that can be
+    loaded using :py:func:`load_matcher`.
+
+    Args:
+        g (Automaton): A :py:class:`pybgl.Automaton` instance (e.g.,
+            returned by :py:func:`gold` or :py:meth:`Learner.learn`),
+            or a :py:class:`CompiledMatcher` instance.
+        filename (str): The path of the output file.
+
+    Returns:
+        The corresponding :py:class:`CompiledMatcher` instance.
+    """
+    m = g if isinstance(g, CompiledMatcher) else (
+        CompiledMatcher.from_automaton(g)
+    )
+    with open(filename, "wb") as f:
+        f.write(m.to_bytes())
+    return m
+
+
+def load_matcher(filename: str) -> CompiledMatcher:
+    """
+    Loads a :py:class:`CompiledMatcher` saved by :py:func:`export_matcher`.
+    The file is memory-mapped, hence loading does not depend on the size
+    of the automaton.
+
+    Args:
+        filename (str): The path of the input file.
+
+    Returns:
+        The corresponding :py:class:`CompiledMatcher` instance.
+    """
+    with open(filename, "rb") as f:
+        buffer = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+    return CompiledMatcher.from_buffer(buffer)
@@ -0,0 +1,250 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+#
+# This file is part of the regexp-learner project
+# https://github.com/nokia/regexp-learner
+
+from collections import deque
+from pybgl import Automaton
+
+
+class RefinablePartition:
+    """
+    The :py:class:`RefinablePartition` class stores a partition of
+    ``{0, ..., n - 1}`` in arrays, so that the elements of a block can be
+    marked and the block split in time proportional to the number of
+    marked elements (see *Fast brief practical DFA minimization*,
+    A. Valmari, 2012).
+    """
+    def __init__(self, n: int):
+        """
+        Constructor. The partition initially contains a single block
+        (or none if ``n == 0``).
+
+        Args:
+            n (int): The number of elements.
+        """
+        self.elements = list(range(n))
+        # The elements, grouped by block
+        self.location = list(range(n))
+        # The index of each element in self.elements
+        self.block = [0] * n
+        # The block of each element
+        self.first = [0] if n else list()
+        # The index in self.elements of the first element of each block
+        self.end = [n] if n else list()
+        # The index in self.elements following the last element of each block
+        self.num_marked = [0] if n else list()
+        # The number of marked elements of each block (stored first)
+
+    def num_blocks(self) -> int:
+        """
+        Retrieves the number of blocks of this :py:class:`RefinablePartition`.
+
+        Returns:
+            The number of blocks.
+        """
+        return len(self.first)
+
+    def size(self, b: int) -> int:
+        """
+        Retrieves the size of a block.
+
+        Args:
+            b (int): A block.
+
+        Returns:
+            The number of elements of ``b``.
+        """
+        return self.end[b] - self.first[b]
+
+    def members(self, b: int) -> list:
+        """
+        Retrieves the elements of a block.
+
+        Args:
+            b (int): A block.
+
+        Returns:
+            The elements of ``b``.
+        """
+        return self.elements[self.first[b]:self.end[b]]
+
+    def mark(self, x: int) -> bool:
+        """
+        Marks an element.
+
+        Args:
+            x (int): An element.
+
+        Returns:
+            ``True`` if ``x`` is the first element marked in its block,
+            ``False`` otherwise.
+        """
+        b = self.block[x]
+        i = self.location[x]
+        j = self.first[b] + self.num_marked[b]
+        if i < j:
+            return False  # Already marked
+        y = self.elements[j]
+        self.elements[i] = y
+        self.location[y] = i
+        self.elements[j] = x
+        self.location[x] = j
+        self.num_marked[b] += 1
+        return self.num_marked[b] == 1
+
+    def split(self, b: int) -> int:
+        """
+        Moves the marked elements of a block to a new block, and
+        unmarks them.
+
+        Args:
+            b (int): A block.
+
+        Returns:
+            The new block, or ``None`` if none or all the elements of ``b``
+            are marked (in this case, ``b`` is left unchanged).
+        """
+        m = self.num_marked[b]
+        self.num_marked[b] = 0
+        if m == 0 or m == self.size(b):
+            return None
+        c = len(self.first)
+        self.first.append(self.first[b])
+        self.end.append(self.first[b] + m)
+        self.num_marked.append(0)
+        self.first[b] += m
+        for i in range(self.first[c], self.end[c]):
+            self.block[self.elements[i]] = c
+        return c
+
+
+def minimize_automaton(g: Automaton, complete: bool = False) -> Automaton:
+    """
+    Minimizes a deterministic automaton using the Hopcroft algorithm,
+    which runs in ``O(|Σ| n log n)``.
+
+    Missing transitions lead to an implicit sink state. The states that
+    cannot be reached from the initial state are ignored. The states of
+    the output automaton are numbered according to the order in which they
+    are discovered by a breadth-first search following the symbols in
+    the lexicographic order (hence, the initial state is ``0``).
+
+    Example:
+        >>> from pybgl import compile_dfa
+        >>> from regexp_learner import minimize_automaton
+        >>> g = compile_dfa("ab|b(b|c)", complete=True)
+        >>> g.num_vertices(), minimize_automaton(g).num_vertices()
+        (7, 4)
+
+    Args:
+        g (Automaton): A deterministic :py:class:`pybgl.Automaton` instance.
+        complete (bool): Pass ``True`` to return a complete automaton
+            (with a sink state, if needed). Otherwise, the states that
+            cannot reach a final state are removed.
+
+    Returns:
+        The minimal :py:class:`pybgl.Automaton` recognizing the same
+        language as ``g``.
+    """
+    sigma = sorted(g.alphabet())
+
+    # Collect the accessible states. The implicit sink state is the last one.
+    states = list()
+    if g.num_vertices():
+        q0 = g.initial()
+        map_state_index = {q0: 0}
+        states.append(q0)
+        queue = deque([q0])
+        while queue:
+            q = queue.popleft()
+            for a in sigma:
+                r = g.delta(q, a)
+                if r is not None and r not in map_state_index:
+                    map_state_index[r] = len(states)
+                    states.append(r)
+                    queue.append(r)
+    sink = len(states)
+    n = sink + 1
+    delta = [[sink] * n for _ in sigma]
+    predecessors = [[list() for _ in range(n)] for _ in sigma]
+    for (j, a) in enumerate(sigma):
+        delta_a = delta[j]
+        predecessors_a = predecessors[j]
+        for (i, q) in enumerate(states):
+            r = g.delta(q, a)
+            k = sink if r is None else map_state_index[r]
+            delta_a[i] = k
+            predecessors_a[k].append(i)
+        predecessors_a[sink].append(sink)
+
+    # Initial partition: final states versus non-final states.
+    partition = RefinablePartition(n)
+    finals = [i for (i, q) in enumerate(states) if g.is_final(q)]
+    for i in finals:
+        partition.mark(i)
+    c = partition.split(0)
+    pending = deque()
+    in_pending = set()
+    if c is not None:
+        b = c if partition.size(c) <= partition.size(0) else 0
+        for j in range(len(sigma)):
+            pending.append((b, j))
+            in_pending.add((b, j))
+
+    # Refine the partition.
+    while pending:
+        splitter = pending.popleft()
+        in_pending.discard(splitter)
+        (b, j) = splitter
+        predecessors_a = predecessors[j]
+        touched = list()
+        for r in partition.members(b):
+            for q in predecessors_a[r]:
+                if partition.mark(q):
+                    touched.append(partition.block[q])
+        for b in touched:
+            c = partition.split(b)
+            if c is None:
+                continue
+            smaller = c if partition.size(c) <= partition.size(b) else b
+            for k in range(len(sigma)):
+                if (b, k) in in_pending:
+                    pending.append((c, k))
+                    in_pending.add((c, k))
+                else:
+                    pending.append((smaller, k))
+                    in_pending.add((smaller, k))
+
+    # Build the quotient automaton. The block of the sink state is kept
+    # only if a complete automaton is required.
+    sink_block = partition.block[sink]
+    map_block_state = dict()
+    order = list()
+    queue = deque([partition.block[0]])
+    map_block_state[partition.block[0]] = 0
+    transitions = list()
+    while queue:
+        b = queue.popleft()
+        order.append(b)
+        if b == sink_block and not complete:
+            continue
+        i = partition.elements[partition.first[b]]
+        for (j, a) in enumerate(sigma):
+            c = partition.block[delta[j][i]]
+            if c == sink_block and not complete:
+                continue
+            if c not in map_block_state:
+                map_block_state[c] = len(map_block_state)
+                queue.append(c)
+            transitions.append((map_block_state[b], map_block_state[c], a))
+
+    h = Automaton(len(map_block_state))
+    for (q, r, a) in transitions:
+        h.add_edge(q, r, a)
+    for b in order:
+        i = partition.elements[partition.first[b]]
+        if i != sink and g.is_final(states[i]):
+            h.set_final(map_block_state[b])
+    return h
@@ -0,0 +1,131 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+#
+# This file is part of the regexp-learner project
+# https://github.com/nokia/regexp-learner
+
+import sys
+
+
+class PrefixTree:
+    """
+    The :py:class:`PrefixTree` class implements a lightweight
+    `trie <https://en.wikipedia.org/wiki/Trie>`__ whose nodes may be
+    labeled. Nodes are identified by consecutive integers, the root
+    being ``0``.
+
+    Contrary to :py:class:`pybgl.Trie`, it does not rely on a graph
+    structure and is thus cheaper to build and to traverse.
+    """
+    def __init__(self):
+        """
+        Constructor.
+        """
+        self.children = [dict()]
+        # {str: int} for each node, maps each symbol with the child node
+        self.labels = [None]
+        # The label of each node (None if unlabeled)
+
+    def num_nodes(self) -> int:
+        """
+        Retrieves the number of nodes of this :py:class:`PrefixTree`.
+
+        Returns:
+            The number of nodes.
+        """
+        return len(self.labels)
+
+    def child(self, u: int, a: str) -> int:
+        """
+        Retrieves the ``a``-child of a node.
+
+        Args:
+            u (int): A node of this :py:class:`PrefixTree`.
+            a (str): A symbol.
+
+        Returns:
+            The ``a``-child of ``u`` if any, ``None`` otherwise.
+        """
+        return self.children[u].get(a)
+
+    def add_child(self, u: int, a: str) -> int:
+        """
+        Retrieves the ``a``-child of a node, and creates it if needed.
+
+        Args:
+            u (int): A node of this :py:class:`PrefixTree`.
+            a (str): A symbol.
+
+        Returns:
+            The ``a``-child of ``u``.
+        """
+        v = self.children[u].get(a)
+        if v is None:
+            v = len(self.labels)
+            self.children[u][a] = v
+            self.children.append(dict())
+            self.labels.append(None)
+        return v
+
+    def insert(self, w: str, label: object = None, u: int = 0) -> int:
+        """
+        Inserts a word in this :py:class:`PrefixTree`.
+
+        Args:
+            w (str): The inserted word.
+            label (object): The label assigned to the node reached by ``w``
+                (if not ``None``).
+            u (int): The node from which ``w`` is inserted.
+
+        Returns:
+            The node reached by ``w``.
+        """
+        for a in w:
+            u = self.add_child(u, a)
+        if label is not None:
+            self.labels[u] = label
+        return u
+
+    def find(self, w: str, u: int = 0) -> int:
+        """
+        Searches the node reached by a word.
+
+        Args:
+            w (str): The searched word.
+            u (int): The node from which ``w`` is read.
+
+        Returns:
+            The node reached by ``w`` if any, ``None`` otherwise.
+        """
+        for a in w:
+            u = self.children[u].get(a)
+            if u is None:
+                return None
+        return u
+
+    def label(self, u: int) -> object:
+        """
+        Retrieves the label of a node.
+
+        Args:
+            u (int): A node of this :py:class:`PrefixTree`.
+
+        Returns:
+            The label of ``u`` (``None`` if ``u`` is unlabeled).
+        """
+        return self.labels[u]
+
+    def memory_usage(self) -> int:
+        """
+        Estimates the memory used by this :py:class:`PrefixTree` (the
+        symbols and the labels, which are generally shared with other
+        objects, are not counted).
+
+        Returns:
+            The estimated size, in bytes.
+        """
+        return (
+            sys.getsizeof(self.children)
+            + sum(map(sys.getsizeof, self.children))
+            + sys.getsizeof(self.labels)
+        )
@@ -0,0 +1,592 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+#
+# This file is part of the regexp-learner project
+# https://github.com/nokia/regexp-learner
+
+import re
+from collections import deque
+from functools import lru_cache
+from itertools import product
+
+# Precedence of the regular expressions built by RegexpBuilder.
+# An operand is wrapped in a group if its precedence is too low.
+PREC_UNION = 0
+PREC_CONCAT = 1
+PREC_POSTFIX = 2
+PREC_ATOM = 3
+
+# A pattern that matches nothing (used for the empty language).
+EMPTY_PATTERN = "(?!)"
+
+
+class RegexpBuilder:
+    """
+    The :py:class:`RegexpBuilder` class builds regular expressions
+    (in the Python :py:mod:`re` syntax) while applying some algebraic
+    simplifications.
+
+    The sub-expressions are hash-consed: each distinct sub-expression is
+    stored once and identified by an integer, so that building, comparing
+    or reusing a sub-expression never requires to re-render it.
+    """
+    def __init__(self):
+        """
+        Constructor.
+        """
+        self.nodes = list()
+        # The (kind, children) pair of each sub-expression
+        self.patterns = list()
+        # The pattern of each sub-expression
+        self.precedences = list()
+        # The precedence of each sub-expression
+        self.map_node_id = dict()
+        # Maps each (kind, children) pair with its identifier
+        self.epsilon = self.make_node("eps", (), "", PREC_ATOM)
+
+    def make_node(
+        self,
+        kind: str,
+        children: tuple,
+        pattern: str,
+        precedence: int
+    ) -> int:
+        """
+        Retrieves (or creates) the identifier of a sub-expression.
+
+        Args:
+            kind (str): The kind of the sub-expression.
+            children (tuple): The children of the sub-expression.
+            pattern (str): The pattern of the sub-expression.
+            precedence (int): The precedence of the sub-expression.
+
+        Returns:
+            The identifier of the sub-expression.
+        """
+        node = (kind, children)
+        i = self.map_node_id.get(node)
+        if i is None:
+            i = len(self.nodes)
+            self.map_node_id[node] = i
+            self.nodes.append(node)
+            self.patterns.append(pattern)
+            self.precedences.append(precedence)
+        return i
+
+    def kind(self, i: int) -> str:
+        """
+        Retrieves the kind of a sub-expression.
+
+        Args:
+            i (int): The identifier of the sub-expression.
+
+        Returns:
+            ``"eps"``, ``"sym"``, ``"cat"``, ``"alt"``, ``"star"``,
+            ``"plus"`` or ``"opt"``.
+        """
+        return self.nodes[i][0]
+
+    def children(self, i: int) -> tuple:
+        """
+        Retrieves the children of a sub-expression.
+
+        Args:
+            i (int): The identifier of the sub-expression.
+
+        Returns:
+            The identifiers of the children (the symbol for ``"sym"``).
+        """
+        return self.nodes[i][1]
+
+    def pattern(self, i: int) -> str:
+        """
+        Retrieves the pattern of a sub-expression.
+
+        Args:
+            i (int): The identifier of the sub-expression.
+
+        Returns:
+            The corresponding pattern.
+        """
+        return self.patterns[i]
+
+    def size(self, i: int) -> int:
+        """
+        Retrieves the size of a sub-expression.
+
+        Args:
+            i (int): The identifier of the sub-expression.
+
+        Returns:
+            The length of the corresponding pattern.
+        """
+        return len(self.patterns[i])
+
+    def wrap(self, i: int, precedence: int) -> str:
+        """
+        Renders a sub-expression used as an operand.
+
+        Args:
+            i (int): The identifier of the sub-expression.
+            precedence (int): The minimal precedence of the operand.
+
+        Returns:
+            The pattern of ``i``, in a group if needed.
+        """
+        s = self.patterns[i]
+        return s if self.precedences[i] >= precedence else f"(?:{s})"
+
+    def symbol(self, a: str) -> int:
+        """
+        Builds the regular expression matching a symbol.
+
+        Args:
+            a (str): The symbol.
+
+        Returns:
+            The identifier of the sub-expression.
+        """
+        return self.make_node(
+            "sym", a, re.escape(a),
+            PREC_ATOM if len(a) == 1 else PREC_CONCAT
+        )
+
+    def concat(self, i: int, j: int) -> int:
+        """
+        Builds the concatenation of two regular expressions.
+
+        Args:
+            i (int): The identifier of the left operand.
+            j (int): The identifier of the right operand.
+
+        Returns:
+            The identifier of the sub-expression.
+        """
+        if i == self.epsilon:
+            return j
+        if j == self.epsilon:
+            return i
+        factors = list()
+        for k in (i, j):
+            for x in self.factors(k):
+                # x x* = x* x = x+
+                if factors and (
+                    (
+                        self.kind(x) == "star"
+                        and self.children(x)[0] == factors[-1]
+                    ) or (
+                        self.kind(factors[-1]) == "star"
+                        and self.children(factors[-1])[0] == x
+                    )
+                ):
+                    x = self.plus(x if self.kind(x) != "star" else factors[-1])
+                    factors.pop()
+                factors.append(x)
+        if len(factors) == 1:
+            return factors[0]
+        factors = tuple(factors)
+        return self.make_node(
+            "cat", factors,
+            "".join(self.wrap(x, PREC_CONCAT) for x in factors),
+            PREC_CONCAT
+        )
+
+    def factors(self, i: int) -> tuple:
+        """
+        Retrieves the factors of a regular expression.
+
+        Args:
+            i (int): The identifier of the sub-expression.
+
+        Returns:
+            The children of ``i`` if it is a concatenation, ``(i,)``
+            otherwise.
+        """
+        return self.children(i) if self.kind(i) == "cat" else (i,)
+
+    def concat_all(self, factors: tuple) -> int:
+        """
+        Builds the concatenation of several regular expressions.
+
+        Args:
+            factors (tuple): The identifiers of the operands.
+
+        Returns:
+            The identifier of the sub-expression.
+        """
+        ret = self.epsilon
+        for i in factors:
+            ret = self.concat(ret, i)
+        return ret
+
+    def union(self, i: int, j: int) -> int:
+        """
+        Builds the union of two regular expressions.
+
+        Args:
+            i (int): The identifier of the left operand.
+            j (int): The identifier of the right operand.
+
+        Returns:
+            The identifier of the sub-expression.
+        """
+        if i == j:
+            return i
+        if (
+            self.kind(i) not in ("eps", "alt")
+            and self.kind(j) not in ("eps", "alt")
+        ):
+            # x z | y z = (x | y) z and z x | z y = z (x | y)
+            factors_i = self.factors(i)
+            factors_j = self.factors(j)
+            if factors_i[-1] == factors_j[-1]:
+                return self.concat(
+                    self.union(
+                        self.concat_all(factors_i[:-1]),
+                        self.concat_all(factors_j[:-1])
+                    ),
+                    factors_i[-1]
+                )
+            if factors_i[0] == factors_j[0]:
+                return self.concat(
+                    factors_i[0],
+                    self.union(
+                        self.concat_all(factors_i[1:]),
+                        self.concat_all(factors_j[1:])
+                    )
+                )
+        alternatives = set()
+        for k in (i, j):
+            alternatives.update(
+                self.children(k) if self.kind(k) == "alt" else (k,)
+            )
+        if self.epsilon in alternatives:
+            alternatives.discard(self.epsilon)
+            if not any(self.is_nullable(x) for x in alternatives):
+                return self.opt(self.make_union(alternatives))
+        return self.make_union(alternatives)
+
+    def make_union(self, alternatives: set) -> int:
+        """
+        Builds the union of non-empty regular expressions. The symbols
+        made of a single character are gathered in a character class.
+
+        Args:
+            alternatives (set): The identifiers of the alternatives.
+
+        Returns:
+            The identifier of the sub-expression.
+        """
+        if len(alternatives) == 1:
+            return next(iter(alternatives))
+        alternatives = tuple(
+            sorted(alternatives, key=self.patterns.__getitem__)
+        )
+        chars = [
+            self.children(x) for x in alternatives
+            if self.kind(x) == "sym" and len(self.children(x)) == 1
+        ]
+        if len(chars) > 1:
+            patterns = ["[" + "".join(re.escape(a) for a in chars) + "]"]
+            patterns += [
+                self.patterns[x] for x in alternatives
+                if not (self.kind(x) == "sym" and len(self.children(x)) == 1)
+            ]
+        else:
+            patterns = [self.patterns[x] for x in alternatives]
+        return self.make_node(
+            "alt", alternatives, "|".join(patterns),
+            PREC_UNION if len(patterns) > 1 else PREC_ATOM
+        )
+
+    def is_nullable(self, i: int) -> bool:
+        """
+        Tests whether a regular expression obviously matches the empty word.
+
+        Args:
+            i (int): The identifier of the sub-expression.
+
+        Returns:
+            ``True`` if ``i`` is obviously nullable, ``False`` otherwise.
+        """
+        return self.kind(i) in ("eps", "star", "opt")
+
+    def star(self, i: int) -> int:
+        """
+        Builds the Kleene star of a regular expression.
+
+        Args:
+            i (int): The identifier of the operand.
+
+        Returns:
+            The identifier of the sub-expression.
+        """
+        kind = self.kind(i)
+        if kind in ("eps", "star"):
+            return i
+        if kind in ("opt", "plus"):
+            i = self.children(i)[0]
+        return self.make_node(
+            "star", (i,), self.wrap(i, PREC_ATOM) + "*", PREC_POSTFIX
+        )
+
+    def plus(self, i: int) -> int:
+        """
+        Builds the Kleene plus of a regular expression.
+
+        Args:
+            i (int): The identifier of the operand.
+
+        Returns:
+            The identifier of the sub-expression.
+        """
+        kind = self.kind(i)
+        if kind in ("eps", "star", "plus"):
+            return i
+        if kind == "opt":
+            return self.star(self.children(i)[0])
+        return self.make_node(
+            "plus", (i,), self.wrap(i, PREC_ATOM) + "+", PREC_POSTFIX
+        )
+
+    def opt(self, i: int) -> int:
+        """
+        Builds the optional version of a regular expression.
+
+        Args:
+            i (int): The identifier of the operand.
+
+        Returns:
+            The identifier of the sub-expression.
+        """
+        kind = self.kind(i)
+        if self.is_nullable(i):
+            return i
+        if kind == "plus":
+            return self.star(self.children(i)[0])
+        return self.make_node(
+            "opt", (i,), self.wrap(i, PREC_ATOM) + "?", PREC_POSTFIX
+        )
+
+
+def elimination_weight(
+    builder: RegexpBuilder,
+    q: int,
+    out_edges: dict,
+    in_edges: dict
+) -> int:
+    """
+    Estimates the size added to the regular expression by the elimination
+    of a state (see *Approximation to the smallest regular expression for
+    a given regular language*, M. Delgado and J. Morais, 2004).
+
+    Args:
+        builder (RegexpBuilder): The builder of the regular expressions.
+        q (int): The state to eliminate.
+        out_edges (dict): Maps each state with its successors.
+        in_edges (dict): Maps each state with its predecessors.
+
+    Returns:
+        The weight of ``q``.
+    """
+    loop = out_edges[q].get(q)
+    ins = [i for (p, i) in in_edges[q].items() if p != q]
+    outs = [i for (r, i) in out_edges[q].items() if r != q]
+    size = builder.size
+    return (
+        sum(size(i) for i in ins) * (len(outs) - 1)
+        + sum(size(i) for i in outs) * (len(ins) - 1)
+        + (size(loop) if loop is not None else 0) * (len(ins) * len(outs) - 1)
+    )
+
+
+def automaton_to_regexp(g, verify: bool = True) -> str:
+    """
+    Converts an automaton to a regular expression (in the Python :py:mod:`re`
+    syntax) using the state elimination method.
+
+    The states are eliminated in the order of increasing weight
+    (see :py:func:`elimination_weight`) and the resulting sub-expressions
+    are simplified, which keeps the regular expression small.
+
+    Example:
+        >>> from pybgl import compile_dfa
+        >>> from regexp_learner import automaton_to_regexp
+        >>> automaton_to_regexp(compile_dfa("(ab)*a"))
+        'a(?:ba)*'
+
+    Args:
+        g (Automaton): A :py:class:`pybgl.Automaton` instance (e.g.,
+            returned by :py:func:`gold` or :py:meth:`Learner.learn`).
+        verify (bool): Pass ``True`` to check the resulting regular
+            expression against ``g`` (see :py:func:`verify_regexp`).
+
+    Raises:
+        RuntimeError: if the verification fails.
+
+    Returns:
+        The regular expression.
+    """
+    # Keep the states that are both accessible and co-accessible.
+    states = set(g.vertices())
+    q0 = g.initial() if states else None
+    accessible = set()
+    if q0 is not None:
+        accessible.add(q0)
+        stack = [q0]
+        while stack:
+            q = stack.pop()
+            for e in g.out_edges(q):
+                r = g.target(e)
+                if r not in accessible:
+                    accessible.add(r)
+                    stack.append(r)
+    predecessors = {q: set() for q in accessible}
+    for e in g.edges():
+        if g.source(e) in accessible:
+            predecessors[g.target(e)].add(g.source(e))
+    useful = {q for q in accessible if g.is_final(q)}
+    stack = list(useful)
+    while stack:
+        r = stack.pop()
+        for q in predecessors[r]:
+            if q not in useful:
+                useful.add(q)
+                stack.append(q)
+
+    # Build the generalized automaton, with a new initial state (-1) and a
+    # new final state (-2).
+    builder = RegexpBuilder()
+    (start, end) = (-1, -2)
+    out_edges = {q: dict() for q in useful | {start, end}}
+    in_edges = {q: dict() for q in useful | {start, end}}
+
+    def add_edge(q, r, i):
+        j = out_edges[q].get(r)
+        i = i if j is None else builder.union(j, i)
+        out_edges[q][r] = i
+        in_edges[r][q] = i
+
+    if q0 in useful:
+        add_edge(start, q0, builder.epsilon)
+    for q in sorted(useful):
+        for e in g.out_edges(q):
+            r = g.target(e)
+            if r in useful:
+                add_edge(q, r, builder.symbol(g.label(e)))
+        if g.is_final(q):
+            add_edge(q, end, builder.epsilon)
+
+    # Eliminate the states.
+    remaining = set(useful)
+    while remaining:
+        q = min(
+            remaining,
+            key=lambda q: (
+                elimination_weight(builder, q, out_edges, in_edges), q
+            )
+        )
+        remaining.remove(q)
+        loop = out_edges[q].pop(q, None)
+        in_edges[q].pop(q, None)
+        middle = builder.epsilon if loop is None else builder.star(loop)
+        for (p, i) in in_edges[q].items():
+            del out_edges[p][q]
+            left = builder.concat(i, middle)
+            for (r, j) in out_edges[q].items():
+                add_edge(p, r, builder.concat(left, j))
+        for r in out_edges[q]:
+            del in_edges[r][q]
+        del out_edges[q]
+        del in_edges[q]
+
+    i = out_edges[start].get(end)
+    pattern = EMPTY_PATTERN if i is None else builder.pattern(i)
+    if verify and not verify_regexp(pattern, g):
+        raise RuntimeError(
+            f"The regular expression {pattern} does not match g"
+        )
+    return pattern
+
+
+@lru_cache(maxsize=1024)
+def compile_regexp(pattern: str) -> re.Pattern:
+    """
+    Compiles a regular expression. The compiled regular expressions
+    are cached.
+
+    Args:
+        pattern (str): The regular expression.
+
+    Returns:
+        The corresponding ``re.Pattern`` instance.
+    """
+    return re.compile(pattern)
+
+
+def make_test_words(g, max_words: int = 100000) -> iter:
+    """
+    Enumerates test words for an automaton. Each test word is made of an
+    access word (the shortlex smallest word reaching a state of ``g``)
+    followed by a suffix, and the suffixes are all the words up to the
+    largest length such that at most ``max_words`` test words are
+    generated.
+
+    Args:
+        g (Automaton): A :py:class:`pybgl.Automaton` or :py:class:`DFA`
+            instance.
+        max_words (int): The maximal number of test words.
+
+    Returns:
+        An iterator over the test words (possibly with duplicates),
+        by increasing suffix length.
+    """
+    sigma = sorted(g.alphabet())
+    access_words = [""]
+    if g.num_vertices():
+        q0 = g.initial()
+        seen = {q0}
+        queue = deque([(q0, "")])
+        while queue:
+            (q, w) = queue.popleft()
+            for a in sigma:
+                r = g.delta(q, a)
+                if r is not None and r not in seen:
+                    seen.add(r)
+                    access_words.append(w + a)
+                    queue.append((r, w + a))
+
+    num_words = len(access_words)
+    max_length = 0
+    while max_length < g.num_vertices():
+        num_words += len(access_words) * len(sigma) ** (max_length + 1)
+        if num_words > max_words:
+            break
+        max_length += 1
+
+    for n in range(max_length + 1):
+        for v in product(sigma, repeat=n):
+            v = "".join(v)
+            for u in access_words:
+                yield u + v
+
+
+def verify_regexp(pattern: str, g, max_words: int = 100000) -> bool:
+    """
+    Checks whether a regular expression and an automaton agree
+    on a set of test words (see :py:func:`make_test_words`).
+
+    Args:
+        pattern (str): The regular expression.
+        g (Automaton): A :py:class:`pybgl.Automaton` instance.
+        max_words (int): The maximal number of test words.
+
+    Returns:
+        ``True`` if ``pattern`` and ``g`` agree on all the test words,
+        ``False`` otherwise.
+    """
+    regexp = compile_regexp(pattern)
+    return all(
+        (regexp.fullmatch(w) is not None) == g.accepts(w)
+        for w in make_test_words(g, max_words)
+    )
@@ -0,0 +1,12 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+#
+# This file is part of the regexp-learner project
+# https://github.com/nokia/regexp-learner
+
+from ..lazy import lazy_import
+
+lazy_import(__name__, {
+    "StateMerger": ".rpni",
+    "rpni": ".rpni",
+})
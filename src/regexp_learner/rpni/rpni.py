@@ -0,0 +1,283 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+#
+# This file is part of the regexp-learner project
+# https://github.com/nokia/regexp-learner
+
+from collections import deque
+from pybgl import (
+    Automaton,
+    html,
+)
+from ..gold import GoldObservationTable
+from ..prefix_tree import PrefixTree
+
+
+class StateMerger:
+    """
+    The :py:class:`StateMerger` class merges the states of an
+    Augmented Prefix Tree Acceptor (APTA), i.e., a prefix tree whose nodes
+    are labeled by ``True`` (positive example), ``False`` (negative example)
+    or ``None`` (unknown).
+
+    The states are grouped using a union-find structure without path
+    compression, so that each merge can be undone in constant time
+    (see :py:meth:`StateMerger.checkpoint` and
+    :py:meth:`StateMerger.rollback`).
+    """
+    def __init__(self, apta: PrefixTree):
+        """
+        Constructor.
+
+        Args:
+            apta (PrefixTree): The APTA. It is not modified.
+        """
+        n = apta.num_nodes()
+        self.parent = list(range(n))
+        # The parent of each node in the union-find structure
+        self.children = [dict(children) for children in apta.children]
+        # For each class representative, maps each symbol with a node
+        self.labels = list(apta.labels)
+        # The label of each class representative
+        self.trail = list()
+        # The changes made since the beginning, used to undo merges
+
+    def find(self, u: int) -> int:
+        """
+        Retrieves the representative of the class of a node.
+
+        Args:
+            u (int): A node of the APTA.
+
+        Returns:
+            The representative of the class of ``u``.
+        """
+        parent = self.parent
+        while parent[u] != u:
+            u = parent[u]
+        return u
+
+    def delta(self, u: int, a: str) -> int:
+        """
+        Transition function of the quotient automaton.
+
+        Args:
+            u (int): A class representative.
+            a (str): A symbol.
+
+        Returns:
+            The representative of the class reached from ``u`` by
+            ``a`` if any, ``None`` otherwise.
+        """
+        v = self.children[u].get(a)
+        return None if v is None else self.find(v)
+
+    def checkpoint(self) -> int:
+        """
+        Saves the current state of this :py:class:`StateMerger`.
+
+        Returns:
+            A checkpoint that can be passed to
+            :py:meth:`StateMerger.rollback`.
+        """
+        return len(self.trail)
+
+    def rollback(self, checkpoint: int):
+        """
+        Undoes the merges made since a given checkpoint.
+
+        Args:
+            checkpoint (int): A value returned by
+                :py:meth:`StateMerger.checkpoint`.
+        """
+        while len(self.trail) > checkpoint:
+            (kind, u, x) = self.trail.pop()
+            if kind == "parent":
+                self.parent[u] = u
+            elif kind == "label":
+                self.labels[u] = None
+            else:  # "child"
+                del self.children[u][x]
+
+    def merge(self, u: int, v: int) -> int:
+        """
+        Merges the classes of two nodes and folds their successors to
+        keep the quotient automaton deterministic. The class of ``u``
+        absorbs the class of ``v``.
+
+        A conflict is detected as soon as a positive and a negative
+        example fall in the same class. In this case, the merge is
+        interrupted and the caller should roll back to a checkpoint
+        taken beforehand.
+
+        Args:
+            u (int): A node of the APTA.
+            v (int): A node of the APTA.
+
+        Returns:
+            The number of pairs of labeled states merged together
+            (the evidence score used by EDSM) if the merge succeeds,
+            ``None`` if it leads to a conflict.
+        """
+        score = 0
+        pending = [(u, v)]
+        while pending:
+            (u, v) = pending.pop()
+            u = self.find(u)
+            v = self.find(v)
+            if u == v:
+                continue
+            label_u = self.labels[u]
+            label_v = self.labels[v]
+            if label_u is not None and label_v is not None:
+                if label_u != label_v:
+                    return None
+                score += 1
+            self.parent[v] = u
+            self.trail.append(("parent", v, None))
+            if label_u is None and label_v is not None:
+                self.labels[u] = label_v
+                self.trail.append(("label", u, None))
+            children_u = self.children[u]
+            for (a, w) in self.children[v].items():
+                x = children_u.get(a)
+                if x is None:
+                    children_u[a] = w
+                    self.trail.append(("child", u, a))
+                else:
+                    pending.append((x, w))
+        return score
+
+
+def rpni(
+    s_plus: iter,
+    s_minus: iter,
+    sigma: str = "abcdefghijklmnopqrstuvwxyz0123456789 ",
+    evidence_driven: bool = False,
+    verbose: bool = False,
+) -> tuple[Automaton, bool]:
+    """
+    Runs the RPNI (Regular Positive and Negative Inference) algorithm,
+    or its evidence-driven variant (EDSM).
+
+    The algorithm starts from the Augmented Prefix Tree Acceptor (APTA)
+    built from ``s_plus`` and ``s_minus``, and merges its states in the
+    red-blue framework. As the negative examples are stored in the APTA,
+    a merge is rejected as soon as it puts a positive and a negative
+    example in the same state.
+
+    Args:
+        s_plus (iter): An iterable of strings that are
+            present in the language to infer.
+
+        s_minus (iter): An iterable of strings that are
+            not present in the language to infer.
+
+        sigma (str): An iterable of chars, represents the alphabet.
+
+        evidence_driven (bool): If ``False``, the blue states are processed
+            in the shortlex order of their prefixes and merged with the first
+            compatible red state (RPNI). If ``True``, the merge which
+            gathers the most labeled states is performed first (EDSM).
+
+        verbose (bool): Pass ``True`` to output in HTML
+            the important steps of the algorithm.
+
+    Returns:
+        A tuple ``(g, success)`` where:
+        ``g`` is the inferred  :py:class:`Automaton`;
+        ``success`` equals ``True`` iff the algorithm succeeded
+        (by design, the state merging algorithm always succeeds
+        if the input data is consistent).
+    """
+    def quiet(s):
+        pass
+    log = html if verbose else quiet
+    s_plus = set(s_plus)
+    s_minus = set(s_minus)
+    GoldObservationTable.check_input_consistency(
+        s_plus, s_minus, sigma, {""}
+    )
+    apta = PrefixTree()
+    for s in s_plus:
+        apta.insert(s, True)
+    for s in s_minus:
+        apta.insert(s, False)
+
+    # Rank the nodes of the APTA according to the shortlex order.
+    rank = [None] * apta.num_nodes()
+    queue = deque([0])
+    i = 0
+    while queue:
+        u = queue.popleft()
+        rank[u] = i
+        i += 1
+        for a in sorted(apta.children[u]):
+            queue.append(apta.children[u][a])
+
+    merger = StateMerger(apta)
+    red_states = [0]
+
+    def get_blue_states() -> list:
+        red_set = set(red_states)
+        return sorted(
+            {
+                merger.delta(r, a)
+                for r in red_states
+                for a in merger.children[r]
+            } - red_set,
+            key=rank.__getitem__
+        )
+
+    blue_states = get_blue_states()
+    while blue_states:
+        to_merge = None
+        to_promote = None
+        if evidence_driven:
+            best_score = -1
+            for b in blue_states:
+                mergeable = False
+                for r in red_states:
+                    checkpoint = merger.checkpoint()
+                    score = merger.merge(r, b)
+                    merger.rollback(checkpoint)
+                    if score is not None:
+                        mergeable = True
+                        if score > best_score:
+                            best_score = score
+                            to_merge = (r, b)
+                if not mergeable:
+                    to_promote = b
+                    break
+        else:
+            b = blue_states[0]
+            for r in red_states:
+                checkpoint = merger.checkpoint()
+                score = merger.merge(r, b)
+                merger.rollback(checkpoint)
+                if score is not None:
+                    to_merge = (r, b)
+                    break
+            else:
+                to_promote = b
+
+        if to_promote is not None:
+            log(f"Promoting state {to_promote}")
+            red_states.append(to_promote)
+        else:
+            log(f"Merging states {to_merge}")
+            merger.merge(*to_merge)
+        blue_states = get_blue_states()
+
+    # Build the quotient automaton. All the successors of the red states
+    # are red states.
+    red_states.sort(key=rank.__getitem__)
+    map_state_index = {r: i for (i, r) in enumerate(red_states)}
+    g = Automaton(len(red_states))
+    for r in red_states:
+        q = map_state_index[r]
+        for a in sorted(merger.children[r]):
+            g.add_edge(q, map_state_index[merger.delta(r, a)], a)
+        if merger.labels[r] is True:
+            g.set_final(q)
+    return (g, True)
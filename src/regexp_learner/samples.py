@@ -0,0 +1,45 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+#
+# This file is part of the regexp-learner project
+# https://github.com/nokia/regexp-learner
+
+import mmap
+
+
+def read_samples(filename: str, encoding: str = "utf-8") -> iter:
+    """
+    Streams the examples stored in a newline-delimited file. The file is
+    memory-mapped, so that it is never loaded at once in memory: the
+    resulting generator can be passed to :py:func:`gold` or to
+    :py:class:`GoldObservationTable`, which consume it in a single pass.
+
+    Each line corresponds to an example (an empty line corresponds to the
+    empty word). The trailing ``"\\n"`` (or ``"\\r\\n"``) of each line is
+    removed.
+
+    Example:
+        >>> import tempfile
+        >>> from regexp_learner import read_samples
+        >>> with tempfile.NamedTemporaryFile("w", delete=False) as f:
+        ...     _ = f.write("ab\\n\\nabab\\n")
+        >>> list(read_samples(f.name))
+        ['ab', '', 'abab']
+
+    Args:
+        filename (str): The path of the input file.
+        encoding (str): The encoding of the input file.
+
+    Returns:
+        A generator of strings.
+    """
+    with open(filename, "rb") as f:
+        try:
+            m = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:  # Empty file
+            return
+        with m:
+            for line in iter(m.readline, b""):
+                if line.endswith(b"\n"):
+                    line = line[:-2] if line.endswith(b"\r\n") else line[:-1]
+                yield line.decode(encoding)
@@ -0,0 +1,71 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+#
+# This file is part of the regexp-learner project
+# https://github.com/nokia/regexp-learner
+
+from pybgl import Automaton
+
+
+def automaton_to_dict(g: Automaton) -> dict:
+    """
+    Exports an automaton to a JSON-serializable dictionary.
+
+    Example:
+        >>> from regexp_learner import automaton_from_dict, automaton_to_dict
+        >>> d = {
+        ...     "num_states": 2,
+        ...     "initial": 0,
+        ...     "finals": [1],
+        ...     "transitions": [[0, 1, "a"], [1, 0, "b"]],
+        ... }
+        >>> automaton_to_dict(automaton_from_dict(d)) == d
+        True
+
+    Args:
+        g (Automaton): A :py:class:`pybgl.Automaton` instance (e.g.,
+            returned by :py:func:`gold` or :py:meth:`Learner.learn`).
+
+    Returns:
+        A ``dict`` with the following keys:
+        ``"num_states"`` (the states are ``0, ..., num_states - 1``);
+        ``"initial"`` (the initial state);
+        ``"finals"`` (the sorted list of final states);
+        ``"transitions"`` (the sorted list of ``[q, r, a]`` transitions).
+    """
+    map_state_index = {q: i for (i, q) in enumerate(sorted(g.vertices()))}
+    return {
+        "num_states": len(map_state_index),
+        "initial": (
+            map_state_index[g.initial()] if map_state_index else None
+        ),
+        "finals": sorted(
+            map_state_index[q] for q in g.vertices() if g.is_final(q)
+        ),
+        "transitions": sorted(
+            [map_state_index[g.source(e)], map_state_index[g.target(e)],
+             g.label(e)]
+            for e in g.edges()
+        ),
+    }
+
+
+def automaton_from_dict(d: dict) -> Automaton:
+    """
+    Imports an automaton from a dictionary
+    (see :py:func:`automaton_to_dict`).
+
+    Args:
+        d (dict): The dictionary.
+
+    Returns:
+        The corresponding :py:class:`pybgl.Automaton` instance.
+    """
+    g = Automaton(d["num_states"])
+    if d["initial"] is not None:
+        g.set_initial(d["initial"])
+    for (q, r, a) in d["transitions"]:
+        g.add_edge(q, r, a)
+    for q in d["finals"]:
+        g.set_final(q)
+    return g
@@ -4,6 +4,9 @@
 # This file is part of the regexp-learner project
 # https://github.com/nokia/regexp-learner
 
+import sys
+from .prefix_tree import PrefixTree
+
 
 def prefixes(s: str) -> iter:
     """
@@ -42,11 +45,11 @@ def is_prefix_closed(strings: set) -> bool:
     Returns:
         ``True`` iff ``strings`` is prefix-closed, ``False`` otherwise.
     """
-    return not any(
-        prefix not in strings
-        for s in strings
-        for prefix in prefixes(s)
-    )
+    # By induction, it suffices to check the longest proper prefix of each
+    # string, which runs in O(sum(len(s) for s in strings)).
+    if not isinstance(strings, (set, frozenset, dict)):
+        strings = set(strings)
+    return all(s[:-1] in strings for s in strings if s)
 
 
 def suffixes(s: str):
@@ -68,7 +71,7 @@ def suffixes(s: str):
     return (s[i:] for i in range(len(s) + 1))
 
 
-def is_suffix_closed(str_set) -> bool:
+def is_suffix_closed(strings: set) -> bool:
     """
     Tests whether a set of strings is suffix-closed (i.e., all the suffixes
     of all the strings belong to this set).
@@ -86,9 +89,72 @@ def is_suffix_closed(str_set) -> bool:
     Returns:
         ``True`` iff ``strings`` is suffix-closed, ``False`` otherwise.
     """
+    # By induction, it suffices to check the longest proper suffix of each
+    # string, which runs in O(sum(len(s) for s in strings)).
+    if not isinstance(strings, (set, frozenset, dict)):
+        strings = set(strings)
+    return all(s[1:] in strings for s in strings if s)
+
+
+def distinct_suffixes(strings: iter, suffix_tree: PrefixTree = None) -> list:
+    """
+    Lists the distinct suffixes of a set of strings (including the empty
+    word if ``strings`` is not empty).
+
+    The strings are inserted from right to left in a :py:class:`PrefixTree`,
+    whose nodes correspond to the distinct suffixes. Hence, a suffix shared
+    by several strings is built once, and this runs in
+    ``O(sum(len(s) for s in strings))`` plus the size of the output.
+
+    Example:
+        >>> from regexp_learner import distinct_suffixes
+        >>> distinct_suffixes(["abc", "bc", "xc"])
+        ['', 'c', 'bc', 'xc', 'abc']
+
+    Args:
+        strings (iter): An iterable of strings.
+        suffix_tree (PrefixTree): A :py:class:`PrefixTree` storing the
+            reversed strings processed so far, updated by this function.
+            Pass ``None`` to start from scratch.
+
+    Returns:
+        The suffixes of ``strings`` that were not yet in ``suffix_tree``,
+        sorted by increasing length, then in the lexicographic order.
+    """
+    if suffix_tree is None:
+        suffix_tree = PrefixTree()
+    children = suffix_tree.children
+    ret = list()
+    for s in strings:
+        if suffix_tree.labels[0] is None:
+            # The root (i.e., the empty suffix) is labeled once reported.
+            suffix_tree.labels[0] = True
+            ret.append("")
+        u = 0
+        for i in range(len(s) - 1, -1, -1):
+            v = children[u].get(s[i])
+            if v is None:
+                v = suffix_tree.add_child(u, s[i])
+                ret.append(s[i:])
+            u = v
+    ret.sort(key=lambda s: (len(s), s))
+    return ret
+
+
+def sizeof_strings(strings: iter) -> int:
+    """
+    Estimates the memory used by a collection of strings.
+
+    Example:
+        >>> from regexp_learner.strings import sizeof_strings
+        >>> sizeof_strings({"a", "b"}) > sizeof_strings(set())
+        True
+
+    Args:
+        strings (iter): A ``set``, ``list`` or ``dict`` of strings
+            (for a ``dict``, the keys are counted).
 
-    return not any(
-        suffix not in str_set
-        for s in str_set
-        for suffix in suffixes(s)
-    )
+    Returns:
+        The size of the container plus the sizes of the strings, in bytes.
+    """
+    return sys.getsizeof(strings) + sum(map(sys.getsizeof, strings))
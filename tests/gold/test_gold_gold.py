@@ -5,7 +5,11 @@
 # https://github.com/nokia/regexp-learner
 
 from pybgl import in_ipynb
-from regexp_learner import gold
+from regexp_learner import (
+    GoldObservationTable,
+    MemoryLimitError,
+    gold,
+)
 
 
 def test_gold_gold():
@@ -13,13 +17,14 @@ def test_gold_gold():
     s_plus = {"abb", "bb", "bba", "bbb", "babb"}
     s_minus = {"", "a", "ba"}
     sigma = "ab"
+    # Without hole filling, the successor of "bb" by "a" is mapped to "b",
+    # which rejects "bba". Hence, the PTA is returned.
     (g, success) = gold(
         s_plus, s_minus,
         sigma=sigma, verbose=verbose
     )
-    assert success
-    assert g.num_vertices() == 3
-    assert g.num_edges() == 6
+    assert not success
+    assert all(g.accepts(w) for w in s_plus)
     (g, success) = gold(
         s_plus, s_minus,
         sigma=sigma, fill_holes=True, verbose=verbose
@@ -27,3 +32,53 @@ def test_gold_gold():
     assert success
     assert g.num_vertices() == 3
     assert g.num_edges() == 6
+    assert all(g.accepts(w) for w in s_plus)
+    assert not any(g.accepts(w) for w in s_minus)
+
+
+def test_gold_gold_parallel():
+    s_plus = {"abb", "bb", "bba", "bbb", "babb", "aabb", "abab", "bbab"}
+    s_minus = {"", "a", "ba", "aa", "aba", "baa", "b"}
+    for fill_holes in [False, True]:
+        (g1, success1) = gold(
+            s_plus, s_minus,
+            sigma="ab", fill_holes=fill_holes
+        )
+        (g2, success2) = gold(
+            s_plus, s_minus,
+            sigma="ab", fill_holes=fill_holes, n_jobs=2
+        )
+        assert success1 == success2
+        assert sorted(
+            (g1.source(e), g1.target(e), g1.label(e)) for e in g1.edges()
+        ) == sorted(
+            (g2.source(e), g2.target(e), g2.label(e)) for e in g2.edges()
+        )
+
+
+def test_gold_gold_minimize():
+    s_plus = {"abb", "bb", "bba", "bbb", "babb"}
+    s_minus = {"", "a", "ba"}
+    (g1, success1) = gold(s_plus, s_minus, sigma="ab", fill_holes=True)
+    (g2, success2) = gold(
+        s_plus, s_minus, sigma="ab", fill_holes=True, minimize=True
+    )
+    assert success1 and success2
+    assert g2.num_vertices() <= g1.num_vertices()
+    assert all(g2.accepts(w) for w in s_plus)
+    assert not any(g2.accepts(w) for w in s_minus)
+
+
+def test_gold_gold_max_memory():
+    s_plus = {"abb", "bb", "bba", "bbb", "babb"}
+    s_minus = {"", "a", "ba"}
+    (g, success) = gold(s_plus, s_minus, sigma="ab", max_memory=1 << 30)
+    assert g is not None
+    try:
+        gold(s_plus, s_minus, sigma="ab", max_memory=1000)
+        assert False
+    except MemoryLimitError as e:
+        assert isinstance(e.table, GoldObservationTable)
+        assert e.usage["total"] > 1000
+        assert e.table.peak_memory_usage == e.usage["total"]
+        assert "Memory limit exceeded" in str(e)
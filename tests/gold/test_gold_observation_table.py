@@ -4,6 +4,12 @@
 # This file is part of the regexp-learner project
 # https://github.com/nokia/regexp-learner
 
+import sys
+from itertools import chain
+from pybgl import (
+    make_automaton,
+    make_func_property_map,
+)
 from regexp_learner import GoldObservationTable
 
 
@@ -62,3 +68,148 @@ def test_gold_observation_table4():
         s_minus,
         sigma=sigma
     )
+
+
+def test_gold_observation_table_sparse_rows():
+    s_plus = {"abb", "bb", "bba", "bbb", "babb"}
+    s_minus = {"", "a", "ba"}
+    o = GoldObservationTable(s_plus, s_minus, sigma="ab")
+    for (prefix, row) in list(o.red_states.items()) + list(
+        o.blue_states.items()
+    ):
+        assert set(row.values()) <= {o.ONE, o.ZERO}
+        for (j, suffix) in enumerate(o.exp):
+            assert (
+                o.get_row_value(row, j) ==
+                o.get_value_from_sample(prefix + suffix)
+            )
+
+
+def test_gold_observation_table_are_obviously_different():
+    ONE = GoldObservationTable.ONE
+    ZERO = GoldObservationTable.ZERO
+    are_obviously_different = GoldObservationTable.are_obviously_different
+    assert not are_obviously_different({}, {0: ONE})
+    assert not are_obviously_different({0: ONE, 2: ZERO}, {1: ZERO, 2: ZERO})
+    assert are_obviously_different({0: ONE, 2: ZERO}, {2: ONE})
+    assert are_obviously_different({3: ZERO}, {0: ONE, 3: ONE, 5: ZERO})
+
+
+def test_gold_observation_table_red_state_index():
+    s_plus = {"abb", "bb", "bba", "bbb", "babb"}
+    s_minus = {"", "a", "ba"}
+    for red_state_choice_func in [min, max]:
+        o = GoldObservationTable(
+            s_plus, s_minus, sigma="ab",
+            red_state_choice_func=red_state_choice_func
+        )
+        while o.try_and_promote_blue():
+            pass
+        red_state_index = o.make_red_state_index()
+        for row in o.blue_states.values():
+            assert (
+                o.choose_compatible_red_state(row) ==
+                o.choose_compatible_red_state(row, red_state_index)
+            )
+
+
+def test_gold_observation_table_add_samples():
+    s_plus = {"abb", "bb", "bba"}
+    s_minus = {"", "a"}
+    new_s_plus = {"bbb", "babb"}
+    new_s_minus = {"ba"}
+    o = GoldObservationTable(s_plus, s_minus, sigma="ab")
+    while o.try_and_promote_blue():
+        pass
+    o.add_samples(new_s_plus, new_s_minus)
+    assert o.row_length == len(o.exp) == len(set(o.exp))
+
+    # The rows must match the rows of a table built from scratch.
+    expected = GoldObservationTable(
+        s_plus | new_s_plus,
+        s_minus | new_s_minus,
+        sigma="ab"
+    )
+    for rows in (o.red_states, o.blue_states):
+        for (prefix, row) in rows.items():
+            obtained = {o.exp[j]: v for (j, v) in row.items()}
+            assert obtained == {
+                expected.exp[j]: v
+                for (j, v) in expected.make_row(prefix).items()
+            }
+
+    while o.try_and_promote_blue():
+        pass
+    assert set(o.red_states) == {"", "b", "bb"}
+
+    try:
+        o.add_samples({"a"}, set())
+        assert False
+    except RuntimeError:
+        assert True
+
+
+def test_gold_observation_table_is_consistent_with_samples():
+    s_plus = {"abb", "bb", "bba", "bbb", "babb"}
+    s_minus = {"", "a", "ba"}
+    o = GoldObservationTable(s_plus, s_minus, sigma="ab")
+    assert o.is_consistent_with_samples(o.make_pta()) is True
+    g = make_automaton(
+        [(0, 0, "a"), (0, 0, "b")], 0,
+        make_func_property_map(lambda q: True)
+    )
+    assert o.is_consistent_with_samples(g) is False
+    g = make_automaton(
+        [(0, 1, "b"), (1, 2, "b")], 0,
+        make_func_property_map(lambda q: q == 2)
+    )
+    assert o.is_consistent_with_samples(g) is False
+
+
+def test_gold_observation_table_memory_usage():
+    o = GoldObservationTable({"ab"}, {"a"}, sigma="ab")
+    usage = o.memory_usage()
+    assert set(usage) == {"rows", "keys", "samples", "total"}
+    assert usage["total"] == sum(
+        v for (k, v) in usage.items() if k != "total"
+    )
+    while o.try_and_promote_blue():
+        pass
+    o.add_samples({"abab", "ababab"}, {"aba"})
+    assert o.memory_usage()["samples"] > usage["samples"]
+    assert o.samples_size == sum(
+        map(sys.getsizeof, chain(o.s_plus, o.s_minus))
+    )
+    assert o.peak_memory_usage >= usage["total"]
+
+
+def test_gold_observation_table_try_and_fill_holes():
+    s_plus = {"abb", "bb", "bba", "bbb", "babb"}
+    s_minus = {"", "a", "ba"}
+    for red_state_choice_func in [min, max]:
+        o = GoldObservationTable(
+            s_plus, s_minus, sigma="ab", fill_holes=True,
+            red_state_choice_func=red_state_choice_func
+        )
+        while o.try_and_promote_blue():
+            pass
+        sparse_rows = [
+            dict(row)
+            for row in chain(o.red_states.values(), o.blue_states.values())
+        ]
+        assert o.try_and_fill_holes()
+        matrix = o.red_matrix.tolist() + o.blue_matrix.tolist()
+        assert len(matrix) == len(sparse_rows)
+        for (sparse_row, dense_row) in zip(sparse_rows, matrix):
+            # The holes are filled, the other cells are kept.
+            assert len(dense_row) == o.row_length
+            assert set(dense_row) <= {o.ZERO, o.ONE}
+            assert all(dense_row[j] == v for (j, v) in sparse_row.items())
+        # Each blue row is a copy of a red row.
+        red_rows = o.red_matrix.tolist()
+        assert all(row in red_rows for row in o.blue_matrix.tolist())
+        # The sparse rows are kept.
+        assert sparse_rows == [
+            row
+            for row in chain(o.red_states.values(), o.blue_states.values())
+        ]
@@ -4,12 +4,17 @@
 # This file is part of the regexp-learner project
 # https://github.com/nokia/regexp-learner
 
+from itertools import product
 from pybgl import (
     graph_to_html,
     make_automaton,
     make_func_property_map,
 )
-from regexp_learner import automaton_match
+from regexp_learner import (
+    DFA,
+    automaton_match,
+    find_counterexamples,
+)
 from ..common import html
 
 
@@ -90,3 +95,32 @@ def test_automaton_match45():
     obtained = automaton_match(G5, G4)
     assert expected == obtained, f"{expected=} {obtained=}"
     html("These automata don't match for w = {obtained}")
+
+
+def test_find_counterexamples():
+    assert find_counterexamples(G1, G1) == []
+    (w,) = find_counterexamples(G1, G2, k=1)
+    assert len(w) == 2 and G1.accepts(w) != G2.accepts(w)
+    assert find_counterexamples(G1, G3) == ["b"]
+    obtained = find_counterexamples(G4, G5, k=3)
+    assert obtained[0] == "b"
+    assert obtained == sorted(obtained, key=len)
+    assert len(set(obtained)) == len(obtained)
+
+
+def test_find_counterexamples_dfa():
+    # (ab)* versus a partial DFA recognizing (ab)*a?, over {a, b, c}.
+    g1 = DFA("ab", [[1, 2], [2, 0], [2, 2]], [True, False, False])
+    g2 = DFA("abc", [[1, None, None], [None, 0, None]], [True, True])
+    words = [
+        "".join(w)
+        for n in range(6)
+        for w in product("abc", repeat=n)
+    ]
+    expected = [w for w in words if g1.accepts(w) != g2.accepts(w)]
+    # The other counterexamples (aba, ababa, ...) reach the same pair of
+    # states as a.
+    obtained = find_counterexamples(g1, g2, k=3)
+    assert obtained == expected[:1] == ["a"]
+    assert find_counterexamples(g2, g1, k=3) == obtained
+    assert find_counterexamples(g2, g2, k=3) == []
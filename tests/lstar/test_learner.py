@@ -6,6 +6,7 @@
 
 from pybgl import (
     Automaton,
+    compile_dfa,
     graph_to_html,
     in_ipynb,
     make_automaton,
@@ -14,10 +15,14 @@ from pybgl import (
 from regexp_learner import (
     Learner,
     LstarObservationTable,
+    MemoryLimitError,
     Teacher,
     automaton_match,
+    find_counterexamples,
     make_automaton_from_observation_table,
+    minimize_automaton,
 )
+from regexp_learner.lstar.learner import make_characterization
 from ..common import html
 
 
@@ -105,6 +110,10 @@ def test_make_automaton_from_observation_table():
     html("<b>expected</b>")
     html(graph_to_html(G1))
     assert automaton_match(G1, h) is None
+    h = make_automaton_from_observation_table(o, minimize=True)
+    assert h.is_complete()
+    assert h.num_vertices() == 3
+    assert automaton_match(G1, h) is None
 
 
 def test_make_automaton_from_observation_table2():
@@ -177,3 +186,129 @@ def test_learners(gs: list[Automaton] = [G1, G2, G3, G4, G5]):
     for (i, g) in enumerate(gs):
         html(f"<h3>Test G{i + 1}</h3>")
         test_learner(g)
+
+
+def test_lazy_learners(gs: list[Automaton] = [G1, G2, G3, G4, G5]):
+    for g in gs:
+        if not g.is_complete():
+            continue
+        eager_teacher = Teacher(g)
+        Learner(eager_teacher, verbose=False).learn()
+        lazy_teacher = Teacher(g)
+        h = Learner(lazy_teacher, verbose=False, lazy=True).learn()
+        assert automaton_match(g, h) is None
+        assert (
+            lazy_teacher.num_membership_queries
+            <= eager_teacher.num_membership_queries
+        )
+
+
+def test_learner_counterexamples():
+    g = minimize_automaton(
+        compile_dfa("((a|b)(a|b)(a|b)(a|b)(a|b))*b", complete=True),
+        complete=True
+    )
+    for k in [1, 4]:
+        teacher = Teacher(g)
+        h = Learner(teacher, verbose=False, num_counterexamples=k).learn()
+        assert find_counterexamples(g, h) == []
+        assert h.num_vertices() == g.num_vertices()
+
+
+def test_make_characterization():
+    regexp = "(a|b)*a(a|b)(a|b)|b*c"
+    for complete in [False, True]:
+        g = minimize_automaton(
+            compile_dfa(regexp, complete=complete),
+            complete=complete
+        )
+        (prefixes, suffixes) = make_characterization(g, "abc")
+        assert len(prefixes) == g.num_vertices()
+        assert all(e[1:] in suffixes for e in suffixes if e)
+        rows = {
+            tuple(g.accepts(s + e) for e in suffixes)
+            for s in prefixes
+        }
+        assert len(rows) == g.num_vertices()
+
+
+def test_learner_parallel():
+    g = minimize_automaton(
+        compile_dfa("((a|b)(a|b)(a|b)(a|b)(a|b))*b", complete=True),
+        complete=True
+    )
+    learner = Learner(Teacher(g), verbose=False, n_jobs=2)
+    learner.o.PARALLEL_MIN_CELLS = 0
+    h = learner.learn()
+    assert find_counterexamples(g, h) == []
+    assert learner.o.executor is None
+
+
+def test_learner_warm_start():
+    old = minimize_automaton(
+        compile_dfa("(a|b)*a(a|b)(a|b)", complete=True),
+        complete=True
+    )
+    new = minimize_automaton(
+        compile_dfa("(a|b)*a(a|b)(a|b)|b*", complete=True),
+        complete=True
+    )
+    learner = Learner(Teacher(old), verbose=False)
+    h_old = learner.learn()
+
+    # Same language: the prior is correct, only the empty word is queried.
+    teacher = Teacher(old)
+    h = Learner(teacher, verbose=False, prior=h_old).learn()
+    assert find_counterexamples(old, h) == []
+    assert teacher.num_membership_queries == 1
+
+    cold_teacher = Teacher(new)
+    Learner(cold_teacher, verbose=False).learn()
+    for prior in [learner.o, h_old]:
+        for lazy in [False, True]:
+            teacher = Teacher(new)
+            h = Learner(
+                teacher, verbose=False, lazy=lazy, prior=prior
+            ).learn()
+            assert find_counterexamples(new, h) == []
+            assert (
+                teacher.num_membership_queries
+                < cold_teacher.num_membership_queries
+            )
+
+
+def test_learner_warm_start_counterexamples():
+    # The prior misclassifies several counterexamples of the same
+    # hypothesis, and validating its cells changes the table.
+    old = compile_dfa("(ab)*", complete=True)
+    new = compile_dfa("(abc)*", complete=True)
+    for lazy in [False, True]:
+        h = Learner(
+            Teacher(new),
+            verbose=False,
+            lazy=lazy,
+            prior=old,
+            num_counterexamples=3
+        ).learn()
+        assert find_counterexamples(new, h) == []
+
+
+def test_learner_max_memory():
+    g = minimize_automaton(
+        compile_dfa("((a|b)(a|b)(a|b)(a|b)(a|b))*b", complete=True),
+        complete=True
+    )
+    learner = Learner(Teacher(g), verbose=False)
+    learner.learn()
+    assert learner.o.peak_memory_usage == 0
+    learner = Learner(Teacher(g), verbose=False)
+    learner.learn(track_memory=True)
+    peak = learner.o.peak_memory_usage
+    assert peak > 0
+    learner = Learner(Teacher(g), verbose=False)
+    try:
+        learner.learn(max_memory=peak // 2)
+        assert False
+    except MemoryLimitError as e:
+        assert e.table is learner.o
+        assert peak // 2 < e.usage["total"] <= peak
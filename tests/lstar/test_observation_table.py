@@ -4,6 +4,7 @@
 # This file is part of the regexp-learner project
 # https://github.com/nokia/regexp-learner
 
+import random
 from regexp_learner import LstarObservationTable
 from ..common import html
 
@@ -93,3 +94,100 @@ def test_observation_table_is_consistent():
     o.set("aa", "", True)
     o.set("ab", "", False)
     check(o, False)
+
+
+def test_observation_table_lazy():
+    queries = list()
+
+    def membership_query(w: str) -> bool:
+        queries.append(w)
+        return len(w) % 2 == 0
+
+    o = LstarObservationTable("a", membership_query=membership_query)
+    o.s = {""}
+    o.add_suffix("")
+    o.add_suffix("a")
+    o.set("a", "", False)
+    assert o.find_distinguishing_suffix("", "a") == ""
+    assert queries == [""]
+    assert o.find_distinguishing_suffix("", "aa") is None
+    assert sorted(queries) == ["", "a", "aa", "aaa"]
+    assert o.find_distinguishing_suffix("a", "") == ""
+    assert len(queries) == 4
+    assert o.find_mismatch_closeness() == ("", "a")
+    o.s.add("a")
+    assert o.is_closed()
+    assert o.is_consistent()
+
+
+def test_observation_table_tentative():
+    o = LstarObservationTable("ab")
+    o.set("a", "b", True, tentative=True)
+    o.set("ab", "", True, tentative=True)
+    o.set("", "a", False)
+    assert o.is_tentative("a", "b")
+    assert not o.is_tentative("", "a")
+    assert o.guess("ab") is True
+    assert o.validate("a", lambda ws: [w != "ab" for w in ws]) == ["b"]
+    assert not o.is_tentative("a", "b")
+    # The other cells of the same word are updated.
+    assert o.get("ab", "") is False
+    assert not o.is_tentative("ab", "")
+    assert o.guess("ab") is None
+
+
+def test_observation_table_memory_usage():
+    o = LstarObservationTable("ab")
+    usage = o.memory_usage()
+    assert set(usage) == {"matrices", "keys", "answers", "total"}
+    o.s = {""}
+    for s in ["", "a", "b", "ab"]:
+        for e in ["", "a", "ba"]:
+            o.set(s, e, len(s + e) % 2 == 0)
+    new_usage = o.memory_usage()
+    assert new_usage["matrices"] > usage["matrices"]
+    assert new_usage["keys"] > usage["keys"]
+    assert o.peak_memory_usage == new_usage["total"]
+
+
+def test_observation_table_parallel():
+    symbols = "abc"
+    counts = [0, 0]
+    for seed in range(50):
+        r = random.Random(seed)
+        o = LstarObservationTable(symbols, n_jobs=3)
+        o.PARALLEL_MIN_CELLS = 0
+        while len(o.s) < 60:
+            o.s.add("".join(r.choice(symbols) for _ in range(r.randrange(6))))
+        suffixes = [""] + [
+            "".join(r.choice(symbols) for _ in range(r.randrange(1, 5)))
+            for _ in range(70)
+        ]
+        # Few distinct rows, some of them only reachable by S.A.
+        rows = [
+            [r.random() < 0.5 for _ in suffixes]
+            for _ in range(1 + seed % 5)
+        ]
+        num_s_rows = len(rows) - 1 if len(rows) > 1 and seed % 2 else len(rows)
+        for s in o.s:
+            for a in [""] + list(symbols):
+                if a and s + a in o.s:
+                    continue
+                row = rows[r.randrange(num_s_rows if a == "" else len(rows))]
+                for (e, v) in zip(suffixes, row):
+                    o.set(s + a, e, v)
+        assert o.is_parallel()
+        expected = o.find_mismatch_closeness_serial()
+        assert o.find_mismatch_closeness() == expected
+        counts[0] += expected is not None
+        expected = o.find_mismatch_consistency_serial()
+        assert o.find_mismatch_consistency() == expected
+        counts[1] += expected is not None
+        # The checks share a single thread pool.
+        executor = o.executor
+        assert executor is not None
+        o.is_closed()
+        assert o.executor is executor
+        o.shutdown()
+        assert o.executor is None
+    assert all(counts)
@@ -0,0 +1,98 @@
+#!/usr/bin/env pytest
+# -*- coding: utf-8 -*-
+#
+# This file is part of the regexp-learner project
+# https://github.com/nokia/regexp-learner
+
+import re
+from pybgl import compile_dfa
+from regexp_learner import (
+    Learner,
+    ModelCache,
+    PredicateTeacher,
+    RegexpTeacher,
+    find_counterexamples,
+)
+
+
+def test_regexp_teacher():
+    for (pattern, pybgl_pattern, alphabet) in [
+        (r"(ab)*", "(ab)*", "ab"),
+        (r"(a|b)*abb", "(a|b)*abb", "ab"),
+        (r"a[bc]*d", "a(b|c)*d", "abcd"),
+    ]:
+        teacher = RegexpTeacher(pattern, alphabet)
+        for k in [1, 3]:
+            h = Learner(teacher, verbose=False, num_counterexamples=k).learn()
+            g = compile_dfa(pybgl_pattern, complete=True)
+            assert find_counterexamples(g, h) == [], pattern
+
+
+def test_regexp_teacher_compiled():
+    teacher = RegexpTeacher(re.compile("A+", re.IGNORECASE), "ab")
+    assert teacher.membership_query("aA")
+    assert not teacher.membership_query("ab")
+    assert teacher.membership_queries(["", "a", "b"]) == [False, True, False]
+    assert teacher.num_membership_queries == 5
+
+
+def test_predicate_teacher():
+    calls = list()
+
+    def predicate(w: str) -> bool:
+        calls.append(w)
+        return w.count("a") % 3 == 0
+
+    teacher = PredicateTeacher(predicate, "ab")
+    h = Learner(teacher, verbose=False).learn()
+    assert h.num_vertices() == 3
+    assert h.accepts("babaab") and not h.accepts("aab")
+    # The predicate is evaluated once per word.
+    assert len(calls) == len(set(calls))
+    assert teacher.fingerprint() is None
+
+    num_calls = len(calls)
+    num_queries = teacher.num_membership_queries
+    words = ["aaa", "aaaaaaa", "aaaaaaa", "babbabba"]
+    assert teacher.membership_queries(words) == [True, False, False, True]
+    assert teacher.num_membership_queries == num_queries + 4
+    assert calls[num_calls:] == [
+        w for w in ["aaaaaaa", "babbabba"] if w not in calls[:num_calls]
+    ]
+
+
+def test_predicate_teacher_batches():
+    class BatchOnlyTeacher(PredicateTeacher):
+        def membership_query(self, w: str) -> bool:
+            assert False, "The queries must be batched"
+
+    for lazy in [False, True]:
+        calls = list()
+
+        def predicate(w: str) -> bool:
+            calls.append(w)
+            return w.count("a") % 3 == 0 and w.endswith("b")
+
+        teacher = BatchOnlyTeacher(predicate, "ab")
+        h = Learner(teacher, verbose=False, lazy=lazy).learn()
+        assert h.accepts("aaab") and not h.accepts("aab")
+        assert teacher.num_membership_queries > 0
+        # The predicate is evaluated once per distinct word, including
+        # the test words of the conjectures.
+        assert len(calls) == len(set(calls))
+
+
+def test_regexp_teacher_cache(tmp_path):
+    cache = ModelCache(str(tmp_path))
+    Learner(RegexpTeacher("(ab)*", "ab"), verbose=False).learn(cache=cache)
+    teacher = RegexpTeacher("(ab)*", "ab")
+    h = Learner(teacher, verbose=False).learn(cache=cache)
+    assert teacher.num_membership_queries == 0
+    assert h.accepts("abab")
+    Learner(PredicateTeacher(bool, "ab"), verbose=False).learn(cache=cache)
+    assert len(cache) == 1
+    # A stricter equivalence check must not reuse the cached automaton.
+    teacher = RegexpTeacher("(ab)*", "ab", num_samples=2000)
+    Learner(teacher, verbose=False).learn(cache=cache)
+    assert teacher.num_membership_queries > 0
+    assert len(cache) == 2
@@ -0,0 +1,65 @@
+#!/usr/bin/env pytest
+# -*- coding: utf-8 -*-
+#
+# This file is part of the regexp-learner project
+# https://github.com/nokia/regexp-learner
+
+import re
+from itertools import product
+from regexp_learner import rpni
+from regexp_learner.prefix_tree import PrefixTree
+from regexp_learner.rpni import StateMerger
+
+
+def words(sigma: str, max_length: int) -> list:
+    return [
+        "".join(w)
+        for n in range(max_length + 1)
+        for w in product(sigma, repeat=n)
+    ]
+
+
+def test_state_merger_rollback():
+    apta = PrefixTree()
+    apta.insert("aa", True)
+    apta.insert("b", False)
+    merger = StateMerger(apta)
+    (a, b) = (apta.find("a"), apta.find("b"))
+    checkpoint = merger.checkpoint()
+    assert merger.merge(0, a) == 0
+    assert merger.find(a) == 0
+    assert merger.labels[0] is True
+    merger.rollback(checkpoint)
+    assert merger.find(a) == a
+    assert merger.labels[0] is None
+    assert merger.children == [dict(c) for c in apta.children]
+    assert merger.merge(apta.find("aa"), b) is None
+
+
+def test_rpni():
+    s_plus = {"abb", "bb", "bba", "bbb", "babb"}
+    s_minus = {"", "a", "ba"}
+    for evidence_driven in [False, True]:
+        (g, success) = rpni(
+            s_plus, s_minus,
+            sigma="ab", evidence_driven=evidence_driven
+        )
+        assert success
+        assert all(g.accepts(w) for w in s_plus)
+        assert not any(g.accepts(w) for w in s_minus)
+
+
+def test_rpni_learns_language():
+    pattern = re.compile("(ab)*")
+    samples = words("ab", 6)
+    s_plus = {w for w in samples if pattern.fullmatch(w)}
+    s_minus = set(samples) - s_plus
+    for evidence_driven in [False, True]:
+        (g, success) = rpni(
+            s_plus, s_minus,
+            sigma="ab", evidence_driven=evidence_driven
+        )
+        assert success
+        assert g.num_vertices() <= 3
+        for w in words("ab", 8):
+            assert g.accepts(w) == bool(pattern.fullmatch(w))
@@ -0,0 +1,63 @@
+#!/usr/bin/env pytest
+# -*- coding: utf-8 -*-
+#
+# This file is part of the regexp-learner project
+# https://github.com/nokia/regexp-learner
+
+import time
+from pybgl import compile_dfa
+from regexp_learner import (
+    Teacher,
+    learn_many,
+)
+
+
+class SlowTeacher(Teacher):
+    def membership_query(self, w: str) -> bool:
+        time.sleep(0.05)
+        return super().membership_query(w)
+
+
+def make_jobs() -> list:
+    return [
+        Teacher(compile_dfa("(ab)*", complete=True)),
+        ({"abb", "bb"}, {"", "a"}),
+        {"s_plus": {"a"}, "s_minus": {"a"}, "sigma": "a"},
+        {"s_plus": {"a", "aa"}, "s_minus": {""}, "sigma": "a"},
+    ]
+
+
+def check_results(results: list):
+    assert [r.index for r in results] == [0, 1, 2, 3]
+    assert results[0].success
+    assert results[0].automaton.accepts("abab")
+    assert results[0].statistics["membership_queries"] > 0
+    assert results[0].statistics["peak_memory_usage"] > 0
+    assert results[1].automaton is not None
+    assert results[2].automaton is None
+    assert results[2].error.startswith("RuntimeError")
+    assert results[3].success
+    assert all(r.duration >= 0 for r in results)
+
+
+def test_learn_many_sequential():
+    results = list(learn_many(make_jobs(), n_jobs=1))
+    check_results(results)
+
+
+def test_learn_many_parallel():
+    for chunksize in [1, 3]:
+        results = learn_many(make_jobs(), n_jobs=2, chunksize=chunksize)
+        check_results(sorted(results, key=lambda r: r.index))
+
+
+def test_learn_many_timeout():
+    jobs = [
+        SlowTeacher(compile_dfa("(a|b)*abb", complete=True)),
+        ({"a"}, {""}),
+    ]
+    results = list(learn_many(jobs, n_jobs=1, timeout=0.2))
+    assert results[0].timeout
+    assert results[0].automaton is None
+    assert not results[1].timeout
+    assert results[1].error is None
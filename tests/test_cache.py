@@ -0,0 +1,79 @@
+#!/usr/bin/env pytest
+# -*- coding: utf-8 -*-
+#
+# This file is part of the regexp-learner project
+# https://github.com/nokia/regexp-learner
+
+import os
+from pybgl import compile_dfa
+from regexp_learner import (
+    Learner,
+    ModelCache,
+    Teacher,
+    automaton_to_dict,
+    gold,
+)
+from regexp_learner.cache import make_key
+
+
+def test_make_key():
+    key = make_key(s_plus={"a", "b"}, sigma="ab", func=min)
+    assert key == make_key(sigma="ab", func=min, s_plus={"b", "a"})
+    assert key != make_key(s_plus={"a", "b"}, sigma="ab", func=max)
+    assert key != make_key(s_plus={"a"}, s_minus={"b"}, sigma="ab", func=min)
+    # Two distinct lambda functions have the same qualified name.
+    assert make_key(func=lambda candidates: min(candidates)) is None
+    assert make_key(func=lambda candidates: max(candidates)) is None
+
+
+def test_gold_cache_lambda(tmp_path):
+    cache = ModelCache(str(tmp_path))
+    (g, success) = gold(
+        {"a"}, {""}, sigma="ab", cache=cache,
+        red_state_choice_func=lambda candidates: min(candidates)
+    )
+    assert success
+    assert len(cache) == 0
+
+
+def test_gold_cache(tmp_path):
+    cache = ModelCache(str(tmp_path))
+    s_plus = {"abb", "bb", "bba", "bbb", "babb"}
+    s_minus = {"", "a", "ba"}
+    for fill_holes in [False, True]:
+        (g, success) = gold(
+            s_plus, s_minus, sigma="ab", fill_holes=fill_holes, cache=cache
+        )
+        (h, cached_success) = gold(
+            iter(s_plus), iter(s_minus), sigma="ab", fill_holes=fill_holes,
+            cache=cache
+        )
+        assert cached_success == success
+        assert automaton_to_dict(h) == automaton_to_dict(g)
+    assert len(cache) == 2
+    cache.clear()
+    assert len(cache) == 0
+
+
+def test_lstar_cache(tmp_path):
+    cache = ModelCache(str(tmp_path))
+    g = compile_dfa("(ab)*", complete=True)
+    h1 = Learner(Teacher(g), verbose=False).learn(cache=cache)
+    teacher = Teacher(g)
+    h2 = Learner(teacher, verbose=False).learn(cache=cache)
+    assert teacher.num_membership_queries == 0
+    assert automaton_to_dict(h1) == automaton_to_dict(h2)
+
+
+def test_cache_eviction(tmp_path):
+    cache = ModelCache(str(tmp_path))
+    for i in range(3):
+        cache.put(make_key(i=i), {"i": i})
+        os.utime(cache.path(make_key(i=i)), (i, i))
+    size = os.path.getsize(cache.path(make_key(i=0)))
+    cache.get(make_key(i=0))
+    cache.max_size = 2 * size
+    cache.evict()
+    assert cache.get(make_key(i=0)) == {"i": 0}
+    assert cache.get(make_key(i=1)) is None
+    assert len(cache) == 2
@@ -0,0 +1,73 @@
+#!/usr/bin/env pytest
+# -*- coding: utf-8 -*-
+#
+# This file is part of the regexp-learner project
+# https://github.com/nokia/regexp-learner
+
+import json
+from regexp_learner import automaton_from_dict
+from regexp_learner.cli import (
+    EXIT_FAILURE,
+    EXIT_SUCCESS,
+    main,
+)
+
+
+def test_cli_gold(tmp_path):
+    s_plus = {"abb", "bb", "bba", "bbb", "babb"}
+    s_minus = {"", "a", "ba"}
+    (tmp_path / "s_plus.txt").write_text("\n".join(s_plus) + "\n")
+    (tmp_path / "s_minus.txt").write_text("\n".join(s_minus) + "\n")
+    output = tmp_path / "gold.json"
+    args = [
+        "gold",
+        "--positive", str(tmp_path / "s_plus.txt"),
+        "--negative", str(tmp_path / "s_minus.txt"),
+        "--sigma", "ab",
+        "--output", str(output),
+    ]
+    assert main(args) == EXIT_FAILURE
+    assert main(args + ["--fill-holes"]) == EXIT_SUCCESS
+    result = json.loads(output.read_text())
+    assert result["algorithm"] == "gold"
+    assert result["success"] is True
+    assert result["statistics"]["num_states"] == 3
+    assert result["statistics"]["red_states"] == 3
+    assert result["statistics"]["promotions"] == 2
+    g = automaton_from_dict(result["automaton"])
+    assert all(g.accepts(w) for w in s_plus)
+    assert not any(g.accepts(w) for w in s_minus)
+    assert main(args + ["--fill-holes", "--minimize"]) == EXIT_SUCCESS
+    result = json.loads(output.read_text())
+    assert result["statistics"]["num_states"] <= 3
+
+
+def test_cli_lstar(tmp_path):
+    (tmp_path / "target.txt").write_text("(ab)*\n")
+    output = tmp_path / "lstar.json"
+    args = [
+        "lstar",
+        "--regexp", str(tmp_path / "target.txt"),
+        "--output", str(output),
+        "--timeout", "60",
+    ]
+    assert main(args) == EXIT_SUCCESS
+    result = json.loads(output.read_text())
+    assert result["statistics"]["membership_queries"] > 0
+    assert result["statistics"]["equivalence_queries"] > 0
+    g = automaton_from_dict(result["automaton"])
+    assert g.num_vertices() == 3
+    assert g.accepts("abab")
+    assert not g.accepts("aba")
+
+    # The learned automaton can be used as a target.
+    (tmp_path / "target.json").write_text(json.dumps(result["automaton"]))
+    args = [
+        "lstar",
+        "--automaton", str(tmp_path / "target.json"),
+        "--output", str(output),
+        "--jobs", "2",
+    ]
+    assert main(args) == EXIT_SUCCESS
+    result = json.loads(output.read_text())
+    assert result["statistics"]["num_states"] == 3
@@ -0,0 +1,55 @@
+#!/usr/bin/env pytest
+# -*- coding: utf-8 -*-
+#
+# This file is part of the regexp-learner project
+# https://github.com/nokia/regexp-learner
+
+from itertools import product
+from pybgl import compile_dfa
+from regexp_learner import automaton_match, minimize_automaton
+from regexp_learner import DFA
+
+WORDS = [
+    "".join(w)
+    for n in range(6)
+    for w in product("abc", repeat=n)
+]
+
+
+def test_dfa_from_automaton():
+    for (regexp, complete) in [
+        ("(ab)*a", True),
+        ("a|bc*", False),
+        ("(a|b)*abb", True),
+    ]:
+        g = compile_dfa(regexp, complete=complete)
+        h = DFA.from_automaton(g)
+        assert h.initial() == 0
+        assert h.num_vertices() == g.num_vertices()
+        assert h.alphabet() == g.alphabet()
+        assert h.is_complete() == g.is_complete()
+        for w in WORDS:
+            assert h.accepts(w) == g.accepts(w), (regexp, w)
+        g2 = h.to_automaton()
+        for w in WORDS:
+            assert g2.accepts(w) == g.accepts(w), (regexp, w)
+
+
+def test_dfa_to_automaton_initial_state():
+    h = DFA("ab", [[0, 0], [0, 1]], [False, True], q0=1)
+    g = h.to_automaton()
+    assert g.initial() == 1
+    for w in WORDS:
+        assert g.accepts(w) == h.accepts(w), w
+    assert g.accepts("") and g.accepts("bb") and not g.accepts("a")
+
+
+def test_dfa_automaton_match():
+    g1 = minimize_automaton(compile_dfa("(ab)*a", complete=True), True)
+    g2 = minimize_automaton(compile_dfa("(ab)*", complete=True), True)
+    h1 = DFA.from_automaton(g1)
+    h2 = DFA.from_automaton(g2)
+    assert automaton_match(h1, g1) is None
+    assert automaton_match(g1, h1) is None
+    assert automaton_match(h1, h2) == ""
+    assert minimize_automaton(h1).num_vertices() == 2
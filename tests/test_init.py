@@ -15,3 +15,29 @@ def test_import_lstar():
 
 def test_import_regexp_learner():
     import regexp_learner
+
+
+def test_lazy_import():
+    import os
+    import subprocess
+    import sys
+    code = "\n".join([
+        "import sys",
+        "import regexp_learner",
+        "from regexp_learner import prefixes",
+        "assert 'numpy' not in sys.modules",
+        "assert 'pybgl' not in sys.modules",
+        "from regexp_learner import gold, rpni",
+        "assert callable(gold) and callable(rpni)",
+        "assert 'numpy' not in sys.modules",
+    ])
+    env = dict(os.environ, PYTHONPATH=os.pathsep.join(sys.path))
+    subprocess.run([sys.executable, "-c", code], check=True, env=env)
+
+
+def test_lazy_import_attribute_error():
+    import pytest
+    import regexp_learner
+    with pytest.raises(AttributeError):
+        regexp_learner.does_not_exist
+    assert "gold" in dir(regexp_learner)
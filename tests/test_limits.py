@@ -0,0 +1,21 @@
+#!/usr/bin/env pytest
+# -*- coding: utf-8 -*-
+#
+# This file is part of the regexp-learner project
+# https://github.com/nokia/regexp-learner
+
+import time
+from regexp_learner.limits import time_limit
+
+
+def test_time_limit():
+    with time_limit(None):
+        pass
+    with time_limit(10):
+        pass
+    try:
+        with time_limit(0.05):
+            time.sleep(1)
+        assert False
+    except TimeoutError:
+        assert True
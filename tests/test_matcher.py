@@ -0,0 +1,99 @@
+#!/usr/bin/env pytest
+# -*- coding: utf-8 -*-
+#
+# This file is part of the regexp-learner project
+# https://github.com/nokia/regexp-learner
+
+from itertools import product
+from pybgl import Automaton, compile_dfa
+from regexp_learner import (
+    CompiledMatcher,
+    Learner,
+    Teacher,
+    export_matcher,
+    gold,
+    load_matcher,
+)
+
+
+def all_words(sigma: str, max_length: int) -> list:
+    return [
+        "".join(w)
+        for n in range(max_length + 1)
+        for w in product(sigma, repeat=n)
+    ]
+
+
+def test_matcher_lstar(tmp_path):
+    g = compile_dfa("(a(ba)*b)*|c", complete=True)
+    h = Learner(Teacher(g), verbose=False).learn()
+    filename = tmp_path / "lstar.rldfa"
+    export_matcher(h, filename)
+    m = load_matcher(filename)
+    words = all_words("abc", 6) + ["abx", "x"]
+    expected = [h.accepts(w) for w in words]
+    assert [m.match(w) for w in words] == expected
+    assert m.match_many(words).tolist() == expected
+    assert m.match_many([]).tolist() == []
+
+
+def test_matcher_gold(tmp_path):
+    s_plus = {"bb", "abb", "bba", "bbb"}
+    s_minus = {"a", "b", "aa", "bab"}
+    (g, success) = gold(s_plus, s_minus, sigma="ab", fill_holes=True)
+    assert success
+    filename = tmp_path / "gold.rldfa"
+    export_matcher(g, filename)
+    m = load_matcher(filename)
+    assert m.num_states == g.num_vertices()
+    words = all_words("ab", 5)
+    expected = [g.accepts(w) for w in words]
+    assert [m.match(w) for w in words] == expected
+    assert m.match_many(words).tolist() == expected
+
+
+def test_matcher_multichar_symbols():
+    g = Automaton(2)
+    g.add_edge(0, 1, "foo")
+    g.add_edge(1, 0, "bar")
+    g.set_final(1)
+    m = CompiledMatcher.from_buffer(
+        CompiledMatcher.from_automaton(g).to_bytes()
+    )
+    assert m.symbols == ["bar", "foo"]
+    assert m.match(["foo"])
+    assert not m.match(["foo", "bar"])
+    assert m.match_many([["foo", "bar", "foo"], ["bar"]]).tolist() == [
+        True, False
+    ]
+
+
+def test_matcher_empty():
+    m = CompiledMatcher.from_buffer(
+        CompiledMatcher.from_automaton(Automaton(0)).to_bytes()
+    )
+    assert m.num_states == 0
+    assert not m.match("")
+    assert m.match_many(["", "a"]).tolist() == [False, False]
+
+
+def test_matcher_empty_alphabet():
+    g = Automaton(1)
+    g.set_final(0)
+    m = CompiledMatcher.from_automaton(g)
+    assert m.symbols == []
+    assert m.match_many(["", "a"]).tolist() == [True, False]
+
+
+def test_matcher_nul_symbol():
+    g = Automaton(2)
+    g.add_edge(0, 1, "a")
+    g.add_edge(1, 0, "\0")
+    g.set_final(0)
+    m = CompiledMatcher.from_buffer(
+        CompiledMatcher.from_automaton(g).to_bytes()
+    )
+    assert m.symbols == ["\0", "a"]
+    assert m.match("a\0a\0")
+    assert not m.match("a\0a")
+    assert m.match_many(["", "a\0", "\0"]).tolist() == [True, True, False]
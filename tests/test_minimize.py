@@ -0,0 +1,60 @@
+#!/usr/bin/env pytest
+# -*- coding: utf-8 -*-
+#
+# This file is part of the regexp-learner project
+# https://github.com/nokia/regexp-learner
+
+from itertools import product
+from pybgl import Automaton, compile_dfa
+from regexp_learner import minimize_automaton
+from regexp_learner.minimize import RefinablePartition
+
+
+def test_refinable_partition():
+    partition = RefinablePartition(5)
+    assert partition.num_blocks() == 1
+    assert partition.mark(3)
+    assert not partition.mark(1)
+    assert not partition.mark(3)
+    c = partition.split(0)
+    assert sorted(partition.members(c)) == [1, 3]
+    assert sorted(partition.members(0)) == [0, 2, 4]
+    assert partition.split(0) is None
+    for x in partition.members(c):
+        partition.mark(x)
+    assert partition.split(c) is None
+    assert partition.num_blocks() == 2
+
+
+def test_minimize_automaton():
+    words = [
+        "".join(w)
+        for n in range(7)
+        for w in product("abc", repeat=n)
+    ]
+    for (regexp, expected, expected_complete) in [
+        ("(ab)*a", 2, 3),
+        ("a|b|c", 2, 3),
+        ("(a|b)*abb", 4, 4),
+        ("(a|b)(a|b)(a|b)", 4, 5),
+        ("((a|b)*c)*d", 3, 4),
+        ("(a|b)*a(a|b)(a|b)(a|b)", 16, 16),
+    ]:
+        g = compile_dfa(regexp, complete=True)
+        h = minimize_automaton(g)
+        assert h.num_vertices() == expected
+        assert all(g.accepts(w) == h.accepts(w) for w in words)
+        h = minimize_automaton(g, complete=True)
+        assert h.is_complete()
+        assert h.num_vertices() == expected_complete
+        assert all(g.accepts(w) == h.accepts(w) for w in words)
+
+
+def test_minimize_automaton_empty():
+    for g in [Automaton(0), compile_dfa("a", complete=True)]:
+        for q in g.vertices():
+            g.set_final(q, False)
+        h = minimize_automaton(g)
+        assert h.num_vertices() == 1
+        assert h.num_edges() == 0
+        assert not h.accepts("")
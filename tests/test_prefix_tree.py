@@ -0,0 +1,24 @@
+#!/usr/bin/env pytest
+# -*- coding: utf-8 -*-
+#
+# This file is part of the regexp-learner project
+# https://github.com/nokia/regexp-learner
+
+from regexp_learner.prefix_tree import PrefixTree
+
+
+def test_prefix_tree():
+    t = PrefixTree()
+    u = t.insert("abc", 1)
+    v = t.insert("ab", 0)
+    t.insert("b")
+    assert t.num_nodes() == 5
+    assert t.find("abc") == u
+    assert t.find("ab") == v
+    assert t.find("ac") is None
+    assert t.label(u) == 1
+    assert t.label(v) == 0
+    assert t.label(t.find("b")) is None
+    assert t.find("c", v) == u
+    assert t.child(v, "c") == u
+    assert t.child(u, "c") is None
@@ -0,0 +1,77 @@
+#!/usr/bin/env pytest
+# -*- coding: utf-8 -*-
+#
+# This file is part of the regexp-learner project
+# https://github.com/nokia/regexp-learner
+
+from pybgl import Automaton, compile_dfa
+from regexp_learner import (
+    Learner,
+    Teacher,
+    automaton_to_regexp,
+    compile_regexp,
+    gold,
+    verify_regexp,
+)
+from regexp_learner.regexp import RegexpBuilder
+
+
+def test_regexp_builder():
+    builder = RegexpBuilder()
+    a = builder.symbol("a")
+    b = builder.symbol("b")
+    eps = builder.epsilon
+    assert builder.concat(a, b) == builder.concat(a, b)
+    assert builder.pattern(builder.union(a, b)) == "[ab]"
+    assert builder.pattern(builder.union(a, eps)) == "a?"
+    assert builder.pattern(builder.star(builder.union(a, eps))) == "a*"
+    assert builder.pattern(builder.concat(a, builder.star(a))) == "a+"
+    assert builder.pattern(
+        builder.union(builder.concat(a, b), b)
+    ) == "a?b"
+    assert builder.pattern(
+        builder.star(builder.concat(a, b))
+    ) == "(?:ab)*"
+    assert builder.pattern(builder.symbol(".")) == r"\."
+
+
+def test_automaton_to_regexp():
+    for (regexp, expected) in [
+        ("(ab)*a", "a(?:ba)*"),
+        ("a|b|c", "[abc]"),
+        ("a?b", "a?b"),
+        ("(a|b)(a|b)(a|b)", "[ab][ab][ab]"),
+        ("a+b+|c*", "a+b+|c*"),
+    ]:
+        for complete in (False, True):
+            g = compile_dfa(regexp, complete=complete)
+            assert automaton_to_regexp(g) == expected
+
+
+def test_automaton_to_regexp_empty():
+    g = Automaton(1)
+    assert verify_regexp(automaton_to_regexp(g), g)
+    assert compile_regexp(automaton_to_regexp(g)).fullmatch("") is None
+    g.set_final(0)
+    assert automaton_to_regexp(g) == ""
+
+
+def test_automaton_to_regexp_learners():
+    g = compile_dfa("(a(b|c)*d|e)*f", complete=True)
+    h = Learner(Teacher(g), verbose=False).learn()
+    assert verify_regexp(automaton_to_regexp(h, verify=False), h)
+    (g, success) = gold(
+        {"bb", "abb", "bba", "bbb"},
+        {"a", "b", "aa", "bab"},
+        sigma="ab",
+        fill_holes=True,
+    )
+    assert success
+    assert verify_regexp(automaton_to_regexp(g, verify=False), g)
+
+
+def test_verify_regexp():
+    g = compile_dfa("(ab)*a")
+    assert verify_regexp("a(?:ba)*", g)
+    assert not verify_regexp("a(?:ba)?", g)
+    assert compile_regexp("a(?:ba)*") is compile_regexp("a(?:ba)*")
@@ -0,0 +1,56 @@
+#!/usr/bin/env pytest
+# -*- coding: utf-8 -*-
+#
+# This file is part of the regexp-learner project
+# https://github.com/nokia/regexp-learner
+
+from regexp_learner import (
+    GoldObservationTable,
+    gold,
+    read_samples,
+)
+
+
+def test_read_samples(tmp_path):
+    filename = tmp_path / "samples.txt"
+    filename.write_bytes(b"ab\n\nba\r\nab\nabb")
+    assert list(read_samples(filename)) == ["ab", "", "ba", "ab", "abb"]
+    filename.write_bytes(b"")
+    assert list(read_samples(filename)) == []
+
+
+def test_read_samples_gold(tmp_path):
+    s_plus = {"abb", "bb", "bba", "bbb", "babb"}
+    s_minus = {"", "a", "ba"}
+    filename_plus = tmp_path / "s_plus.txt"
+    filename_minus = tmp_path / "s_minus.txt"
+    filename_plus.write_text("\n".join(sorted(s_plus) + ["bb"]) + "\n")
+    filename_minus.write_text("\n".join(sorted(s_minus)) + "\n")
+
+    o = GoldObservationTable(
+        read_samples(filename_plus),
+        read_samples(filename_minus),
+        sigma="ab"
+    )
+    assert o.s_plus == s_plus
+    assert o.s_minus == s_minus
+    (g, success) = gold(
+        read_samples(filename_plus),
+        read_samples(filename_minus),
+        sigma="ab",
+        fill_holes=True
+    )
+    assert success
+    assert all(g.accepts(w) for w in s_plus)
+    assert not any(g.accepts(w) for w in s_minus)
+
+    filename_minus.write_text("c\n")
+    try:
+        gold(
+            read_samples(filename_plus),
+            read_samples(filename_minus),
+            sigma="ab"
+        )
+        assert False
+    except RuntimeError:
+        assert True
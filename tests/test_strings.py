@@ -4,7 +4,9 @@
 # This file is part of the regexp-learner project
 # https://github.com/nokia/regexp-learner
 
+from regexp_learner.prefix_tree import PrefixTree
 from regexp_learner.strings import (
+    distinct_suffixes,
     prefixes,
     suffixes,
     is_prefix_closed,
@@ -46,3 +48,24 @@ def test_is_suffix_closed():
     strings.remove("xyz")
     strings.remove("bcd")
     assert is_suffix_closed(strings) is False, sorted(strings)
+
+
+def test_distinct_suffixes():
+    strings = ["abcd", "bcd", "xcd", ""]
+    expected = sorted(
+        {suffix for s in strings for suffix in suffixes(s)},
+        key=lambda s: (len(s), s)
+    )
+    assert distinct_suffixes(strings) == expected
+    assert distinct_suffixes([]) == []
+
+    suffix_tree = PrefixTree()
+    assert distinct_suffixes(["ab"], suffix_tree) == ["", "b", "ab"]
+    assert distinct_suffixes(["cab", "b"], suffix_tree) == ["cab"]
+
+
+def test_closed_lists():
+    assert is_prefix_closed(["", "a", "ab"])
+    assert not is_prefix_closed(["a", "ab"])
+    assert is_suffix_closed(["", "b", "ab"])
+    assert not is_suffix_closed(["b", "ab"])